@@ -4,13 +4,15 @@ Main Flask Application
 """
 import logging
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, request, jsonify, render_template
-import pytz
 
 from config import Config
 from services.respond_api import RespondAPI
 from services.google_sheets import GoogleSheetsService
+from services.makecom import transform_makecom_to_internal
 from services.message_handler import MessageHandler
 from services.reminder_scheduler import ReminderScheduler
 
@@ -44,6 +46,9 @@ except Exception as e:
     logger.warning(f"Scheduler not available: {e}")
     scheduler = None
 
+# Runs independent Sheets / Respond.io lookups for a request side by side
+lookup_pool = ThreadPoolExecutor(max_workers=8)
+
 
 @app.before_request
 def log_request():
@@ -189,7 +194,7 @@ def webhook_respond():
 
         if event_type == 'message.received':
             # Transform Make.com format to internal format
-            transformed_data = _transform_makecom_to_internal(data)
+            transformed_data = transform_makecom_to_internal(data)
 
             # Process incoming message
             success = message_handler.process_message(transformed_data)
@@ -208,115 +213,6 @@ def webhook_respond():
         return jsonify({'error': str(e)}), 500
 
 
-def _transform_makecom_to_internal(make_data: dict) -> dict:
-    """
-    Transform Make.com webhook format to internal message handler format
-    Supports multiple Make.com output formats
-
-    Args:
-        make_data: Data from Make.com
-
-    Returns:
-        Transformed data for message_handler
-    """
-    try:
-        # Check if data is already in simple format (from Make.com HTTP module)
-        if 'contact' in make_data and 'message' in make_data:
-            # Simple format from Make.com HTTP module
-            contact_info = make_data.get('contact', {})
-            message_info = make_data.get('message', {})
-
-            contact_id = contact_info.get('id', '')
-            phone = contact_info.get('phone', '')
-            first_name = contact_info.get('firstName', contact_info.get('first_name', ''))
-            message_text = message_info.get('text', '')
-
-            # Extract custom fields and tags (if present in Make.com payload)
-            custom_fields = contact_info.get('customFields', contact_info.get('custom_fields', {}))
-            tags = contact_info.get('tags', [])
-
-            internal_format = {
-                'event': 'message.received',
-                'contact': {
-                    'id': contact_id,
-                    'phone': phone,
-                    'firstName': first_name,
-                    'lastName': contact_info.get('lastName', contact_info.get('last_name', '')),
-                    'customFields': custom_fields,
-                    'tags': tags
-                },
-                'message': {
-                    'id': message_info.get('id', ''),
-                    'type': message_info.get('type', 'text'),
-                    'text': message_text,
-                    'timestamp': message_info.get('timestamp', ''),
-                    'context': message_info.get('context', {})
-                },
-                'channel': make_data.get('channel', {})
-            }
-
-            logger.info(f"Transformed Make.com data (simple format) - Contact: {contact_id}, Phone: {phone}, Text: {message_text}")
-            return internal_format
-
-        # Complex format from Make.com Respond.io module
-        else:
-            contact_info = make_data.get('Contact', {})
-            contact_id = contact_info.get('Contact ID', '')
-            first_name = contact_info.get('First Name', '')
-            phone = contact_info.get('Phone No.', '')
-
-            message_info = make_data.get('Message', {})
-            message_content = message_info.get('Message', {})
-            message_text = message_content.get('Text', '')
-            message_type = message_content.get('Type', 'text')
-
-            # Extract custom fields and tags from Make.com complex format
-            # Make.com might send custom fields as separate keys
-            custom_fields = {}
-            tags = []
-
-            # Look for custom field keys in contact_info
-            for key, value in contact_info.items():
-                # Skip standard fields
-                if key not in ['Contact ID', 'First Name', 'Last Name', 'Phone No.', 'Email']:
-                    # This is likely a custom field
-                    custom_fields[key] = value
-
-            # Check if tags exist in specific field
-            if 'Tags' in contact_info:
-                tags = contact_info.get('Tags', [])
-                if isinstance(tags, str):
-                    # If tags come as comma-separated string, split them
-                    tags = [t.strip() for t in tags.split(',')]
-
-            internal_format = {
-                'event': 'message.received',
-                'contact': {
-                    'id': contact_id,
-                    'phone': phone,
-                    'firstName': first_name,
-                    'lastName': contact_info.get('Last Name', ''),
-                    'customFields': custom_fields,
-                    'tags': tags
-                },
-                'message': {
-                    'id': message_info.get('ID', ''),
-                    'type': message_type,
-                    'text': message_text,
-                    'timestamp': message_info.get('Timestamp', ''),
-                    'context': message_content.get('Context', {})
-                },
-                'channel': make_data.get('Channel', {})
-            }
-
-            logger.info(f"Transformed Make.com data (complex format) - Contact: {contact_id}, Phone: {phone}, Text: {message_text}, CustomFields: {list(custom_fields.keys())}, Tags: {tags}")
-            return internal_format
-
-    except Exception as e:
-        logger.error(f"Error transforming Make.com data: {e}", exc_info=True)
-        raise
-
-
 @app.route('/api/send-test', methods=['POST'])
 def send_test_message():
     """
@@ -378,11 +274,10 @@ def get_contact(contact_id):
     Get a specific contact's information
     """
     try:
-        # Get from Google Sheets
-        sheet_data = sheets.get_contact(contact_id)
-
-        # Get from Respond.io
+        # Get from Google Sheets and Respond.io concurrently
+        sheet_future = lookup_pool.submit(sheets.get_contact, contact_id)
         respond_data = api.get_contact(contact_id)
+        sheet_data = sheet_future.result()
 
         return jsonify({
             'sheet_data': sheet_data,
@@ -415,21 +310,29 @@ def get_stats():
 
         contacts = sheets.get_all_contacts()
 
-        # Calculate statistics
+        # Calculate statistics in a single pass over the contacts
         total_contacts = len(contacts)
-        with_timeslot = len([c for c in contacts if c.get('chosen_timeslot')])
+        with_timeslot = thumbs_up_count = members = 0
+        source_counts = Counter()
+        timeslot_counts = dict.fromkeys(['A', 'B', 'C', 'D'], 0)
+
+        for c in contacts:
+            chosen_timeslot = c.get('chosen_timeslot')
+            if chosen_timeslot:
+                with_timeslot += 1
+                if chosen_timeslot in timeslot_counts:
+                    timeslot_counts[chosen_timeslot] += 1
+            if c.get('thumbs_up') == 'Yes':
+                thumbs_up_count += 1
+            if c.get('member_status') in ('trial', 'member'):
+                members += 1
+            source_counts[c.get('contact_source')] += 1
+
         without_timeslot = total_contacts - with_timeslot
-        thumbs_up_count = len([c for c in contacts if c.get('thumbs_up') == 'Yes'])
-        members = len([c for c in contacts if c.get('member_status') in ['trial', 'member']])
 
         # Count by source
-        facebook_ads_count = len([c for c in contacts if c.get('contact_source') == 'facebook_ads'])
-        website_count = len([c for c in contacts if c.get('contact_source') == 'website'])
-
-        # Count by timeslot
-        timeslot_counts = {}
-        for slot in ['A', 'B', 'C', 'D']:
-            timeslot_counts[slot] = len([c for c in contacts if c.get('chosen_timeslot') == slot])
+        facebook_ads_count = source_counts['facebook_ads']
+        website_count = source_counts['website']
 
         return jsonify({
             'total_contacts': total_contacts,
@@ -558,6 +461,9 @@ def update_member_status():
 
         # If becoming a member, send welcome message
         if status in ['trial', 'member']:
+            # Check the 72-hour window while the sheet lookup runs
+            window_future = lookup_pool.submit(api.check_72hr_window, contact_id)
+
             # Get contact info from sheets to get first_name
             contact_data = sheets.get_contact(contact_id) if sheets else {}
             first_name = contact_data.get('first_name', 'there')
@@ -571,14 +477,14 @@ def update_member_status():
             else:
                 template_key = 'B1_M1'
 
-            welcome_message = Config.get_message_templates()[template_key].format(
+            welcome_message = message_handler.templates[template_key].format(
                 name=first_name,
                 member_zoom_link=Config.ZOOM_MEMBER_LINK,
                 youtube_playlist_link=Config.YOUTUBE_PLAYLIST_LINK
             )
 
             # Check 72-hour window before sending
-            if api.check_72hr_window(contact_id):
+            if window_future.result():
                 api.send_message(contact_id, welcome_message, channel_id=Config.RESPOND_CHANNEL_ID)
                 logger.info(f"Sent welcome message to new {status}: {contact_id}")
 
@@ -3,6 +3,8 @@ Configuration module for Inner Joy Studio WhatsApp Automation
 """
 import os
 from datetime import time
+from functools import lru_cache
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,11 +22,20 @@ class Config:
     RESPOND_API_KEY = os.getenv('RESPOND_API_KEY')
     RESPOND_API_URL = os.getenv('RESPOND_API_URL', 'https://api.respond.io/v2')
     RESPOND_CHANNEL_ID = int(os.getenv('RESPOND_CHANNEL_ID', 431307))  # WhatsApp Business channel ID (must be integer)
+    RESPOND_CONNECT_TIMEOUT = float(os.getenv('RESPOND_CONNECT_TIMEOUT', 5))  # Seconds to establish a connection
+    RESPOND_READ_TIMEOUT = float(os.getenv('RESPOND_READ_TIMEOUT', 30))  # Seconds to wait for a response
     WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
 
     # Google Sheets Configuration
     GOOGLE_SHEETS_ID = os.getenv('GOOGLE_SHEETS_ID')
     GOOGLE_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
+    # Local SQLite mirror of Scheduled_Messages, opened by the scheduler. Must be on persistent storage
+    # (e.g. a mounted volume): its record of sent messages is what stops re-sends after a restart
+    SHEETS_CACHE_PATH = os.getenv('SHEETS_CACHE_PATH', 'sheets_cache.db')
+
+    # Scheduler Configuration
+    SCHEDULER_SEND_WORKERS = int(os.getenv('SCHEDULER_SEND_WORKERS', 8))  # Concurrent outbound sends per job run
+    SCHEDULER_JOB_WORKERS = int(os.getenv('SCHEDULER_JOB_WORKERS', 4))  # Threads running scheduler jobs themselves
 
     # Timezone Configuration (UTC+7 for Bangkok & Laos)
     TIMEZONE = os.getenv('TIMEZONE', 'Asia/Bangkok')
@@ -57,6 +68,15 @@ class Config:
         'UE': {'day': 'Sunday', 'time': time(21, 0), 'day_num': 6}      # Sunday 21:00
     }
 
+    # Valid timeslot codes, for membership checks
+    TIME_SLOT_SET = frozenset(TIME_SLOTS)
+
+    # Display text per timeslot code (e.g., 'SA' -> 'Saturday 15:30 (UTC+7)')
+    TIMESLOT_DISPLAY = {
+        code: f"{slot_info['day']} {slot_info['time'].strftime('%H:%M')} (UTC+7)"
+        for code, slot_info in TIME_SLOTS.items()
+    }
+
     # Day selection mapping (Step 1)
     DAY_SELECTION = {
         'S': 'Saturday',
@@ -133,9 +153,11 @@ class Config:
     ZOOM_DOWNLOAD_LINK = 'https://zoom.us/download'
 
     # Message Templates (Exact from Flow Document)
+    # Built on first call and shared afterwards as a read-only mapping
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_message_templates():
-        return {
+        return MappingProxyType({
             # ========== B1 Z1 - Ask Name ==========
             'B1_Z1': "Hi 🌸 I'm Ineke from InnerJoy!\nLovely to connect with you.\nCan you share your (first) name?\nThen I'll send your Zoom link 🌈",
 
@@ -500,7 +522,7 @@ Go for the full experience 💖
 3 months of Inner Joy —
 only $80 for full access:
 {membership_link}""",
-        }
+        })
 
     @staticmethod
     def get_timeslot_display(timeslot: str) -> str:
@@ -513,15 +535,7 @@ only $80 for full access:
         Returns:
             Display text for the timeslot with UTC+7
         """
-        if timeslot not in Config.TIME_SLOTS:
-            return ''
-
-        slot_info = Config.TIME_SLOTS[timeslot]
-        day = slot_info['day']
-        time_obj = slot_info['time']
-        time_str = time_obj.strftime('%H:%M')
-
-        return f"{day} {time_str} (UTC+7)"
+        return Config.TIMESLOT_DISPLAY.get(timeslot, '')
 
     @staticmethod
     def get_window_duration(contact_source: str) -> int:
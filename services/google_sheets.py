@@ -4,34 +4,178 @@ Handles data logging and tracking in Google Sheets using Service Account
 Supports multi-sheet structure for Inner Joy flow automation
 """
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 import json
 import base64
 import os
+import sys
+import threading
+import time
 import uuid
+from collections import OrderedDict
 
 import gspread
+from google.auth.exceptions import GoogleAuthError
 from google.oauth2.service_account import Credentials
 
 from config import Config
+from services.sheets_cache import ScheduledMessageCache
 
 logger = logging.getLogger(__name__)
 
+# Message_Log keeps only the start of each message
+MESSAGE_LOG_CONTENT_LIMIT = 500
+
+# Per-contact write versions kept for contacts_changed_since() (oldest are dropped first)
+CONTACT_VERSIONS_LIMIT = 10000
+
+# Contacts sheet field name -> column number (1-indexed)
+CONTACT_FIELD_COLUMNS = {
+    'phone': 2,
+    'first_name': 3,
+    'contact_source': 4,
+    'current_tree': 5,
+    'current_step': 6,
+    'selected_day': 7,
+    'registration_time': 8,
+    'chosen_timeslot': 9,
+    'session_datetime': 10,
+    'last_inbound_msg_time': 11,
+    'window_expires_at': 12,
+    'thumbs_up_received': 13,
+    'payment_status': 14,
+    'member_type': 15,
+    'trial_start': 16,
+    'trial_end': 17,
+    'attended_status': 18,
+    'csv_follow_up_group': 19,
+    'tier2_approved': 20,
+    'last_updated': 21
+}
+
+# Drive metadata endpoint used to read the spreadsheet's modifiedTime
+DRIVE_FILES_URL = 'https://www.googleapis.com/drive/v3/files'
+
+# Seconds a cached full contacts read is trusted before modifiedTime is checked again
+CONTACTS_CACHE_TTL = 30
+
 
 class GoogleSheetsError(Exception):
     """Custom exception for Google Sheets errors"""
     pass
 
 
+# Errors GoogleSheetsService() can raise when Sheets is unreachable or misconfigured
+# (bad/expired credentials, missing spreadsheet, API/network failures); callers fall back to running without Sheets
+SHEETS_INIT_ERRORS = (
+    GoogleSheetsError, GoogleAuthError, gspread.exceptions.GSpreadException,
+    ConnectionError, OSError, ValueError, KeyError
+)
+
+
 class GoogleSheetsService:
     """Manages Google Sheets operations for contact tracking using Service Account"""
 
+    # Called with (message_id, scheduled_send_time) whenever any instance schedules a message
+    _schedule_listeners: List[Callable[[str, str], None]] = []
+
+    @classmethod
+    def add_schedule_listener(cls, callback: Callable[[str, str], None]):
+        """
+        Register a callback notified about every newly scheduled message
+
+        Args:
+            callback: Function taking (message_id, scheduled_send_time)
+        """
+        cls._schedule_listeners.append(callback)
+
+    # Incremented on every Contacts write so callers can drop derived contact state
+    _contacts_version = 0
+    _contact_versions: OrderedDict = OrderedDict()  # contact_id -> version of its last write, oldest first
+    _contact_versions_floor = 0  # highest version dropped from _contact_versions
+    _contacts_version_lock = threading.Lock()
+
+    # Held from reading the row count to writing the rows, so concurrent appends
+    # (webhook threads, scheduler workers, every instance in this process) never pick the same rows
+    _append_lock = threading.Lock()
+
+    # Local SQLite mirror of Scheduled_Messages, opened by the scheduler (its only reader) via
+    # open_scheduled_cache(); until then schedule/status/cancel writes go to the sheet only
+    _scheduled_cache: Optional[ScheduledMessageCache] = None
+
+    @classmethod
+    def open_scheduled_cache(cls) -> ScheduledMessageCache:
+        """
+        Open the local scheduled-message cache for every instance in this process
+
+        Returns:
+            Shared ScheduledMessageCache instance
+        """
+        cls._scheduled_cache = ScheduledMessageCache.get_instance()
+        return cls._scheduled_cache
+
+    @property
+    def scheduled_cache(self) -> Optional[ScheduledMessageCache]:
+        """Local scheduled-message cache, or None if the scheduler hasn't opened it"""
+        return GoogleSheetsService._scheduled_cache
+
+    @property
+    def contacts_version(self) -> int:
+        """Row-version counter of the Contacts sheet (shared by all instances)"""
+        return GoogleSheetsService._contacts_version
+
+    @classmethod
+    def _bump_contacts_version(cls, contact_id: str):
+        """Record that a Contacts row was added or changed"""
+        with cls._contacts_version_lock:
+            GoogleSheetsService._contacts_version += 1
+            versions = GoogleSheetsService._contact_versions
+            versions[contact_id] = GoogleSheetsService._contacts_version
+            versions.move_to_end(contact_id)
+            while len(versions) > CONTACT_VERSIONS_LIMIT:
+                _, GoogleSheetsService._contact_versions_floor = versions.popitem(last=False)
+
+    def contacts_changed_since(self, version: int) -> Optional[List[str]]:
+        """
+        Get the contacts written after a given row version
+
+        Args:
+            version: Value of contacts_version seen earlier
+
+        Returns:
+            List of contact IDs added or updated since then, or None if that
+            version is older than the retained history (treat every contact as changed)
+        """
+        with self._contacts_version_lock:
+            if version < GoogleSheetsService._contact_versions_floor:
+                return None
+
+            changed = []
+            for contact_id, written in reversed(self._contact_versions.items()):
+                if written <= version:
+                    break
+                changed.append(contact_id)
+            return changed
+
+    def _notify_scheduled(self, rows: List[List[Any]]):
+        """Notify schedule listeners about newly written Scheduled_Messages rows"""
+        for row in rows:
+            for callback in self._schedule_listeners:
+                try:
+                    callback(row[0], row[3])
+                except Exception as error:
+                    logger.warning(f"Schedule listener failed: {error}")
+
     def __init__(self):
         self.spreadsheet_id = Config.GOOGLE_SHEETS_ID
         self.client = None
         self.spreadsheet = None
         self.sheets = {}  # Cache for sheet objects
+        self._contacts_cache = None  # (modifiedTime, contacts_version, contacts, checked_at) from the last full read
+        self._contact_rows: Dict[str, int] = {}  # contact_id -> Contacts row number, checked before use
+        self._pending_updates: Dict[str, Dict[str, Any]] = {}  # contact_id -> fields, see queue_update()
+        self._pending_updates_lock = threading.Lock()
         self._authenticate()
         self._init_sheets()
 
@@ -39,7 +183,10 @@ class GoogleSheetsService:
         """Authenticate with Google Sheets API using Service Account"""
         try:
             # Define the required scopes
-            scopes = ['https://www.googleapis.com/auth/spreadsheets']
+            scopes = [
+                'https://www.googleapis.com/auth/spreadsheets',
+                'https://www.googleapis.com/auth/drive.metadata.readonly'
+            ]
 
             # Check if credentials are provided as base64 environment variable (Railway)
             google_service_account_json = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON')
@@ -171,29 +318,47 @@ class GoogleSheetsService:
             sheet: The worksheet object
             row_data: List of values to append
         """
+        return bool(self._append_rows_safe(sheet, [row_data]))
+
+    def _append_rows_safe(self, sheet, rows: List[List[Any]]) -> int:
+        """
+        Safely append several rows to a sheet with a single update() call
+
+        Args:
+            sheet: The worksheet object
+            rows: List of rows (each a list of values) to append
+
+        Returns:
+            Row number of the first appended row, or 0 on failure
+        """
+        if not rows:
+            return 0
+
         try:
-            # Get current row count
-            all_values = sheet.get_all_values()
-            next_row_num = len(all_values) + 1
-
-            # Calculate range (A to last column needed)
-            num_cols = len(row_data)
-            end_col = chr(64 + num_cols)  # A=65, so 64+1=A, 64+2=B, etc.
-            range_name = f'A{next_row_num}:{end_col}{next_row_num}'
-
-            # Use update() with positional arguments for better compatibility
-            # Different gspread versions have different signatures
-            try:
-                # Try newer gspread API (v5+)
-                sheet.update(range_name, [row_data], value_input_option='RAW')
-            except TypeError:
-                # Fallback to older API with keyword arguments
-                sheet.update(range_name=range_name, values=[row_data], value_input_option='RAW')
+            with GoogleSheetsService._append_lock:
+                # Get current row count
+                all_values = sheet.get_all_values()
+                first_row_num = len(all_values) + 1
+                last_row_num = first_row_num + len(rows) - 1
+
+                # Calculate range (A to last column needed)
+                num_cols = max(len(row) for row in rows)
+                end_col = chr(64 + num_cols)  # A=65, so 64+1=A, 64+2=B, etc.
+                range_name = f'A{first_row_num}:{end_col}{last_row_num}'
+
+                # Use update() with positional arguments for better compatibility
+                # Different gspread versions have different signatures
+                try:
+                    # Try newer gspread API (v5+)
+                    sheet.update(range_name, rows, value_input_option='RAW')
+                except TypeError:
+                    # Fallback to older API with keyword arguments
+                    sheet.update(range_name=range_name, values=rows, value_input_option='RAW')
 
-            return True
+            return first_row_num
         except Exception as e:
-            logger.error(f"Failed to append row: {e}")
-            return False
+            logger.error(f"Failed to append {len(rows)} row(s): {e}")
+            return 0
 
     def _init_config_sheet(self):
         """Initialize Config sheet with default system variables"""
@@ -225,6 +390,33 @@ class GoogleSheetsService:
 
     # ==================== CONTACTS SHEET ====================
 
+    def _contact_row(self, contact_data: Dict[str, Any]) -> List[Any]:
+        """Build a Contacts sheet row from a contact dictionary"""
+        now = datetime.now().isoformat()
+        return [
+            contact_data.get('contact_id', ''),
+            contact_data.get('phone', ''),
+            contact_data.get('first_name', ''),
+            contact_data.get('contact_source', 'facebook_ads'),  # Default to facebook_ads
+            contact_data.get('current_tree', 'Tree1'),
+            contact_data.get('current_step', 'B1_Z1'),
+            contact_data.get('selected_day', ''),
+            contact_data.get('registration_time', now),
+            contact_data.get('chosen_timeslot', ''),
+            contact_data.get('session_datetime', ''),
+            contact_data.get('last_inbound_msg_time', now),
+            contact_data.get('window_expires_at', ''),
+            contact_data.get('thumbs_up_received', 'No'),
+            contact_data.get('payment_status', 'None'),
+            contact_data.get('member_type', ''),
+            contact_data.get('trial_start', ''),
+            contact_data.get('trial_end', ''),
+            contact_data.get('attended_status', ''),
+            contact_data.get('csv_follow_up_group', ''),
+            contact_data.get('tier2_approved', 'No'),
+            now
+        ]
+
     def add_contact(self, contact_data: Dict[str, Any]) -> bool:
         """
         Add a new contact to the Contacts sheet
@@ -236,32 +428,13 @@ class GoogleSheetsService:
             True if successful, False otherwise
         """
         try:
-            row = [
-                contact_data.get('contact_id', ''),
-                contact_data.get('phone', ''),
-                contact_data.get('first_name', ''),
-                contact_data.get('contact_source', 'facebook_ads'),  # Default to facebook_ads
-                contact_data.get('current_tree', 'Tree1'),
-                contact_data.get('current_step', 'B1_Z1'),
-                contact_data.get('selected_day', ''),
-                contact_data.get('registration_time', datetime.now().isoformat()),
-                contact_data.get('chosen_timeslot', ''),
-                contact_data.get('session_datetime', ''),
-                contact_data.get('last_inbound_msg_time', datetime.now().isoformat()),
-                contact_data.get('window_expires_at', ''),
-                contact_data.get('thumbs_up_received', 'No'),
-                contact_data.get('payment_status', 'None'),
-                contact_data.get('member_type', ''),
-                contact_data.get('trial_start', ''),
-                contact_data.get('trial_end', ''),
-                contact_data.get('attended_status', ''),
-                contact_data.get('csv_follow_up_group', ''),
-                contact_data.get('tier2_approved', 'No'),
-                datetime.now().isoformat()
-            ]
+            row = self._contact_row(contact_data)
 
-            success = self._append_row_safe(self.sheets['Contacts'], row)
+            row_num = self._append_rows_safe(self.sheets['Contacts'], [row])
+            success = bool(row_num)
             if success:
+                self._contact_rows.setdefault(row[0], row_num)
+                self._bump_contacts_version(row[0])
                 logger.info(f"Added contact {contact_data.get('contact_id')} ({contact_data.get('contact_source', 'facebook_ads')}) to Contacts sheet")
             return success
 
@@ -269,6 +442,37 @@ class GoogleSheetsService:
             logger.error(f"Failed to add contact: {error}")
             return False
 
+    def batch_add_contacts(self, contacts: List[Dict[str, Any]]) -> bool:
+        """
+        Add several contacts to the Contacts sheet in one write
+
+        Args:
+            contacts: List of contact dictionaries (same shape as add_contact)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not contacts:
+            return True
+
+        try:
+            rows = [self._contact_row(contact_data) for contact_data in contacts]
+
+            first_row_num = self._append_rows_safe(self.sheets['Contacts'], rows)
+            if not first_row_num:
+                logger.error(f"Failed to add {len(rows)} contacts")
+                return False
+
+            for offset, row in enumerate(rows):
+                self._contact_rows.setdefault(row[0], first_row_num + offset)
+                self._bump_contacts_version(row[0])
+            logger.info(f"Added {len(rows)} contacts to Contacts sheet")
+            return True
+
+        except Exception as error:
+            logger.error(f"Failed to batch add contacts: {error}")
+            return False
+
     def update_contact(self, contact_id: str, updates: Dict[str, Any]) -> bool:
         """
         Update an existing contact's information
@@ -281,45 +485,23 @@ class GoogleSheetsService:
             True if successful, False otherwise
         """
         try:
-            row_index = self._find_contact_row(contact_id)
+            row_index = self._contact_rows.get(contact_id)
+            if row_index is None or self.sheets['Contacts'].cell(row_index, 1).value != contact_id:
+                row_index = self._find_contact_row(contact_id)
 
             if row_index is None:
                 logger.warning(f"Contact {contact_id} not found in sheet")
                 return False
 
-            # Map field names to column numbers (1-indexed)
-            field_columns = {
-                'phone': 2,
-                'first_name': 3,
-                'contact_source': 4,
-                'current_tree': 5,
-                'current_step': 6,
-                'selected_day': 7,
-                'registration_time': 8,
-                'chosen_timeslot': 9,
-                'session_datetime': 10,
-                'last_inbound_msg_time': 11,
-                'window_expires_at': 12,
-                'thumbs_up_received': 13,
-                'payment_status': 14,
-                'member_type': 15,
-                'trial_start': 16,
-                'trial_end': 17,
-                'attended_status': 18,
-                'csv_follow_up_group': 19,
-                'tier2_approved': 20,
-                'last_updated': 21
-            }
-
             # Update last_updated timestamp
             updates['last_updated'] = datetime.now().isoformat()
 
-            # Update each field
-            for field, value in updates.items():
-                if field in field_columns:
-                    col_index = field_columns[field]
-                    self.sheets['Contacts'].update_cell(row_index, col_index, value)
+            # Write every field in one request
+            self.sheets['Contacts'].batch_update(
+                self._contact_update_ranges(row_index, updates), value_input_option='USER_ENTERED'
+            )
 
+            self._bump_contacts_version(contact_id)
             logger.info(f"Updated contact {contact_id} in sheet")
             return True
 
@@ -327,9 +509,68 @@ class GoogleSheetsService:
             logger.error(f"Failed to update contact: {error}")
             return False
 
+    def _contact_update_ranges(self, row_index: int, updates: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build batch_update ranges writing the known fields of updates into one Contacts row"""
+        return [
+            {'range': f'{chr(64 + CONTACT_FIELD_COLUMNS[field])}{row_index}', 'values': [[value]]}
+            for field, value in updates.items()
+            if field in CONTACT_FIELD_COLUMNS
+        ]
+
+    def queue_update(self, contact_id: str, fields: Dict[str, Any]):
+        """
+        Queue a contact update to be written by the next flush_updates() call
+
+        Args:
+            contact_id: Contact ID to update
+            fields: Dictionary of fields to update (merged with earlier queued fields)
+        """
+        with self._pending_updates_lock:
+            self._pending_updates.setdefault(contact_id, {}).update(fields)
+
+    def flush_updates(self) -> bool:
+        """
+        Write all queued contact updates with one column read and one batch_update
+
+        Returns:
+            True if successful (or nothing was queued), False otherwise
+        """
+        with self._pending_updates_lock:
+            pending, self._pending_updates = self._pending_updates, {}
+
+        if not pending:
+            return True
+
+        try:
+            # One fresh column scan instead of checking each indexed row
+            self._refresh_contact_rows()
+            last_updated = datetime.now().isoformat()
+
+            data = []
+            for contact_id, fields in pending.items():
+                row_index = self._contact_rows.get(contact_id)
+                if row_index is None:
+                    logger.warning(f"Contact {contact_id} not found in sheet")
+                    continue
+                data.extend(self._contact_update_ranges(row_index, {**fields, 'last_updated': last_updated}))
+
+            if data:
+                self.sheets['Contacts'].batch_update(data, value_input_option='USER_ENTERED')
+
+            for contact_id in pending:
+                self._bump_contacts_version(contact_id)
+
+            logger.info(f"Flushed updates for {len(pending)} contacts")
+            return True
+
+        except Exception as error:
+            logger.error(f"Failed to flush contact updates: {error}")
+            return False
+
     def _find_contact_row(self, contact_id: str) -> Optional[int]:
         """
         Find the row number for a given contact ID in Contacts sheet
+        (reads column A and rebuilds the contact_id -> row index)
 
         Args:
             contact_id: Contact ID to find
@@ -338,18 +579,24 @@ class GoogleSheetsService:
             Row number (1-indexed) or None if not found
         """
         try:
-            contact_ids = self.sheets['Contacts'].col_values(1)
-
-            for i, cid in enumerate(contact_ids):
-                if cid == contact_id:
-                    return i + 1
-
-            return None
+            self._refresh_contact_rows()
+            return self._contact_rows.get(contact_id)
 
         except Exception as error:
             logger.error(f"Failed to find contact row: {error}")
             return None
 
+    def _refresh_contact_rows(self):
+        """Rebuild the contact_id -> row index from column A of the Contacts sheet"""
+        contact_ids = self.sheets['Contacts'].col_values(1)
+
+        contact_rows = {}
+        for i, cid in enumerate(contact_ids[1:], start=2):  # Skip header
+            if cid:
+                contact_rows.setdefault(cid, i)
+
+        self._contact_rows = contact_rows
+
     def get_contact(self, contact_id: str) -> Optional[Dict[str, Any]]:
         """
         Get contact information from the Contacts sheet
@@ -361,85 +608,149 @@ class GoogleSheetsService:
             Dictionary with contact data or None if not found
         """
         try:
-            row_index = self._find_contact_row(contact_id)
+            # Try the indexed row first; fall back to a column scan if it has moved
+            row_index = self._contact_rows.get(contact_id)
+            row = self.sheets['Contacts'].row_values(row_index) if row_index else None
 
-            if row_index is None:
-                return None
+            if not row or row[0] != contact_id:
+                row_index = self._find_contact_row(contact_id)
 
-            row = self.sheets['Contacts'].row_values(row_index)
-
-            contact_data = {
-                'contact_id': row[0] if len(row) > 0 else '',
-                'phone': row[1] if len(row) > 1 else '',
-                'first_name': row[2] if len(row) > 2 else '',
-                'contact_source': row[3] if len(row) > 3 else 'facebook_ads',
-                'current_tree': row[4] if len(row) > 4 else 'Tree1',
-                'current_step': row[5] if len(row) > 5 else '',
-                'selected_day': row[6] if len(row) > 6 else '',
-                'registration_time': row[7] if len(row) > 7 else '',
-                'chosen_timeslot': row[8] if len(row) > 8 else '',
-                'session_datetime': row[9] if len(row) > 9 else '',
-                'last_inbound_msg_time': row[10] if len(row) > 10 else '',
-                'window_expires_at': row[11] if len(row) > 11 else '',
-                'thumbs_up_received': row[12] if len(row) > 12 else 'No',
-                'payment_status': row[13] if len(row) > 13 else 'None',
-                'member_type': row[14] if len(row) > 14 else '',
-                'trial_start': row[15] if len(row) > 15 else '',
-                'trial_end': row[16] if len(row) > 16 else '',
-                'attended_status': row[17] if len(row) > 17 else '',
-                'csv_follow_up_group': row[18] if len(row) > 18 else '',
-                'tier2_approved': row[19] if len(row) > 19 else 'No',
-                'last_updated': row[20] if len(row) > 20 else ''
-            }
+                if row_index is None:
+                    return None
+
+                row = self.sheets['Contacts'].row_values(row_index)
 
-            return contact_data
+            return self._parse_contact_row(row)
 
         except Exception as error:
             logger.error(f"Failed to get contact: {error}")
             return None
 
+    def _parse_contact_row(self, row: List[str]) -> Dict[str, Any]:
+        """
+        Convert a Contacts sheet row into a contact dictionary
+
+        Args:
+            row: Row values (may be shorter than the header)
+
+        Returns:
+            Dictionary with contact data
+        """
+        contact_data = {
+            'contact_id': row[0] if len(row) > 0 else '',
+            'phone': row[1] if len(row) > 1 else '',
+            'first_name': row[2] if len(row) > 2 else '',
+            'contact_source': row[3] if len(row) > 3 else 'facebook_ads',
+            'current_tree': row[4] if len(row) > 4 else 'Tree1',
+            'current_step': row[5] if len(row) > 5 else '',
+            'selected_day': row[6] if len(row) > 6 else '',
+            'registration_time': row[7] if len(row) > 7 else '',
+            'chosen_timeslot': row[8] if len(row) > 8 else '',
+            'session_datetime': row[9] if len(row) > 9 else '',
+            'last_inbound_msg_time': row[10] if len(row) > 10 else '',
+            'window_expires_at': row[11] if len(row) > 11 else '',
+            'thumbs_up_received': row[12] if len(row) > 12 else 'No',
+            'payment_status': row[13] if len(row) > 13 else 'None',
+            'member_type': row[14] if len(row) > 14 else '',
+            'trial_start': row[15] if len(row) > 15 else '',
+            'trial_end': row[16] if len(row) > 16 else '',
+            'attended_status': row[17] if len(row) > 17 else '',
+            'csv_follow_up_group': row[18] if len(row) > 18 else '',
+            'tier2_approved': row[19] if len(row) > 19 else 'No',
+            'last_updated': row[20] if len(row) > 20 else ''
+        }
+
+        return contact_data
+
+    def batch_get_contacts(self, contact_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several contacts with a single read of the Contacts sheet
+
+        Args:
+            contact_ids: Contact IDs to retrieve
+
+        Returns:
+            Dictionary of contact_id -> contact data (missing IDs are omitted)
+        """
+        wanted = set(contact_ids)
+        if not wanted:
+            return {}
+
+        try:
+            all_rows = self.sheets['Contacts'].get_all_values()[1:]  # Skip header
+            contacts = {}
+            contact_rows = {}
+
+            for row_num, row in enumerate(all_rows, start=2):
+                if not row or not row[0]:
+                    continue
+                contact_rows.setdefault(row[0], row_num)
+                if row[0] in wanted and row[0] not in contacts:
+                    contacts[row[0]] = self._parse_contact_row(row)
+
+            self._contact_rows = contact_rows
+            return contacts
+
+        except Exception as error:
+            logger.error(f"Failed to batch get contacts: {error}")
+            return {}
+
+    def get_modified_time(self) -> Optional[str]:
+        """
+        Get the spreadsheet's last modification time from Drive
+
+        Returns:
+            RFC 3339 modifiedTime, or None if it can't be read
+        """
+        try:
+            response = self.client.request(
+                'get',
+                f"{DRIVE_FILES_URL}/{self.spreadsheet_id}",
+                params={'fields': 'modifiedTime', 'supportsAllDrives': True}
+            )
+            return response.json().get('modifiedTime')
+
+        except Exception as error:
+            logger.warning(f"Failed to get spreadsheet modifiedTime: {error}")
+            return None
+
     def get_all_contacts(self) -> List[Dict[str, Any]]:
         """
         Get all contacts from the Contacts sheet
+        (reuses the last read while the spreadsheet's modifiedTime hasn't moved;
+        modifiedTime is checked at most once per CONTACTS_CACHE_TTL seconds)
 
         Returns:
-            List of contact dictionaries
+            List of contact dictionaries (copies, safe for the caller to modify)
         """
+        version = self.contacts_version
+        cached = self._contacts_cache
+        if cached and cached[1] == version and time.monotonic() - cached[3] < CONTACTS_CACHE_TTL:
+            return [dict(contact) for contact in cached[2]]
+
+        modified_time = self.get_modified_time()
+        if modified_time and cached and cached[:2] == (modified_time, version):
+            self._contacts_cache = (modified_time, version, cached[2], time.monotonic())
+            return [dict(contact) for contact in cached[2]]
+
         try:
             all_rows = self.sheets['Contacts'].get_all_values()[1:]  # Skip header
             contacts = []
+            contact_rows = {}
 
-            for row in all_rows:
+            for row_num, row in enumerate(all_rows, start=2):
                 if not row or not row[0]:
                     continue
 
-                contact_data = {
-                    'contact_id': row[0] if len(row) > 0 else '',
-                    'phone': row[1] if len(row) > 1 else '',
-                    'first_name': row[2] if len(row) > 2 else '',
-                    'contact_source': row[3] if len(row) > 3 else 'facebook_ads',
-                    'current_tree': row[4] if len(row) > 4 else 'Tree1',
-                    'current_step': row[5] if len(row) > 5 else '',
-                    'registration_time': row[6] if len(row) > 6 else '',
-                    'chosen_timeslot': row[7] if len(row) > 7 else '',
-                    'session_datetime': row[8] if len(row) > 8 else '',
-                    'last_inbound_msg_time': row[9] if len(row) > 9 else '',
-                    'window_expires_at': row[10] if len(row) > 10 else '',
-                    'thumbs_up_received': row[11] if len(row) > 11 else 'No',
-                    'payment_status': row[12] if len(row) > 12 else 'None',
-                    'member_type': row[13] if len(row) > 13 else '',
-                    'trial_start': row[14] if len(row) > 14 else '',
-                    'trial_end': row[15] if len(row) > 15 else '',
-                    'attended_status': row[16] if len(row) > 16 else '',
-                    'csv_follow_up_group': row[17] if len(row) > 17 else '',
-                    'tier2_approved': row[18] if len(row) > 18 else 'No',
-                    'last_updated': row[19] if len(row) > 19 else ''
-                }
+                contact_rows.setdefault(row[0], row_num)
+                contacts.append(self._parse_contact_row(row))
 
-                contacts.append(contact_data)
+            self._contact_rows = contact_rows
+            if modified_time:
+                self._contacts_cache = (modified_time, version, contacts, time.monotonic())
 
             logger.info(f"Retrieved {len(contacts)} contacts from sheet")
-            return contacts
+            return [dict(contact) for contact in contacts]
 
         except Exception as error:
             logger.error(f"Failed to get all contacts: {error}")
@@ -458,22 +769,14 @@ class GoogleSheetsService:
             Message ID if successful, empty string otherwise
         """
         try:
-            message_id = message_data.get('message_id', str(uuid.uuid4()))
-
-            row = [
-                message_id,
-                message_data.get('contact_id', ''),
-                message_data.get('message_code', ''),
-                message_data.get('scheduled_send_time', ''),
-                message_data.get('status', 'pending'),
-                message_data.get('sent_at', ''),
-                message_data.get('trigger_type', ''),
-                datetime.now().isoformat()
-            ]
+            row = self._scheduled_message_row(message_data)
+            message_id = row[0]
 
-            success = self._append_row_safe(self.sheets['Scheduled_Messages'], row)
-            if success:
+            first_row_num = self._append_rows_safe(self.sheets['Scheduled_Messages'], [row])
+            if first_row_num:
                 logger.info(f"Scheduled message {message_data.get('message_code')} for {message_data.get('contact_id')} at {message_data.get('scheduled_send_time')}")
+                self._cache_scheduled([row], first_row_num)
+                self._notify_scheduled([row])
                 return message_id
             else:
                 logger.error(f"Failed to schedule message {message_data.get('message_code')}")
@@ -483,40 +786,196 @@ class GoogleSheetsService:
             logger.error(f"Failed to schedule message: {error}")
             return ''
 
+    def batch_schedule_messages(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several messages to the scheduled messages queue in one write
+
+        Args:
+            messages: List of message dictionaries (same shape as schedule_message)
+
+        Returns:
+            List of message IDs if successful, empty list otherwise
+        """
+        if not messages:
+            return []
+
+        try:
+            rows = [self._scheduled_message_row(message_data) for message_data in messages]
+
+            first_row_num = self._append_rows_safe(self.sheets['Scheduled_Messages'], rows)
+            if first_row_num:
+                logger.info(f"Scheduled {len(rows)} messages")
+                self._cache_scheduled(rows, first_row_num)
+                self._notify_scheduled(rows)
+                return [row[0] for row in rows]
+
+            logger.error(f"Failed to schedule {len(rows)} messages")
+            return []
+
+        except Exception as error:
+            logger.error(f"Failed to batch schedule messages: {error}")
+            return []
+
+    def _cache_scheduled(self, rows: List[List[Any]], first_row_num: int):
+        """
+        Mirror newly appended Scheduled_Messages rows into the local cache
+
+        Args:
+            rows: Appended rows (same order as written)
+            first_row_num: Sheet row number of the first row
+        """
+        if self.scheduled_cache is None:
+            return
+
+        self.scheduled_cache.upsert([
+            {
+                'message_id': row[0],
+                'contact_id': row[1],
+                'message_code': row[2],
+                'scheduled_send_time': row[3],
+                'status': row[4],
+                'trigger_type': row[6],
+                'row_index': row_num
+            }
+            for row_num, row in enumerate(rows, start=first_row_num)
+        ])
+
+    def _scheduled_message_row(self, message_data: Dict[str, Any]) -> List[Any]:
+        """
+        Build a Scheduled_Messages row from a message dictionary
+
+        Args:
+            message_data: Dictionary with message details
+
+        Returns:
+            Row values (message ID first)
+        """
+        return [
+            message_data.get('message_id', str(uuid.uuid4())),
+            message_data.get('contact_id', ''),
+            message_data.get('message_code', ''),
+            message_data.get('scheduled_send_time', ''),
+            message_data.get('status', 'pending'),
+            message_data.get('sent_at', ''),
+            message_data.get('trigger_type', ''),
+            datetime.now().isoformat()
+        ]
+
     def get_pending_messages(self) -> List[Dict[str, Any]]:
         """
-        Get all pending scheduled messages
+        Get all pending scheduled messages, earliest scheduled_send_time first
 
         Returns:
             List of pending message dictionaries
         """
         try:
-            all_rows = self.sheets['Scheduled_Messages'].get_all_values()[1:]
-            pending_messages = []
+            return self._read_pending_messages()
 
-            for row in all_rows:
-                if not row or len(row) < 5:
-                    continue
+        except Exception as error:
+            logger.error(f"Failed to get pending messages: {error}")
+            return []
+
+    def _read_pending_messages(self) -> List[Dict[str, Any]]:
+        """Read pending scheduled messages from the sheet (raises if the read fails)"""
+        all_rows = self.sheets['Scheduled_Messages'].get_all_values()[1:]
+        pending_messages = []
+
+        for row_index, row in enumerate(all_rows, start=2):  # Skip header, start at row 2
+            if not row or len(row) < 5:
+                continue
+
+            status = row[4] if len(row) > 4 else ''
+            if status == 'pending':
+                message_data = {
+                    'message_id': row[0],
+                    'contact_id': row[1] if len(row) > 1 else '',
+                    # Interned so the scheduler's dispatch and template lookups hit the identity fast path
+                    'message_code': sys.intern(row[2]) if len(row) > 2 else '',
+                    'scheduled_send_time': row[3] if len(row) > 3 else '',
+                    'status': 'pending',
+                    'sent_at': row[5] if len(row) > 5 else '',
+                    'trigger_type': row[6] if len(row) > 6 else '',
+                    'created_at': row[7] if len(row) > 7 else '',
+                    'row_index': row_index
+                }
+                pending_messages.append(message_data)
 
-                status = row[4] if len(row) > 4 else ''
-                if status == 'pending':
-                    message_data = {
-                        'message_id': row[0],
-                        'contact_id': row[1] if len(row) > 1 else '',
-                        'message_code': row[2] if len(row) > 2 else '',
-                        'scheduled_send_time': row[3] if len(row) > 3 else '',
-                        'status': status,
-                        'sent_at': row[5] if len(row) > 5 else '',
-                        'trigger_type': row[6] if len(row) > 6 else '',
-                        'created_at': row[7] if len(row) > 7 else ''
-                    }
-                    pending_messages.append(message_data)
-
-            return pending_messages
+        # ISO timestamps written with the same UTC offset sort chronologically as strings
+        pending_messages.sort(key=lambda m: m['scheduled_send_time'])
+        return pending_messages
 
+    def refresh_pending_cache(self) -> int:
+        """
+        Reload the local scheduled-message cache from the sheet (full pull)
+        If the sheet can't be read the cache keeps its previous contents, so messages
+        scheduled before a restart are still sent while Sheets is unreachable
+
+        Returns:
+            Number of pending messages loaded (0 if the read failed)
+        """
+        try:
+            pending_messages = self._read_pending_messages()
         except Exception as error:
-            logger.error(f"Failed to get pending messages: {error}")
+            logger.error(f"Failed to refresh pending messages, keeping cached schedule: {error}")
+            return 0
+
+        if self.scheduled_cache is None:
+            return 0
+
+        self.scheduled_cache.replace_pending(pending_messages)
+        return len(pending_messages)
+
+    def get_due_messages(self, now: datetime) -> List[Dict[str, Any]]:
+        """
+        Get due pending messages from the local cache, earliest first
+
+        Args:
+            now: Current (aware) time
+
+        Returns:
+            List of message dictionaries
+        """
+        if self.scheduled_cache is None:
+            return []
+        return self.scheduled_cache.get_due(now.timestamp())
+
+    def get_next_send_time(self, now: datetime) -> Optional[tuple]:
+        """
+        Get the next pending send time after now from the local cache
+
+        Args:
+            now: Current (aware) time
+
+        Returns:
+            Tuple of (POSIX timestamp, message_id), or None if nothing is pending
+        """
+        if self.scheduled_cache is None:
+            return None
+        return self.scheduled_cache.next_send_time(now.timestamp())
+
+    def record_sent_message(self, message_id: str):
+        """
+        Remember locally that a scheduled message was sent (survives restarts and cache refreshes)
+
+        Args:
+            message_id: Scheduled message ID
+        """
+        if self.scheduled_cache is not None:
+            self.scheduled_cache.record_sent(message_id)
+
+    def get_recent_sent_ids(self, limit: int) -> List[str]:
+        """
+        Get the most recently sent scheduled message IDs from the local cache, oldest first
+
+        Args:
+            limit: Maximum number of IDs to return
+
+        Returns:
+            List of message IDs
+        """
+        if self.scheduled_cache is None:
             return []
+        return self.scheduled_cache.recent_sent_ids(limit)
 
     def update_message_status(self, message_id: str, status: str, sent_at: str = None) -> bool:
         """
@@ -530,6 +989,9 @@ class GoogleSheetsService:
         Returns:
             True if successful, False otherwise
         """
+        if self.scheduled_cache is not None:
+            self.scheduled_cache.set_status_by_id(message_id, status)
+
         try:
             # Find the message row
             message_ids = self.sheets['Scheduled_Messages'].col_values(1)
@@ -552,6 +1014,50 @@ class GoogleSheetsService:
             logger.error(f"Failed to update message status: {error}")
             return False
 
+    def batch_update_message_status(self, updates: List[tuple]) -> bool:
+        """
+        Update the status of several scheduled messages with a single request
+
+        Args:
+            updates: List of (message_id, row_index, status, sent_at) tuples, row_index as
+                returned in get_pending_messages()
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not updates:
+            return True
+
+        if self.scheduled_cache is not None:
+            self.scheduled_cache.set_status({message_id: status for message_id, _, status, _ in updates})
+
+        try:
+            sheet = self.sheets['Scheduled_Messages']
+
+            # Cached row indices go stale if rows shift, so check each row still holds its message
+            found = sheet.batch_get([f'A{row_index}' for _, row_index, _, _ in updates])
+            rows_by_id = None
+            data = []
+            for (message_id, row_index, status, sent_at), cell in zip(updates, found):
+                if not (cell and cell[0] and cell[0][0] == message_id):
+                    if rows_by_id is None:
+                        rows_by_id = {mid: i for i, mid in enumerate(sheet.col_values(1), 1)}
+                    row_index = rows_by_id.get(message_id)
+                    if row_index is None:
+                        logger.warning(f"Message {message_id} not found")
+                        continue
+                data.append({'range': f'E{row_index}:F{row_index}', 'values': [[status, sent_at or '']]})
+
+            if data:
+                sheet.batch_update(data, value_input_option='RAW')
+
+            logger.info(f"Updated status of {len(updates)} scheduled messages")
+            return True
+
+        except Exception as error:
+            logger.error(f"Failed to batch update message status: {error}")
+            return False
+
     def cancel_scheduled_messages(self, contact_id: str, message_codes: List[str] = None) -> bool:
         """
         Cancel scheduled messages for a contact (e.g., when they switch trees)
@@ -563,6 +1069,9 @@ class GoogleSheetsService:
         Returns:
             True if successful
         """
+        if self.scheduled_cache is not None:
+            self.scheduled_cache.cancel(contact_id, message_codes)
+
         try:
             all_rows = self.sheets['Scheduled_Messages'].get_all_values()
 
@@ -601,25 +1110,85 @@ class GoogleSheetsService:
             True if successful
         """
         try:
-            log_id = log_data.get('log_id', str(uuid.uuid4()))
-
-            row = [
-                log_id,
-                log_data.get('contact_id', ''),
-                log_data.get('timestamp', datetime.now().isoformat()),
-                log_data.get('direction', ''),  # 'inbound' or 'outbound'
-                log_data.get('message_code', ''),
-                log_data.get('message_content', ''),
-                log_data.get('window_valid', 'Yes')
-            ]
-
-            success = self._append_row_safe(self.sheets['Message_Log'], row)
+            success = self._append_row_safe(self.sheets['Message_Log'], self._log_row(log_data))
             return success
 
         except Exception as error:
             logger.warning(f"Failed to log message: {error}")
             return False
 
+    def batch_log_messages(self, entries: List[Dict[str, Any]]) -> bool:
+        """
+        Log several messages to the Message_Log sheet in one write
+
+        Args:
+            entries: List of log dictionaries (same shape as log_message)
+
+        Returns:
+            True if successful
+        """
+        if not entries:
+            return True
+
+        try:
+            rows = [self._log_row(log_data) for log_data in entries]
+            return bool(self._append_rows_safe(self.sheets['Message_Log'], rows))
+
+        except Exception as error:
+            logger.warning(f"Failed to batch log messages: {error}")
+            return False
+
+    def batch_log_rows(self, rows: List[tuple]) -> bool:
+        """
+        Log several messages given as positional rows, in one write
+
+        Args:
+            rows: Tuples of (contact_id, timestamp, direction, message_code,
+                message_content, window_valid)
+
+        Returns:
+            True if successful
+        """
+        if not rows:
+            return True
+
+        try:
+            values = []
+            for contact_id, timestamp, direction, message_code, content, window_valid in rows:
+                if len(content) > MESSAGE_LOG_CONTENT_LIMIT:
+                    content = content[:MESSAGE_LOG_CONTENT_LIMIT]
+                values.append([str(uuid.uuid4()), contact_id, timestamp, direction, message_code, content, window_valid])
+
+            return bool(self._append_rows_safe(self.sheets['Message_Log'], values))
+
+        except Exception as error:
+            logger.warning(f"Failed to batch log rows: {error}")
+            return False
+
+    def _log_row(self, log_data: Dict[str, Any]) -> List[Any]:
+        """
+        Build a Message_Log row from a log dictionary
+
+        Args:
+            log_data: Dictionary with log information
+
+        Returns:
+            Row values
+        """
+        content = log_data.get('message_content', '')
+        if len(content) > MESSAGE_LOG_CONTENT_LIMIT:
+            content = content[:MESSAGE_LOG_CONTENT_LIMIT]
+
+        return [
+            log_data.get('log_id', str(uuid.uuid4())),
+            log_data.get('contact_id', ''),
+            log_data.get('timestamp', datetime.now().isoformat()),
+            log_data.get('direction', ''),  # 'inbound' or 'outbound'
+            log_data.get('message_code', ''),
+            content,
+            log_data.get('window_valid', 'Yes')
+        ]
+
     # ==================== CSV PROCESSING ====================
 
     def add_csv_record(self, csv_data: Dict[str, Any]) -> bool:
@@ -663,34 +1232,47 @@ class GoogleSheetsService:
         Returns:
             List of contact dictionaries
         """
+        return self.get_follow_up_contacts_by_group([group])[group]
+
+    def get_follow_up_contacts_by_group(self, groups: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get contacts for several Friday follow-up groups with one pass over CSV_Processing
+
+        Args:
+            groups: Follow-up groups to collect (e.g. 'Attended_NoSales', 'NoShow')
+
+        Returns:
+            Dictionary of group -> list of contact dictionaries
+        """
+        contacts_by_group = {group: [] for group in groups}
+
         try:
             all_rows = self.sheets['CSV_Processing'].get_all_values()[1:]
-            contacts = []
 
             for row in all_rows:
                 if not row or len(row) < 7:
                     continue
 
-                follow_up_group = row[6] if len(row) > 6 else ''
+                follow_up_group = row[6]
                 follow_up_sent = row[7] if len(row) > 7 else ''
+                group_contacts = contacts_by_group.get(follow_up_group)
 
-                if follow_up_group == group and not follow_up_sent:
-                    contact_data = {
+                if group_contacts is not None and not follow_up_sent:
+                    group_contacts.append({
                         'contact_id': row[0],
-                        'first_name': row[1] if len(row) > 1 else '',
-                        'weekend_date': row[2] if len(row) > 2 else '',
-                        'zoom_attended': row[3] if len(row) > 3 else '',
-                        'attendance_count': row[4] if len(row) > 4 else '',
-                        'sales_status': row[5] if len(row) > 5 else '',
+                        'first_name': row[1],
+                        'weekend_date': row[2],
+                        'zoom_attended': row[3],
+                        'attendance_count': row[4],
+                        'sales_status': row[5],
                         'follow_up_group': follow_up_group
-                    }
-                    contacts.append(contact_data)
+                    })
 
-            return contacts
+            return contacts_by_group
 
         except Exception as error:
             logger.error(f"Failed to get follow-up contacts: {error}")
-            return []
+            return {group: [] for group in groups}
 
     # ==================== CONFIG ====================
 
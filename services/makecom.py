@@ -0,0 +1,116 @@
+"""
+Make.com Webhook Format
+Converts Make.com webhook payloads to the internal message handler format
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def transform_makecom_to_internal(make_data: dict) -> dict:
+    """
+    Transform Make.com webhook format to internal message handler format
+    Supports multiple Make.com output formats
+
+    Args:
+        make_data: Data from Make.com
+
+    Returns:
+        Transformed data for message_handler
+    """
+    try:
+        # Check if data is already in simple format (from Make.com HTTP module)
+        if 'contact' in make_data and 'message' in make_data:
+            # Simple format from Make.com HTTP module
+            contact_info = make_data.get('contact', {})
+            message_info = make_data.get('message', {})
+
+            contact_id = contact_info.get('id', '')
+            phone = contact_info.get('phone', '')
+            first_name = contact_info.get('firstName', contact_info.get('first_name', ''))
+            message_text = message_info.get('text', '')
+
+            # Extract custom fields and tags (if present in Make.com payload)
+            custom_fields = contact_info.get('customFields', contact_info.get('custom_fields', {}))
+            tags = contact_info.get('tags', [])
+
+            internal_format = {
+                'event': 'message.received',
+                'contact': {
+                    'id': contact_id,
+                    'phone': phone,
+                    'firstName': first_name,
+                    'lastName': contact_info.get('lastName', contact_info.get('last_name', '')),
+                    'customFields': custom_fields,
+                    'tags': tags
+                },
+                'message': {
+                    'id': message_info.get('id', ''),
+                    'type': message_info.get('type', 'text'),
+                    'text': message_text,
+                    'timestamp': message_info.get('timestamp', ''),
+                    'context': message_info.get('context', {})
+                },
+                'channel': make_data.get('channel', {})
+            }
+
+            logger.info(f"Transformed Make.com data (simple format) - Contact: {contact_id}, Phone: {phone}, Text: {message_text}")
+            return internal_format
+
+        # Complex format from Make.com Respond.io module
+        else:
+            contact_info = make_data.get('Contact', {})
+            contact_id = contact_info.get('Contact ID', '')
+            first_name = contact_info.get('First Name', '')
+            phone = contact_info.get('Phone No.', '')
+
+            message_info = make_data.get('Message', {})
+            message_content = message_info.get('Message', {})
+            message_text = message_content.get('Text', '')
+            message_type = message_content.get('Type', 'text')
+
+            # Extract custom fields and tags from Make.com complex format
+            # Make.com might send custom fields as separate keys
+            custom_fields = {}
+            tags = []
+
+            # Look for custom field keys in contact_info
+            for key, value in contact_info.items():
+                # Skip standard fields
+                if key not in ['Contact ID', 'First Name', 'Last Name', 'Phone No.', 'Email']:
+                    # This is likely a custom field
+                    custom_fields[key] = value
+
+            # Check if tags exist in specific field
+            if 'Tags' in contact_info:
+                tags = contact_info.get('Tags', [])
+                if isinstance(tags, str):
+                    # If tags come as comma-separated string, split them
+                    tags = [t.strip() for t in tags.split(',')]
+
+            internal_format = {
+                'event': 'message.received',
+                'contact': {
+                    'id': contact_id,
+                    'phone': phone,
+                    'firstName': first_name,
+                    'lastName': contact_info.get('Last Name', ''),
+                    'customFields': custom_fields,
+                    'tags': tags
+                },
+                'message': {
+                    'id': message_info.get('ID', ''),
+                    'type': message_type,
+                    'text': message_text,
+                    'timestamp': message_info.get('Timestamp', ''),
+                    'context': message_content.get('Context', {})
+                },
+                'channel': make_data.get('Channel', {})
+            }
+
+            logger.info(f"Transformed Make.com data (complex format) - Contact: {contact_id}, Phone: {phone}, Text: {message_text}, CustomFields: {list(custom_fields.keys())}, Tags: {tags}")
+            return internal_format
+
+    except Exception as e:
+        logger.error(f"Error transforming Make.com data: {e}", exc_info=True)
+        raise
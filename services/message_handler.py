@@ -5,41 +5,99 @@ Implements Tree 1 and Tree 2 logic with exact flow from specification
 """
 import logging
 import re
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Any
-import pytz
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Any
+from zoneinfo import ZoneInfo
+
+from openai import OpenAIError
 
 from config import Config
 from services.respond_api import RespondAPI
-from services.google_sheets import GoogleSheetsService
+from services.google_sheets import SHEETS_INIT_ERRORS, GoogleSheetsService
 from services.openai_service import OpenAIService
 
 logger = logging.getLogger(__name__)
 
+# Built once at import and shared by every handler instance
+_TEMPLATES = Config.get_message_templates()
+_TIMEZONE = ZoneInfo(Config.TIMEZONE)
+_FACEBOOK_ADS_TRIGGER = re.compile(re.escape(Config.FACEBOOK_ADS_TRIGGER_MESSAGE), re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _window_delta(hours: int) -> timedelta:
+    """Messaging window length as a timedelta (built once per distinct hour count)"""
+    return timedelta(hours=hours)
+
+
+@lru_cache(maxsize=64)
+def _next_session_on(today: date, timeslot: str) -> datetime:
+    """
+    Calculate the next session datetime for a timeslot as seen from a given day
+    Only the date matters (a session on today's weekday always goes to next week),
+    so results are cached per (day, timeslot)
+
+    Args:
+        today: Current date in the configured timezone
+        timeslot: Timeslot code (SA-SE, UA-UE)
+
+    Returns:
+        Next session datetime
+    """
+    slot_info = Config.TIME_SLOTS[timeslot]
+    target_day = slot_info['day_num']  # 5 for Saturday, 6 for Sunday
+
+    # Calculate days until target day
+    days_ahead = target_day - today.weekday()
+
+    if days_ahead <= 0:  # Target day already happened (or is today) - go to next week
+        days_ahead += 7
+
+    session_date = today + timedelta(days=days_ahead)
+    return datetime.combine(session_date, slot_info['time'], tzinfo=_TIMEZONE)
+
 
 class MessageHandler:
     """Handles incoming WhatsApp messages and conversation flows"""
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'MessageHandler':
+        """
+        Get the shared MessageHandler instance (created on first use)
+
+        Returns:
+            Shared MessageHandler instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
     def __init__(self):
         self.api = RespondAPI()
         try:
             self.sheets = GoogleSheetsService() if Config.GOOGLE_SHEETS_ID else None
-        except:
+        except SHEETS_INIT_ERRORS as e:
             self.sheets = None
-            logger.warning("Google Sheets not available - will skip sheet operations")
+            logger.warning(f"Google Sheets not available - will skip sheet operations: {e}")
 
         # Initialize OpenAI service for natural responses
         try:
-            self.openai = OpenAIService()
+            self.openai = OpenAIService.get_instance()
             self.use_openai = True
             logger.info("OpenAI service initialized - using AI-generated responses")
-        except:
+        except OpenAIError as e:  # e.g. missing API key
             self.openai = None
             self.use_openai = False
-            logger.warning("OpenAI not available - using template responses")
+            logger.warning(f"OpenAI not available - using template responses: {e}")
 
-        self.templates = Config.get_message_templates()
-        self.timezone = pytz.timezone(Config.TIMEZONE)
+        self.templates = _TEMPLATES
+        self.timezone = _TIMEZONE
         self.channel_id = None  # Store channel ID from webhook
 
     def _safe_sheets_operation(self, operation, *args, **kwargs):
@@ -164,8 +222,8 @@ class MessageHandler:
             # ===== PRIORITY 2: Check message text for Facebook Ads trigger =====
             message_text = message.get('text', '') if isinstance(message, dict) else ''
 
-            # Check for Facebook Ads trigger (case-insensitive)
-            if Config.FACEBOOK_ADS_TRIGGER_MESSAGE.lower() in message_text.lower():
+            # Check for Facebook Ads trigger (case-insensitive; empty/media-only messages can't contain it)
+            if message_text and _FACEBOOK_ADS_TRIGGER.search(message_text):
                 logger.info(f"✓ Facebook Ads trigger detected: '{Config.FACEBOOK_ADS_TRIGGER_MESSAGE}'")
                 logger.info("→ Source: facebook_ads (72-hour window - VERIFIED)")
                 return Config.SOURCE_FACEBOOK_ADS
@@ -182,6 +240,19 @@ class MessageHandler:
             logger.info("→ Defaulting to website due to error")
             return Config.SOURCE_WEBSITE
 
+    def _detect_contact_source_batch(self, webhooks: List[Dict]) -> List[str]:
+        """
+        Detect the contact source for several webhook payloads
+
+        Args:
+            webhooks: Webhook payloads from Respond.io
+
+        Returns:
+            Contact sources, in the same order as webhooks
+        """
+        detect = self._detect_contact_source
+        return [detect(webhook_data) for webhook_data in webhooks]
+
     def _reset_window(self, contact_identifier: str, contact_source: str):
         """
         Reset the messaging window for a contact (Meta WhatsApp Policy)
@@ -198,7 +269,7 @@ class MessageHandler:
         try:
             now = datetime.now(self.timezone)
             window_hours = Config.get_window_duration(contact_source)
-            window_expires_at = now + timedelta(hours=window_hours)
+            window_expires_at = now + _window_delta(window_hours)
 
             # Update in sheets
             self._safe_sheets_operation(
@@ -245,7 +316,7 @@ class MessageHandler:
             # Calculate window expiry based on source
             now = datetime.now(self.timezone)
             window_hours = Config.get_window_duration(contact_source)
-            window_expires_at = now + timedelta(hours=window_hours)
+            window_expires_at = now + _window_delta(window_hours)
 
             # Try to extract name from first message (confident matches only)
             extracted_name = self._extract_first_name(message_text, confident_only=True)
@@ -617,7 +688,7 @@ class MessageHandler:
             full_timeslot = selected_day + time_code
 
             # Validate the combined timeslot exists
-            if full_timeslot not in Config.TIME_SLOTS:
+            if full_timeslot not in Config.TIME_SLOT_SET:
                 logger.error(f"Invalid timeslot combination: {full_timeslot}")
                 return False
 
@@ -781,34 +852,12 @@ Reply with just A, B, C, D or E"""
         Calculate the next session datetime for a given timeslot
 
         Args:
-            timeslot: Timeslot letter (A, B, C, D)
+            timeslot: Timeslot code (SA-SE, UA-UE)
 
         Returns:
             Next session datetime
         """
-        slot_info = Config.TIME_SLOTS[timeslot]
-        target_day = slot_info['day_num']  # 5 for Saturday, 6 for Sunday
-        session_time = slot_info['time']
-
-        # Get current time in configured timezone
-        now = datetime.now(self.timezone)
-
-        # Calculate days until target day
-        days_ahead = target_day - now.weekday()
-
-        if days_ahead <= 0:  # Target day already happened this week
-            days_ahead += 7
-
-        # If it's the target day but past the session time, go to next week
-        if days_ahead == 0 and now.time() > session_time:
-            days_ahead = 7
-
-        # Calculate session datetime
-        session_date = now.date() + timedelta(days=days_ahead)
-        session_datetime = datetime.combine(session_date, session_time)
-        session_datetime = self.timezone.localize(session_datetime)
-
-        return session_datetime
+        return _next_session_on(datetime.now(self.timezone).date(), timeslot)
 
     # ==================== SCHEDULING ====================
 
@@ -842,7 +891,7 @@ Reply with just A, B, C, D or E"""
             # B1 S3 - Next morning (Sunday or Monday) at 9:00 AM
             # Calculate next day at 9:00 AM
             next_day = session_datetime.date() + timedelta(days=1)
-            s3_time = self.timezone.localize(datetime.combine(next_day, datetime.min.time().replace(hour=9, minute=0)))
+            s3_time = datetime.combine(next_day, datetime.min.time().replace(hour=9, minute=0), tzinfo=self.timezone)
 
             messages_to_schedule = [
                 {'code': 'B1_R1', 'time': r1_time, 'trigger': 'reminder_12h'},
@@ -979,7 +1028,7 @@ Reply with just A, B, C, D or E"""
                     'timestamp': datetime.now(self.timezone).isoformat(),
                     'direction': direction,
                     'message_code': message_code,
-                    'message_content': message_content[:500],  # Truncate to 500 chars
+                    'message_content': message_content,  # Truncated to 500 chars when written
                     'window_valid': 'Yes'
                 }) if self.sheets else None
             )
@@ -1020,6 +1069,8 @@ Reply with just A, B, C, D or E"""
             window_expires_at = sheet_contact.get('window_expires_at')
             if window_expires_at:
                 expires = datetime.fromisoformat(window_expires_at)
+                if expires.tzinfo is None:
+                    expires = expires.replace(tzinfo=self.timezone)
                 now = datetime.now(self.timezone)
                 if now > expires:
                     logger.warning(f"Cannot send reminder to {contact_id}: outside 72hr window")
@@ -1078,6 +1129,8 @@ Reply with just A, B, C, D or E"""
             window_expires_at = sheet_contact.get('window_expires_at')
             if window_expires_at:
                 expires = datetime.fromisoformat(window_expires_at)
+                if expires.tzinfo is None:
+                    expires = expires.replace(tzinfo=self.timezone)
                 now = datetime.now(self.timezone)
                 if now > expires:
                     logger.warning(f"Cannot send sales message to {contact_id}: outside 72hr window")
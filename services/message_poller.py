@@ -5,8 +5,8 @@ Polls Respond.io for new messages (alternative to webhooks)
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Set, Dict, List
-import pytz
+from typing import Set, Dict, List, Optional
+from zoneinfo import ZoneInfo
 
 from config import Config
 from services.respond_api import RespondAPI
@@ -15,6 +15,22 @@ from services.message_handler import MessageHandler
 logger = logging.getLogger(__name__)
 
 
+def _parse_message_time(value: str) -> Optional[datetime]:
+    """
+    Parse a Respond.io createdAt timestamp
+
+    Args:
+        value: ISO timestamp, possibly with a trailing 'Z'
+
+    Returns:
+        Parsed datetime, or None if the value can't be parsed
+    """
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
 class MessagePoller:
     """Polls Respond.io API for new messages when webhooks aren't available"""
 
@@ -22,7 +38,8 @@ class MessagePoller:
         self.api = RespondAPI()
         self.message_handler = MessageHandler()
         self.processed_messages: Set[str] = set()  # Track processed message IDs
-        self.last_poll_time = datetime.now(pytz.timezone(Config.TIMEZONE))
+        self.timezone = ZoneInfo(Config.TIMEZONE)
+        self.last_poll_time = datetime.now(self.timezone)
         self.is_running = False
 
     def start_polling(self, interval_seconds: int = 10):
@@ -72,7 +89,7 @@ class MessagePoller:
             # For demonstration, we'll check if we can list contacts
             # (actual implementation needs Respond.io's conversation/message endpoints)
 
-            current_time = datetime.now(pytz.timezone(Config.TIMEZONE))
+            current_time = datetime.now(self.timezone)
             logger.debug(f"Poll completed at {current_time}")
 
         except Exception as e:
@@ -171,9 +188,8 @@ class RespondioConversationPoller(MessagePoller):
                     continue
 
                 # Parse message time
-                try:
-                    message_time = datetime.fromisoformat(message_time_str.replace('Z', '+00:00'))
-                except:
+                message_time = _parse_message_time(message_time_str)
+                if message_time is None:
                     continue
 
                 # Only process if message is newer than our last check
@@ -195,7 +211,7 @@ class RespondioConversationPoller(MessagePoller):
                     self.last_checked_conversations[contact_id] = message_time
 
             # Update global poll time
-            self.last_poll_time = datetime.now(pytz.timezone(Config.TIMEZONE))
+            self.last_poll_time = datetime.now(self.timezone)
             logger.debug(f"Poll completed, checked {len(conversations)} conversations")
 
         except Exception as e:
@@ -3,20 +3,199 @@ OpenAI Service for generating natural, context-aware responses
 """
 import logging
 import os
-from typing import Dict, Optional
+import random
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Formatter, Template
+from typing import Dict, Iterator, List, Optional
 from openai import OpenAI
 
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Process-wide constants resolved once at import
+_ZOOM_LINK = Config.ZOOM_PREVIEW_LINK
+_ZOOM_DOWNLOAD = Config.ZOOM_DOWNLOAD_LINK
+_TEMPLATES = Config.get_message_templates()
+
+# Every placeholder a message template may use (context keys callers can supply)
+_KNOWN_CONTEXT_KEYS = {
+    'name', 'zoom_link', 'zoom_download_link', 'timeslot', 'registration_link',
+    'sender_name', 'membership_link', 'trial_link', 'member_zoom_link',
+    'youtube_playlist_link', 'trial_start', 'trial_end', 'trial_day7',
+}
+
+
+def _validate_template_fields():
+    """Fail fast at import if a template uses a placeholder outside the known context schema"""
+    for code, template in _TEMPLATES.items():
+        fields = {field for _, field, _, _ in Formatter().parse(template) if field}
+        unknown = fields - _KNOWN_CONTEXT_KEYS
+        if unknown:
+            raise ValueError(f"Template {code} uses unknown placeholders: {', '.join(sorted(unknown))}")
+
+
+_validate_template_fields()
+
+# Fixed replies for message types that need no personalization (no OpenAI call)
+_STATIC_RESPONSES = {
+    'INVALID_DAY': [
+        """I didn't quite catch that 🌸
+
+Please choose your preferred day:
+
+S = Saturday
+U = Sunday
+
+Reply with just S or U""",
+        """Oops, "{user_message}" isn't one of the options 🌸
+
+Which day suits you best?
+
+S = Saturday
+U = Sunday
+
+Just reply S or U""",
+        """No worries 🌈 Let's try that again!
+
+S = Saturday
+U = Sunday
+
+Reply with just S or U""",
+    ],
+    'INVALID_TIME': [
+        """I didn't quite catch that 🌸
+
+Please choose your preferred time (UTC+7):
+
+A = 15:30
+B = 19:30
+C = 20:00
+D = 20:30
+E = 21:00
+
+Reply with just A, B, C, D or E""",
+        """Oops, "{user_message}" isn't one of the options 🌸
+
+Which time suits you best (UTC+7)?
+
+A = 15:30
+B = 19:30
+C = 20:00
+D = 20:30
+E = 21:00
+
+Just reply A, B, C, D or E""",
+        """No worries 🌈 Let's try that again!
+
+Times (UTC+7):
+A = 15:30
+B = 19:30
+C = 20:00
+D = 20:30
+E = 21:00
+
+Reply with just A, B, C, D or E""",
+    ],
+}
+
+# B1_Z2 prompt with the process-constant Zoom links already filled in (only $name left)
+_B1_Z2_PROMPT = Template(Template("""Generate a message with the Zoom link and ask them to choose a day.
+
+Context:
+- User's name: $name
+- They just gave you their name
+- Zoom link: $zoom_link
+- Zoom download: $zoom_download
+
+Include:
+1. Thank them and use their name
+2. Share the Zoom link
+3. Mention the Zoom download link if they're new
+4. Explain the preview sessions (free, 30 min, uplifting energy, UTC+7 timezone)
+5. Ask them to choose a day:
+   S = Saturday
+   U = Sunday
+
+Keep it warm and exciting but concise.
+""").safe_substitute(
+    zoom_link=_ZOOM_LINK.replace('$', '$$'),  # Keep literal '$' in URLs out of the second pass
+    zoom_download=_ZOOM_DOWNLOAD.replace('$', '$$')
+))
+
+# Short, templated replies run on a cheaper/faster model
+_LIGHT_MODEL = os.getenv('OPENAI_LIGHT_MODEL', 'gpt-4.1-nano')
+_MODEL_BY_TYPE = {
+    'B1_Z2A': _LIGHT_MODEL,
+    'B1_Z2A1': _LIGHT_MODEL,
+}
+
+# The only introduction handled without an AI call: "my name is Sarah" (two or more letters)
+# Everything else - single words like "Hello"/"Yes", "I'm tired", lowercase names - goes to the model
+_INTRO_RE = re.compile(r"\b(?i:my name is)\s+([^\W\d_][\w'-]+)[\s.!?,]*$")
+
+
+@lru_cache(maxsize=4096)
+def _regex_extract(text: str) -> Optional[str]:
+    """
+    Extract a first name from an explicit "my name is X"
+
+    Args:
+        text: Stripped message text
+
+    Returns:
+        First name as written, or None if the message needs the model
+    """
+    match = _INTRO_RE.search(text)
+    if not match:
+        return None
+
+    # The name must be capitalized in the original text
+    name = match.group(1)
+    return name if name[0].isupper() else None
+
+
+# Caps concurrent OpenAI requests across all callers (keeps us under account rate limits)
+_MAX_CONCURRENT_REQUESTS = int(os.getenv('OPENAI_MAX_CONCURRENT_REQUESTS', 4))
+_REQUEST_SEMAPHORE = threading.BoundedSemaphore(_MAX_CONCURRENT_REQUESTS)
+
+# Semantic cache for short B1_Z1 greetings ("hi", "hey 🙂", "hello!!" all get the same kind of reply)
+_EMBEDDING_MODEL = 'text-embedding-3-small'
+_EMBEDDING_DIMENSIONS = 256
+_GREETING_MAX_CHARS = 30
+_GREETING_SIMILARITY = 0.95
+_GREETING_CACHE_SIZE = 1000
+
 
 class OpenAIService:
     """Handles OpenAI API calls for generating conversational responses"""
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'OpenAIService':
+        """
+        Get the shared OpenAIService instance (created on first use)
+
+        Returns:
+            Shared OpenAIService instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
     def __init__(self):
         self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
         self.model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+        # greeting text -> (unit embedding, generated reply), oldest first
+        self._greeting_cache = OrderedDict()
+        self._greeting_lock = threading.Lock()
 
     def generate_response(self,
                          message_type: str,
@@ -35,6 +214,18 @@ class OpenAIService:
         Returns:
             Generated response text
         """
+        # Fixed-phrasing replies never need the API
+        if message_type in _STATIC_RESPONSES:
+            return random.choice(_STATIC_RESPONSES[message_type]).format(user_message=user_message or '')
+
+        greeting = None
+        greeting_embedding = None
+        if message_type == 'B1_Z1' and user_message and len(user_message.strip()) < _GREETING_MAX_CHARS:
+            greeting = user_message.strip().lower()
+            greeting_embedding, cached_reply = self._lookup_greeting(greeting)
+            if cached_reply:
+                return cached_reply
+
         try:
             # Get the system prompt and user prompt based on message type
             system_prompt = self._get_system_prompt(context)
@@ -51,16 +242,20 @@ class OpenAIService:
             messages.append({"role": "user", "content": user_prompt})
 
             # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=300
-            )
+            with _REQUEST_SEMAPHORE:
+                response = self.client.chat.completions.create(
+                    model=_MODEL_BY_TYPE.get(message_type, self.model),
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=300
+                )
 
             generated_text = response.choices[0].message.content.strip()
             logger.info(f"Generated response for {message_type}: {generated_text[:100]}...")
 
+            if greeting_embedding is not None:
+                self._store_greeting(greeting, greeting_embedding, generated_text)
+
             return generated_text
 
         except Exception as e:
@@ -68,6 +263,153 @@ class OpenAIService:
             # Fallback to template if OpenAI fails
             return self._get_fallback_template(message_type, context)
 
+    def _lookup_greeting(self, greeting: str):
+        """
+        Find a cached reply for a semantically equivalent greeting
+
+        Args:
+            greeting: Normalized (stripped, lowercased) user message
+
+        Returns:
+            Tuple of (embedding or None, cached reply or None)
+        """
+        with self._greeting_lock:
+            entry = self._greeting_cache.get(greeting)
+            if entry:
+                self._greeting_cache.move_to_end(greeting)
+                return entry
+
+        embedding = self._embed(greeting)
+        if embedding is None:
+            return None, None
+
+        with self._greeting_lock:
+            best_key, best_score = None, 0.0
+            for key, (cached_embedding, _) in self._greeting_cache.items():
+                # Embeddings are unit length, so the dot product is the cosine similarity
+                score = sum(a * b for a, b in zip(embedding, cached_embedding))
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is not None and best_score >= _GREETING_SIMILARITY:
+                self._greeting_cache.move_to_end(best_key)
+                logger.info(f"Greeting cache hit ({best_score:.3f}): '{greeting}' ~ '{best_key}'")
+                return embedding, self._greeting_cache[best_key][1]
+
+        return embedding, None
+
+    def _store_greeting(self, greeting: str, embedding: List[float], reply: str):
+        """
+        Cache a generated greeting reply, evicting the least recently used entry
+
+        Args:
+            greeting: Normalized user message
+            embedding: Embedding of the greeting
+            reply: Generated reply to reuse
+        """
+        with self._greeting_lock:
+            self._greeting_cache[greeting] = (embedding, reply)
+            self._greeting_cache.move_to_end(greeting)
+            while len(self._greeting_cache) > _GREETING_CACHE_SIZE:
+                self._greeting_cache.popitem(last=False)
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """
+        Embed a short text for the greeting cache
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector, or None if the API call failed
+        """
+        try:
+            with _REQUEST_SEMAPHORE:
+                response = self.client.embeddings.create(
+                    model=_EMBEDDING_MODEL,
+                    input=text,
+                    dimensions=_EMBEDDING_DIMENSIONS
+                )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping greeting cache: {e}")
+            return None
+
+    def generate_response_stream(self,
+                                 message_type: str,
+                                 context: Dict,
+                                 user_message: Optional[str] = None,
+                                 conversation_history: Optional[list] = None) -> Iterator[str]:
+        """
+        Stream a generated response chunk by chunk (lower time-to-first-token)
+
+        Same arguments as generate_response(). Static replies and the template
+        fallback are yielded as a single chunk. The request slot is only held while
+        the stream is opened; callers that stop early must close() the generator so
+        the underlying HTTP stream is released.
+
+        Yields:
+            Text chunks of the generated response
+        """
+        if message_type in _STATIC_RESPONSES:
+            yield self.generate_response(message_type, context, user_message)
+            return
+
+        produced = False
+        try:
+            system_prompt = self._get_system_prompt(context)
+            user_prompt = self._build_user_prompt(message_type, context, user_message)
+
+            messages = [{"role": "system", "content": system_prompt}]
+            if conversation_history:
+                messages.extend(conversation_history[-5:])
+            messages.append({"role": "user", "content": user_prompt})
+
+            # A slow consumer must not keep a slot that generate_response()/extract_name() need
+            with _REQUEST_SEMAPHORE:
+                stream = self.client.chat.completions.create(
+                    model=_MODEL_BY_TYPE.get(message_type, self.model),
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=300,
+                    stream=True
+                )
+
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        produced = True
+                        yield delta
+            finally:
+                stream.close()
+
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            # Only fall back if nothing was sent yet, otherwise the reply would be duplicated
+            if not produced:
+                yield self._get_fallback_template(message_type, context)
+
+    def generate_many(self, jobs: List[Dict]) -> List[str]:
+        """
+        Generate responses for several recipients concurrently (e.g. reminder waves)
+
+        Args:
+            jobs: List of keyword-argument dicts for generate_response()
+
+        Returns:
+            Generated response texts, in the same order as jobs
+        """
+        if not jobs:
+            return []
+
+        # generate_response() never raises (falls back to templates), and the
+        # shared semaphore bounds how many requests are in flight at once
+        with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_REQUESTS) as executor:
+            return list(executor.map(lambda job: self.generate_response(**job), jobs))
+
     def _get_system_prompt(self, context: Dict = None) -> str:
         """Get the system prompt that defines Ineke's personality"""
         contact_info = ""
@@ -105,8 +447,6 @@ Important:
         """Build the user prompt based on message type and context"""
 
         name = context.get('name', 'there')
-        zoom_link = Config.ZOOM_PREVIEW_LINK
-        zoom_download = Config.ZOOM_DOWNLOAD_LINK
 
         prompts = {
             'B1_Z1': f"""Generate a warm greeting message asking for the user's first name.
@@ -125,25 +465,7 @@ Example tone (make it YOUR OWN):
 "Hi 🌸 I'm Ineke from InnerJoy! Lovely to connect with you. Can you share your first name? Then I'll send your Zoom link 🌈"
 """,
 
-            'B1_Z2': f"""Generate a message with the Zoom link and ask them to choose a day.
-
-Context:
-- User's name: {name}
-- They just gave you their name
-- Zoom link: {zoom_link}
-- Zoom download: {zoom_download}
-
-Include:
-1. Thank them and use their name
-2. Share the Zoom link
-3. Mention the Zoom download link if they're new
-4. Explain the preview sessions (free, 30 min, uplifting energy, UTC+7 timezone)
-5. Ask them to choose a day:
-   S = Saturday
-   U = Sunday
-
-Keep it warm and exciting but concise.
-""",
+            'B1_Z2': _B1_Z2_PROMPT.substitute(name=name),
 
             'B1_Z2A': f"""Generate a message asking them to choose a specific time.
 
@@ -174,26 +496,6 @@ Include:
 - Brief reminder about the session
 
 Example tone: "Great — you're on the list! 🕒 Your chosen time: Saturday 19:30 (UTC+7). See you there! 🌈"
-""",
-
-            'INVALID_DAY': f"""Generate a gentle error message when they didn't enter S or U.
-
-Context:
-- They entered: "{user_message}"
-- You need them to choose S (Saturday) or U (Sunday)
-
-Keep it friendly and clear, not scolding. Guide them gently.
-""",
-
-            'INVALID_TIME': f"""Generate a gentle error message when they didn't enter A-E.
-
-Context:
-- They entered: "{user_message}"
-- You need them to choose A, B, C, D, or E for the time
-
-Keep it friendly and clear. Show the options again.
-Options:
-A = 15:30, B = 19:30, C = 20:00, D = 20:30, E = 21:00
 """
         }
 
@@ -201,12 +503,10 @@ A = 15:30, B = 19:30, C = 20:00, D = 20:30, E = 21:00
 
     def _get_fallback_template(self, message_type: str, context: Dict) -> str:
         """Fallback to original templates if OpenAI fails"""
-        from config import Config
-        templates = Config.get_message_templates()
-
         # Return the original template if available
-        if message_type in templates:
-            return templates[message_type].format(**context)
+        # Missing context keys render as empty strings instead of raising KeyError
+        if message_type in _TEMPLATES:
+            return _TEMPLATES[message_type].format_map(defaultdict(str, context))
 
         return "Sorry, I'm having trouble right now. Please try again! 🌸"
 
@@ -220,13 +520,20 @@ A = 15:30, B = 19:30, C = 20:00, D = 20:30, E = 21:00
         Returns:
             Extracted name or None if not found
         """
+        # Clear introductions are handled locally without an API call
+        regex_name = _regex_extract(message_text.strip())
+        if regex_name:
+            logger.info(f"Regex extracted name '{regex_name}' from '{message_text}'")
+            return regex_name
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are a name extraction assistant. Extract the person's first name from their message.
+            with _REQUEST_SEMAPHORE:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """You are a name extraction assistant. Extract the person's first name from their message.
 
 Rules:
 - Extract ONLY the first name (not full name)
@@ -242,15 +549,15 @@ Examples:
 "Hi, this is Mike" → Mike
 "hey" → NONE
 "hello" → NONE"""
-                    },
-                    {
-                        "role": "user",
-                        "content": f'Extract the first name from: "{message_text}"'
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=20
-            )
+                        },
+                        {
+                            "role": "user",
+                            "content": f'Extract the first name from: "{message_text}"'
+                        }
+                    ],
+                    temperature=0.3,
+                    max_tokens=20
+                )
 
             extracted = response.choices[0].message.content.strip()
 
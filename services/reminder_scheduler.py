@@ -3,37 +3,208 @@ Reminder Scheduler Service
 Manages automated message sending using APScheduler
 Processes Scheduled_Messages queue from Google Sheets
 """
+import heapq
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict
-import pytz
-
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache, partial
+from string import Formatter
+from typing import Callable, List, Dict, Optional
+from zoneinfo import ZoneInfo
+
+from apscheduler.executors.pool import ThreadPoolExecutor as JobExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 
 from config import Config
 from services.respond_api import RespondAPI
-from services.google_sheets import GoogleSheetsService
+from services.google_sheets import SHEETS_INIT_ERRORS, GoogleSheetsService
 from services.message_handler import MessageHandler
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    Pre-parse a str.format template into a render function
+
+    Args:
+        template: Message template with {field} placeholders
+
+    Returns:
+        Function taking the template fields as keyword arguments (extra ones are ignored)
+    """
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+    def render(**values) -> str:
+        return ''.join(literal + (str(values[field]) if field is not None else '') for literal, field in parts)
+
+    return render
+
+
+def _next_occurrence(now: datetime, target_weekday: int, hour: int, minute: int = 0) -> datetime:
+    """
+    Next time it is target_weekday at hour:minute (strictly after now on the same weekday)
+
+    Args:
+        now: Current aware time
+        target_weekday: Weekday (Monday=0 ... Sunday=6)
+        hour: Target hour
+        minute: Target minute
+
+    Returns:
+        Aware datetime in now's timezone
+    """
+    target_dt = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    delta_days = (target_weekday - now.weekday()) % 7
+    if delta_days == 0 and now >= target_dt:
+        delta_days = 7
+    return target_dt + timedelta(days=delta_days)
+
+
+@lru_cache(maxsize=1)
+def _tree2_sales_times(today: date, hour: int, tz: tzinfo) -> tuple:
+    """
+    Next B2_S1 (Sunday 16:00) and B2_S2 (Monday 9:00) send times
+
+    Cached on (date, hour) so a burst of B2_RA sends does the weekday math once;
+    both targets fall on the hour, so the start of the current hour stands in for now.
+
+    Args:
+        today: Current local date
+        hour: Current local hour
+        tz: Timezone for the returned datetimes
+
+    Returns:
+        Tuple of (s1_time, s2_time) aware datetimes
+    """
+    now = datetime(today.year, today.month, today.day, hour, tzinfo=tz)
+    return _next_occurrence(now, 6, 16), _next_occurrence(now, 0, 9)
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_tz(value: str, tz: tzinfo) -> Optional[datetime]:
+    """
+    Parse a stored ISO timestamp, memoized because the same sheet values are re-read every tick
+
+    Args:
+        value: ISO timestamp string
+        tz: Timezone applied to naive values
+
+    Returns:
+        Aware datetime, or None if the value can't be parsed
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+# Tree 2 messages only go to contacts who still haven't chosen a timeslot
+_TREE2_CODES = frozenset({'B2_RA', 'B2_RB', 'B2_S1', 'B2_S2'})
+
+# Applied to every job: collapse missed runs into one, never overlap a job with itself,
+# and still run a job that fires up to 5 minutes late (e.g. after a long Friday batch)
+_JOB_DEFAULTS = {'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 300}
+
+# Resolved once at import so constructing a scheduler stays cheap
+_TIMEZONE = ZoneInfo(Config.TIMEZONE)
+_TEMPLATES = Config.get_message_templates()
+_ZOOM_LINK = Config.ZOOM_PREVIEW_LINK
+_MEMBERSHIP_LINK = Config.MEMBERSHIP_LINK
+_TRIAL_LINK = Config.TRIAL_LINK
+_TIMESLOT_DISPLAY = Config.TIMESLOT_DISPLAY
+_TEMPLATE_FNS = {code: _compile_template(template) for code, template in _TEMPLATES.items()}
+
+# Seconds a cached contact stays valid for scheduled sends
+_CONTACT_CACHE_TTL = 60
+
+
 class ReminderScheduler:
     """Manages scheduled reminders and automated messages"""
 
     def __init__(self):
-        self.scheduler = BackgroundScheduler(timezone=Config.TIMEZONE)
+        # Jobs only orchestrate; the outbound sends fan out on _send_pool below
+        self.scheduler = BackgroundScheduler(
+            timezone=Config.TIMEZONE,
+            executors={'default': JobExecutor(Config.SCHEDULER_JOB_WORKERS)},
+            job_defaults=_JOB_DEFAULTS
+        )
         self.api = RespondAPI()
         try:
             self.sheets = GoogleSheetsService() if Config.GOOGLE_SHEETS_ID else None
-        except:
+        except SHEETS_INIT_ERRORS as e:
             self.sheets = None
-            logger.warning("Google Sheets not available - scheduler will not function")
+            logger.error(f"Google Sheets not available - scheduler will not function: {e}", exc_info=True)
+        if self.sheets:
+            # Only the scheduler reads the local mirror; opening it here also makes the
+            # message handler's schedule/cancel writes in this process reach it
+            GoogleSheetsService.open_scheduled_cache()
         self.message_handler = MessageHandler()
-        self.timezone = pytz.timezone(Config.TIMEZONE)
-        self.templates = Config.get_message_templates()
+        self.timezone = _TIMEZONE
+        self.templates = _TEMPLATES
+        self._template_fns = _TEMPLATE_FNS
+
+        # message_code -> specialized send function taking the message context
+        self._dispatch: Dict[str, Callable[[Dict], bool]] = {}
+        for code in ('B1_R1', 'B1_R2', 'B1_R3'):
+            if code in self._template_fns:
+                self._dispatch[code] = self._make_tree1_reminder(code)
+        for code in ('B1_S1', 'B1_SHAKEUP', 'B1_S2', 'B1_S3'):
+            if code in self._template_fns:
+                self._dispatch[code] = self._make_tree1_sales(code)
+        self._dispatch['B2_RA'] = lambda ctx: self._send_tree2_ra(
+            ctx['contact_id'], ctx['first_name'], ctx['current_tree'], ctx['now'], ctx['sheet_contact'])
+        self._dispatch['B2_RB'] = lambda ctx: self._send_tree2_rb(
+            ctx['contact_id'], ctx['first_name'], ctx['sheet_contact'])
+        for code in ('B2_S1', 'B2_S2'):
+            self._dispatch[code] = partial(self._dispatch_tree2_sales, code)
+
+        # Follow-up schedules made while a job runs, flushed with one request at the end
+        self._write_lock = threading.Lock()
+        self._pending_schedules = []
+
+        # Message_Log rows (tuples in sheet column order) are written off the send path by a background flusher
+        self._log_queue: queue.Queue = queue.Queue(maxsize=10000)
+        if self.sheets:
+            self._log_flusher = threading.Thread(target=self._run_log_flusher, name='scheduler-log-flusher', daemon=True)
+            self._log_flusher.start()
+
+        # Outbound sends are I/O bound, so a job run sends several at once; the scan
+        # produces work items and these workers consume them
+        self._send_pool = ThreadPoolExecutor(max_workers=Config.SCHEDULER_SEND_WORKERS, thread_name_prefix='scheduler-send')
+
+        # Min-heap of (scheduled_time, message_id) for the next pending message(s) that
+        # aren't due yet; the scheduler wakes at the earliest one instead of polling
+        self._due_heap = []
+        self._heap_lock = threading.Lock()
+        self._processing_lock = threading.Lock()
+
+        # message_id -> send time of recently sent messages, so a failed status
+        # write can't cause the same message to be sent again next tick
+        self._sent_ids: OrderedDict = OrderedDict()
+        self._sent_ids_lock = threading.Lock()
+
+        # IDs of sends that outlived their run; they stay 'pending' in the sheet (so a restart
+        # retries them) and later runs skip them until they finish
+        self._in_flight: set = set()
+        self._in_flight_lock = threading.Lock()
+        if self.sheets:
+            # Sent IDs are also kept on disk, so the guard holds across restarts (loaded without a time)
+            self._sent_ids.update((message_id, None) for message_id in self.sheets.get_recent_sent_ids(10000))
+
+        # contact_id -> (monotonic fetch time, contact data), shared by concurrent jobs: expired
+        # entries are dropped at the start of each run, and entries for contacts written since
+        # they were fetched are dropped via the row version (a miss always falls back to a read)
+        self._contact_cache: Dict[str, tuple] = {}
+        self._contacts_version = self.sheets.contacts_version if self.sheets else 0
 
     def start(self):
         """Start the scheduler"""
@@ -41,15 +212,18 @@ class ReminderScheduler:
             logger.warning("Cannot start scheduler - Google Sheets not available")
             return
 
-        # Process scheduled messages every 1 minute
+        # Safety poll for messages written outside this process (the due-time
+        # wakeups below handle everything scheduled through GoogleSheetsService)
         self.scheduler.add_job(
-            func=self.process_scheduled_messages,
-            trigger=IntervalTrigger(minutes=1),
+            func=self.sync_scheduled_messages,
+            trigger=IntervalTrigger(minutes=5),
             id='process_scheduled_messages',
             name='Process scheduled messages from queue',
             replace_existing=True
         )
 
+        GoogleSheetsService.add_schedule_listener(self._on_message_scheduled)
+
         # Monday CSV processing (every Monday at 10:00 AM)
         self.scheduler.add_job(
             func=self.monday_csv_processing,
@@ -69,91 +243,364 @@ class ReminderScheduler:
         )
 
         self.scheduler.start()
+
+        # Initial full pull fills the local cache; the first run then sends anything already due
+        self.sheets.refresh_pending_cache()
+        self._schedule_wakeup(datetime.now(self.timezone))
         logger.info("Reminder scheduler started")
 
     def stop(self):
         """Stop the scheduler"""
         self.scheduler.shutdown()
+        self._send_pool.shutdown(wait=True)
+        if self.sheets:
+            self._log_queue.join()  # Don't lose queued log entries
         logger.info("Reminder scheduler stopped")
 
     # ==================== SCHEDULED MESSAGE PROCESSING ====================
 
+    def sync_scheduled_messages(self):
+        """
+        Re-read pending messages from the sheet into the local cache, then process them
+        Picks up rows added or changed outside this process (every 5 minutes)
+        """
+        try:
+            if self.sheets:
+                self.sheets.refresh_pending_cache()
+        except Exception as e:
+            logger.error(f"Error refreshing scheduled message cache: {e}", exc_info=True)
+
+        self.process_scheduled_messages()
+
     def process_scheduled_messages(self):
         """
         Process all pending scheduled messages
-        Checks Scheduled_Messages sheet and sends messages that are due
-        Called every 1 minute
+        Finds due messages in the local Scheduled_Messages cache and sends them
+        Called at the next due time (and by a 5-minute safety poll)
         """
+        if not self._processing_lock.acquire(blocking=False):
+            logger.debug("Scheduled message processing already running")
+            return
+
+        now = datetime.now(self.timezone)
         try:
             if not self.sheets:
                 return
 
-            # Get all pending messages
-            pending_messages = self.sheets.get_pending_messages()
+            self._drop_expired_contacts()
+
+            # Due messages come from the local SQLite mirror, earliest first
+            due_messages = []
+            status_updates = []
+            for msg in self.sheets.get_due_messages(now):
+                # Already sent, but its status write was lost - retry the write only
+                if msg.get('message_id') in self._sent_ids:
+                    status_updates.append((msg['message_id'], msg['row_index'], 'sent', now.isoformat()))
+                    continue
+
+                # Still being sent by an earlier run
+                if msg.get('message_id') in self._in_flight:
+                    continue
+
+                due_messages.append(msg)
 
-            if not pending_messages:
-                logger.debug("No pending messages to process")
+            if not due_messages:
+                self.sheets.batch_update_message_status(status_updates)
                 return
 
-            now = datetime.now(self.timezone)
-            logger.info(f"Checking {len(pending_messages)} pending messages...")
+            # One read for every contact referenced by a due message
+            self._prefetch_contacts([msg.get('contact_id') for msg in due_messages])
 
-            for msg in pending_messages:
-                try:
-                    message_id = msg.get('message_id')
-                    contact_id = msg.get('contact_id')
-                    message_code = msg.get('message_code')
-                    scheduled_send_time_str = msg.get('scheduled_send_time')
-
-                    if not scheduled_send_time_str:
-                        logger.warning(f"Message {message_id} has no scheduled_send_time")
-                        continue
-
-                    # Parse scheduled time
-                    scheduled_time = datetime.fromisoformat(scheduled_send_time_str)
-                    if scheduled_time.tzinfo is None:
-                        scheduled_time = self.timezone.localize(scheduled_time)
-
-                    # Check if it's time to send
-                    if now >= scheduled_time:
-                        logger.info(f"Sending scheduled message {message_code} to {contact_id}")
-                        success = self._send_scheduled_message(contact_id, message_code)
-
-                        # Update status
-                        if success:
-                            self.sheets.update_message_status(
-                                message_id,
-                                'sent',
-                                now.isoformat()
-                            )
-                        else:
-                            self.sheets.update_message_status(
-                                message_id,
-                                'failed',
-                                now.isoformat()
-                            )
+            futures = {}
+            for msg in due_messages:
+                logger.info(f"Sending scheduled message {msg.get('message_code')} to {msg.get('contact_id')}")
+                future = self._send_pool.submit(self._send_scheduled_message, msg.get('contact_id'), msg.get('message_code'), now)
+                futures[future] = msg
 
+            # Stay under the 1-minute interval so the next tick isn't skipped
+            done, not_done = wait(futures, timeout=55)
+
+            for future in done:
+                msg = futures[future]
+                try:
+                    success = future.result()
                 except Exception as e:
                     logger.error(f"Error processing message {msg.get('message_id')}: {e}")
-                    continue
+                    success = False
+                if success:
+                    self._mark_sent(msg.get('message_id'))
+                status_updates.append((msg.get('message_id'), msg['row_index'], 'sent' if success else 'failed', now.isoformat()))
+
+            # Sends still running stay 'pending' in the sheet, are skipped by later runs
+            # while in flight, and record their own status when they finish
+            for future in not_done:
+                msg = futures[future]
+                logger.warning(f"Message {msg.get('message_id')} still sending after 55s")
+                with self._in_flight_lock:
+                    self._in_flight.add(msg.get('message_id'))
+                future.add_done_callback(partial(self._record_late_status, msg['row_index'], msg.get('message_id')))
+
+            self.sheets.batch_update_message_status(status_updates)
 
         except Exception as e:
             logger.error(f"Error in process_scheduled_messages: {e}", exc_info=True)
 
-    def _send_scheduled_message(self, contact_id: str, message_code: str) -> bool:
+        finally:
+            self._flush_sheet_writes()
+            self._processing_lock.release()
+            # A wakeup that fired during this run was skipped, so re-arm for whatever fell due since the scan
+            self._rearm_wakeup(now)
+
+    def _rearm_wakeup(self, now: datetime):
+        """
+        Reset the due-time heap to the earliest pending message not covered by a run and wake for it
+
+        Args:
+            now: Time of the run's due-message scan
+        """
+        if not self.sheets:
+            return
+
+        try:
+            next_send = self.sheets.get_next_send_time(now)
+        except Exception as e:
+            logger.error(f"Error finding next scheduled send time: {e}", exc_info=True)
+            return
+
+        with self._heap_lock:
+            self._due_heap = [(datetime.fromtimestamp(next_send[0], self.timezone), next_send[1])] if next_send else []
+        self._schedule_next_wakeup()
+
+    def _on_message_scheduled(self, message_id: str, scheduled_send_time: str):
+        """
+        Add a newly scheduled message to the due-time heap
+
+        Args:
+            message_id: Scheduled message ID
+            scheduled_send_time: ISO send time
+        """
+        scheduled_time = _parse_iso_tz(scheduled_send_time, self.timezone)
+        if scheduled_time is None:
+            return
+
+        with self._heap_lock:
+            heapq.heappush(self._due_heap, (scheduled_time, message_id))
+            is_earliest = self._due_heap[0][1] == message_id
+
+        if is_earliest:
+            self._schedule_wakeup(scheduled_time)
+
+    def _schedule_next_wakeup(self):
+        """Wake the scheduler at the earliest pending send time"""
+        with self._heap_lock:
+            if not self._due_heap:
+                return
+            next_time = self._due_heap[0][0]
+
+        self._schedule_wakeup(next_time)
+
+    def _schedule_wakeup(self, run_at: datetime):
+        """
+        (Re)schedule the one-shot job that processes due messages
+
+        Args:
+            run_at: When to run (clamped to at least one second from now)
+        """
+        if not self.scheduler.running:
+            return
+
+        run_at = max(run_at, datetime.now(self.timezone) + timedelta(seconds=1))
+        self.scheduler.add_job(
+            func=self.process_scheduled_messages,
+            trigger=DateTrigger(run_date=run_at),
+            id='scheduled_messages_wakeup',
+            name='Process scheduled messages at next due time',
+            replace_existing=True
+        )
+
+    def _record_late_status(self, row_index: int, message_id: str, future):
+        """
+        Record the final status of a send that outlived its tick
+
+        Args:
+            row_index: Scheduled_Messages row of the message
+            message_id: Scheduled message ID
+            future: Completed send future
+        """
+        try:
+            success = future.exception() is None and future.result()
+            if success:
+                self._mark_sent(message_id)
+            self.sheets.batch_update_message_status([
+                (message_id, row_index, 'sent' if success else 'failed', datetime.now(self.timezone).isoformat())
+            ])
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(message_id)
+
+    def _mark_sent(self, message_id: str):
+        """
+        Remember a sent message ID (keeps the most recent 10,000 in memory, and on disk)
+
+        Args:
+            message_id: Scheduled message ID
+        """
+        with self._sent_ids_lock:
+            self._sent_ids[message_id] = time.time()
+            while len(self._sent_ids) > 10000:
+                self._sent_ids.popitem(last=False)
+        self.sheets.record_sent_message(message_id)
+
+    def _check_contacts_version(self):
+        """Drop cached contacts whose Contacts row was written since they were fetched"""
+        version = self.sheets.contacts_version
+        if version != self._contacts_version:
+            changed = self.sheets.contacts_changed_since(self._contacts_version)
+            if changed is None:
+                # Too far behind to know which contacts changed; a miss just falls back to a read
+                self._contact_cache.clear()
+            else:
+                for contact_id in changed:
+                    self._contact_cache.pop(contact_id, None)
+            self._contacts_version = version
+
+    def _drop_expired_contacts(self):
+        """Remove cached contacts older than _CONTACT_CACHE_TTL (other jobs may be reading the rest)"""
+        cutoff = time.monotonic() - _CONTACT_CACHE_TTL
+        for contact_id, (fetched_at, _) in list(self._contact_cache.items()):
+            if fetched_at < cutoff:
+                self._contact_cache.pop(contact_id, None)
+
+    def _get_contact_cached(self, contact_id: str, max_age: float = _CONTACT_CACHE_TTL) -> Optional[Dict]:
+        """
+        Get a contact, reusing a copy fetched earlier in the same job run
+
+        Args:
+            contact_id: Contact ID
+            max_age: Seconds a cached copy stays valid
+
+        Returns:
+            Contact data or None if not found
+        """
+        self._check_contacts_version()
+        cached = self._contact_cache.get(contact_id)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        contact = self.sheets.get_contact(contact_id)
+        if contact:
+            self._contact_cache[contact_id] = (time.monotonic(), contact)
+        return contact
+
+    def _prefetch_contacts(self, contact_ids: List[str]):
+        """
+        Load several contacts into the contact cache with one Sheets read
+        (skips contacts that are already cached)
+
+        Args:
+            contact_ids: Contact IDs to prefetch
+        """
+        self._check_contacts_version()
+        missing = [contact_id for contact_id in contact_ids if contact_id not in self._contact_cache]
+        if not missing:
+            return
+
+        fetched_at = time.monotonic()
+        for contact_id, contact in self.sheets.batch_get_contacts(missing).items():
+            self._contact_cache[contact_id] = (fetched_at, contact)
+
+    def _queue_log(self, contact_id: str, message_code: str, message: str, timestamp: Optional[str] = None):
+        """
+        Hand an outbound Message_Log row to the background flusher
+
+        Args:
+            contact_id: Contact ID
+            message_code: Message code sent
+            message: Message text (truncated when written)
+            timestamp: ISO send time (defaults to now)
+        """
+        # Same column order as Message_Log (minus log_id)
+        row = (contact_id, timestamp or datetime.now(self.timezone).isoformat(), 'outbound', message_code, message, 'Yes')
+        try:
+            self._log_queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("Log queue full - writing log entry synchronously")
+            self.sheets.batch_log_rows([row])
+
+    def _run_log_flusher(self):
+        """Background loop: write queued log entries in batches of up to 50 (waiting at most 2s to fill one)"""
+        while True:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + 2
+
+            while len(batch) < 50:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self.sheets.batch_log_rows(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} log entries: {e}")
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+
+    def _queue_schedule(self, message_data: Dict):
+        """
+        Queue a scheduled message until the end of the current job run
+
+        Args:
+            message_data: Dictionary with message details
+        """
+        with self._write_lock:
+            self._pending_schedules.append(message_data)
+
+    def _flush_sheet_writes(self):
+        """Write all queued scheduled messages and contact updates (one request each)"""
+        if not self.sheets:
+            return
+
+        with self._write_lock:
+            schedules, self._pending_schedules = self._pending_schedules, []
+
+        if schedules:
+            self.sheets.batch_schedule_messages(schedules)
+
+        self.sheets.flush_updates()
+
+    def _send_scheduled_message(self, contact_id: str, message_code: str, now: Optional[datetime] = None) -> bool:
         """
         Send a scheduled message based on message code
 
         Args:
             contact_id: Contact ID
             message_code: Message code (e.g., 'B1_R1', 'B1_S1', 'B2_RA')
+            now: Current time (computed once per tick by the caller)
 
         Returns:
             True if sent successfully
         """
+        now = now or datetime.now(self.timezone)
+
         try:
-            # Get contact from sheets
-            sheet_contact = self.sheets.get_contact(contact_id)
+            # Route to the specialized send function for this message code
+            # (checked first: an unknown code needs no contact read or window parse)
+            dispatch = self._dispatch.get(message_code)
+            if dispatch is None:
+                logger.error(f"Unknown message code: {message_code}")
+                return False
+
+            # Get contact from sheets; Tree 2 messages stop once the contact books or pays,
+            # so they always re-read the row (one row via the id -> row index) right before sending
+            if message_code in _TREE2_CODES:
+                sheet_contact = self._get_contact_cached(contact_id, max_age=0)
+            else:
+                sheet_contact = self._get_contact_cached(contact_id)
 
             if not sheet_contact:
                 logger.warning(f"Cannot send {message_code} to {contact_id}: not found")
@@ -163,34 +610,30 @@ class ReminderScheduler:
             chosen_timeslot = sheet_contact.get('chosen_timeslot')
             current_tree = sheet_contact.get('current_tree', 'Tree1')
 
+            # Cheap field check before parsing any timestamps
+            if chosen_timeslot and message_code in _TREE2_CODES:
+                logger.info(f"Skipping {message_code} for {contact_id} - timeslot already chosen")
+                return False
+
             # Check 72-hour window
             window_expires_at = sheet_contact.get('window_expires_at')
             if window_expires_at:
-                expires = datetime.fromisoformat(window_expires_at)
-                now = datetime.now(self.timezone)
+                expires = _parse_iso_tz(window_expires_at, self.timezone)
+                if expires is None:
+                    logger.warning(f"Invalid window_expires_at for {contact_id}: {window_expires_at}")
+                    return False
                 if now > expires:
                     logger.warning(f"Cannot send {message_code} to {contact_id}: outside 72hr window")
                     return False
 
-            # Route to appropriate handler based on message code
-            if message_code in ['B1_R1', 'B1_R2', 'B1_R3']:
-                return self._send_tree1_reminder(contact_id, message_code, first_name, chosen_timeslot)
-
-            elif message_code in ['B1_S1', 'B1_SHAKEUP', 'B1_S2', 'B1_S3']:
-                return self._send_tree1_sales(contact_id, message_code, first_name)
-
-            elif message_code == 'B2_RA':
-                return self._send_tree2_ra(contact_id, first_name, current_tree)
-
-            elif message_code == 'B2_RB':
-                return self._send_tree2_rb(contact_id, first_name)
-
-            elif message_code in ['B2_S1', 'B2_S2']:
-                return self._send_tree2_sales(contact_id, message_code, first_name)
-
-            else:
-                logger.error(f"Unknown message code: {message_code}")
-                return False
+            return dispatch({
+                'contact_id': contact_id,
+                'first_name': first_name,
+                'chosen_timeslot': chosen_timeslot,
+                'current_tree': current_tree,
+                'now': now,
+                'sheet_contact': sheet_contact
+            })
 
         except Exception as e:
             logger.error(f"Error sending scheduled message {message_code}: {e}", exc_info=True)
@@ -198,105 +641,67 @@ class ReminderScheduler:
 
     # ==================== TREE 1 MESSAGE SENDERS ====================
 
-    def _send_tree1_reminder(self, contact_id: str, message_code: str, first_name: str, chosen_timeslot: str) -> bool:
+    def _make_tree1_reminder(self, message_code: str) -> Callable[[Dict], bool]:
         """
-        Send Tree 1 reminder (B1_R1, B1_R2, B1_R3)
+        Build the send function for a Tree 1 reminder (B1_R1, B1_R2, B1_R3)
 
         Args:
-            contact_id: Contact ID
             message_code: Message code
-            first_name: User's first name
-            chosen_timeslot: Chosen timeslot (A-E)
 
         Returns:
-            True if sent successfully
+            Function taking the message context and returning True if sent
         """
-        try:
-            if not chosen_timeslot:
-                logger.warning(f"Cannot send {message_code} to {contact_id}: no timeslot chosen")
-                return False
-
-            # Get timeslot display
-            timeslot_display = Config.get_timeslot_display(chosen_timeslot)
+        render = self._template_fns[message_code]
 
-            # Get template
-            if message_code not in self.templates:
-                logger.error(f"Template not found: {message_code}")
+        def dispatch(ctx: Dict) -> bool:
+            contact_id = ctx['contact_id']
+            if not ctx['chosen_timeslot']:
+                logger.warning(f"Cannot send {message_code} to {contact_id}: no timeslot chosen")
                 return False
 
-            message = self.templates[message_code].format(
-                name=first_name,
-                timeslot=timeslot_display,
-                zoom_link=Config.ZOOM_PREVIEW_LINK
+            message = render(
+                name=ctx['first_name'],
+                timeslot=_TIMESLOT_DISPLAY.get(ctx['chosen_timeslot'], ''),
+                zoom_link=_ZOOM_LINK
             )
-
-            # Send message
             self.api.send_message(contact_id, message)
-
-            # Log
-            self.sheets.log_message({
-                'contact_id': contact_id,
-                'timestamp': datetime.now(self.timezone).isoformat(),
-                'direction': 'outbound',
-                'message_code': message_code,
-                'message_content': message[:500],
-                'window_valid': 'Yes'
-            })
+            self._queue_log(contact_id, message_code, message)
 
             logger.info(f"Sent {message_code} to {contact_id}")
             return True
 
-        except Exception as e:
-            logger.error(f"Error sending {message_code}: {e}")
-            return False
+        return dispatch
 
-    def _send_tree1_sales(self, contact_id: str, message_code: str, first_name: str) -> bool:
+    def _make_tree1_sales(self, message_code: str) -> Callable[[Dict], bool]:
         """
-        Send Tree 1 sales message (B1_S1, B1_SHAKEUP, B1_S2)
+        Build the send function for a Tree 1 sales message (B1_S1, B1_SHAKEUP, B1_S2, B1_S3)
 
         Args:
-            contact_id: Contact ID
             message_code: Message code
-            first_name: User's first name
 
         Returns:
-            True if sent successfully
+            Function taking the message context and returning True if sent
         """
-        try:
-            # Get template
-            if message_code not in self.templates:
-                logger.error(f"Template not found: {message_code}")
-                return False
-
-            message = self.templates[message_code].format(
-                name=first_name,
-                membership_link=Config.MEMBERSHIP_LINK,
-                trial_link=Config.TRIAL_LINK
+        render = self._template_fns[message_code]
+
+        def dispatch(ctx: Dict) -> bool:
+            contact_id = ctx['contact_id']
+            message = render(
+                name=ctx['first_name'],
+                membership_link=_MEMBERSHIP_LINK,
+                trial_link=_TRIAL_LINK
             )
-
-            # Send message
             self.api.send_message(contact_id, message)
-
-            # Log
-            self.sheets.log_message({
-                'contact_id': contact_id,
-                'timestamp': datetime.now(self.timezone).isoformat(),
-                'direction': 'outbound',
-                'message_code': message_code,
-                'message_content': message[:500],
-                'window_valid': 'Yes'
-            })
+            self._queue_log(contact_id, message_code, message)
 
             logger.info(f"Sent {message_code} to {contact_id}")
             return True
 
-        except Exception as e:
-            logger.error(f"Error sending {message_code}: {e}")
-            return False
+        return dispatch
 
     # ==================== TREE 2 MESSAGE SENDERS ====================
 
-    def _send_tree2_ra(self, contact_id: str, first_name: str, current_tree: str) -> bool:
+    def _send_tree2_ra(self, contact_id: str, first_name: str, current_tree: str, now: datetime, sheet_contact: Dict) -> bool:
         """
         Send B2 Ra - First Tree 2 reminder to choose timeslot
         Only sends if user is still in Tree 1 and hasn't chosen a timeslot
@@ -305,52 +710,35 @@ class ReminderScheduler:
             contact_id: Contact ID
             first_name: User's first name
             current_tree: Current tree (should be Tree1)
+            now: Current time (computed once per tick)
+            sheet_contact: Contact data freshly read by _send_scheduled_message
 
         Returns:
             True if sent successfully
         """
         try:
-            # Check if they already chose a timeslot or moved to Tree 2
-            sheet_contact = self.sheets.get_contact(contact_id)
-            if not sheet_contact:
-                return False
-
-            chosen_timeslot = sheet_contact.get('chosen_timeslot')
-
-            # If they already chose a timeslot, cancel this message
-            if chosen_timeslot:
-                logger.info(f"Skipping B2_RA for {contact_id} - timeslot already chosen")
-                return False
-
-            # Move to Tree 2
-            self.sheets.update_contact(contact_id, {
+            # Contacts who chose a timeslot were filtered out by _send_scheduled_message
+            # Move to Tree 2 (written with the run's other contact updates)
+            self.sheets.queue_update(contact_id, {
                 'current_tree': 'Tree2',
                 'current_step': 'B2_RA'
             })
 
             # Send B2_RA
-            message = self.templates['B2_RA'].format(
+            message = self._template_fns['B2_RA'](
                 name=first_name,
-                zoom_link=Config.ZOOM_PREVIEW_LINK
+                zoom_link=_ZOOM_LINK
             )
 
             self.api.send_message(contact_id, message)
 
             # Log
-            self.sheets.log_message({
-                'contact_id': contact_id,
-                'timestamp': datetime.now(self.timezone).isoformat(),
-                'direction': 'outbound',
-                'message_code': 'B2_RA',
-                'message_content': message[:500],
-                'window_valid': 'Yes'
-            })
+            self._queue_log(contact_id, 'B2_RA', message, now.isoformat())
 
             # Schedule B2_RB (2 hours later)
-            now = datetime.now(self.timezone)
             rb_time = now + timedelta(hours=2)
 
-            self.sheets.schedule_message({
+            self._queue_schedule({
                 'contact_id': contact_id,
                 'message_code': 'B2_RB',
                 'scheduled_send_time': rb_time.isoformat(),
@@ -359,23 +747,9 @@ class ReminderScheduler:
             })
 
             # Schedule B2_S1 (Sunday 16:00) and B2_S2 (Monday 9:00)
-            now = datetime.now(self.timezone)
+            s1_time, s2_time = _tree2_sales_times(now.date(), now.hour, self.timezone)
 
-            # Calculate next Sunday 16:00
-            days_until_sunday = (6 - now.weekday()) % 7
-            if days_until_sunday == 0 and now.hour >= 16:
-                days_until_sunday = 7  # Next week's Sunday
-            next_sunday = now.date() + timedelta(days=days_until_sunday)
-            s1_time = self.timezone.localize(datetime.combine(next_sunday, datetime.min.time().replace(hour=16, minute=0)))
-
-            # Calculate next Monday 9:00
-            days_until_monday = (7 - now.weekday()) % 7
-            if days_until_monday == 0 and now.hour >= 9:
-                days_until_monday = 7  # Next week's Monday
-            next_monday = now.date() + timedelta(days=days_until_monday)
-            s2_time = self.timezone.localize(datetime.combine(next_monday, datetime.min.time().replace(hour=9, minute=0)))
-
-            self.sheets.schedule_message({
+            self._queue_schedule({
                 'contact_id': contact_id,
                 'message_code': 'B2_S1',
                 'scheduled_send_time': s1_time.isoformat(),
@@ -383,7 +757,7 @@ class ReminderScheduler:
                 'trigger_type': 'tree2_sales_sunday'
             })
 
-            self.sheets.schedule_message({
+            self._queue_schedule({
                 'contact_id': contact_id,
                 'message_code': 'B2_S2',
                 'scheduled_send_time': s2_time.isoformat(),
@@ -398,47 +772,30 @@ class ReminderScheduler:
             logger.error(f"Error sending B2_RA: {e}")
             return False
 
-    def _send_tree2_rb(self, contact_id: str, first_name: str) -> bool:
+    def _send_tree2_rb(self, contact_id: str, first_name: str, sheet_contact: Dict) -> bool:
         """
         Send B2 Rb - Second Tree 2 reminder to choose timeslot
 
         Args:
             contact_id: Contact ID
             first_name: User's first name
+            sheet_contact: Contact data freshly read by _send_scheduled_message
 
         Returns:
             True if sent successfully
         """
         try:
-            # Check if they already chose a timeslot
-            sheet_contact = self.sheets.get_contact(contact_id)
-            if not sheet_contact:
-                return False
-
-            chosen_timeslot = sheet_contact.get('chosen_timeslot')
-
-            # If they already chose a timeslot, cancel this message
-            if chosen_timeslot:
-                logger.info(f"Skipping B2_RB for {contact_id} - timeslot already chosen")
-                return False
-
+            # Contacts who chose a timeslot were filtered out by _send_scheduled_message
             # Send B2_RB
-            message = self.templates['B2_RB'].format(
+            message = self._template_fns['B2_RB'](
                 name=first_name,
-                zoom_link=Config.ZOOM_PREVIEW_LINK
+                zoom_link=_ZOOM_LINK
             )
 
             self.api.send_message(contact_id, message)
 
             # Log
-            self.sheets.log_message({
-                'contact_id': contact_id,
-                'timestamp': datetime.now(self.timezone).isoformat(),
-                'direction': 'outbound',
-                'message_code': 'B2_RB',
-                'message_content': message[:500],
-                'window_valid': 'Yes'
-            })
+            self._queue_log(contact_id, 'B2_RB', message)
 
             logger.info(f"Sent B2_RB to {contact_id}")
             return True
@@ -447,7 +804,11 @@ class ReminderScheduler:
             logger.error(f"Error sending B2_RB: {e}")
             return False
 
-    def _send_tree2_sales(self, contact_id: str, message_code: str, first_name: str) -> bool:
+    def _dispatch_tree2_sales(self, message_code: str, ctx: Dict) -> bool:
+        """Send function for B2_S1/B2_S2 (see _send_tree2_sales)"""
+        return self._send_tree2_sales(ctx['contact_id'], message_code, ctx['first_name'], ctx['sheet_contact'])
+
+    def _send_tree2_sales(self, contact_id: str, message_code: str, first_name: str, sheet_contact: Dict) -> bool:
         """
         Send Tree 2 sales message (B2_S1, B2_S2)
 
@@ -455,21 +816,17 @@ class ReminderScheduler:
             contact_id: Contact ID
             message_code: Message code
             first_name: User's first name
+            sheet_contact: Contact data freshly read by _send_scheduled_message
 
         Returns:
             True if sent successfully
         """
         try:
-            # Check if they already chose a timeslot or became member
-            sheet_contact = self.sheets.get_contact(contact_id)
-            if not sheet_contact:
-                return False
-
-            chosen_timeslot = sheet_contact.get('chosen_timeslot')
+            # Check if they became member (timeslot choosers were filtered out by _send_scheduled_message)
             payment_status = sheet_contact.get('payment_status', 'None')
 
-            # If they already chose a timeslot or paid, cancel this message
-            if chosen_timeslot or payment_status != 'None':
+            # If they already paid, cancel this message
+            if payment_status != 'None':
                 logger.info(f"Skipping {message_code} for {contact_id} - already converted")
                 return False
 
@@ -478,24 +835,17 @@ class ReminderScheduler:
                 logger.error(f"Template not found: {message_code}")
                 return False
 
-            message = self.templates[message_code].format(
+            message = self._template_fns[message_code](
                 name=first_name,
-                membership_link=Config.MEMBERSHIP_LINK,
-                trial_link=Config.TRIAL_LINK
+                membership_link=_MEMBERSHIP_LINK,
+                trial_link=_TRIAL_LINK
             )
 
             # Send message
             self.api.send_message(contact_id, message)
 
             # Log
-            self.sheets.log_message({
-                'contact_id': contact_id,
-                'timestamp': datetime.now(self.timezone).isoformat(),
-                'direction': 'outbound',
-                'message_code': message_code,
-                'message_content': message[:500],
-                'window_valid': 'Yes'
-            })
+            self._queue_log(contact_id, message_code, message)
 
             logger.info(f"Sent {message_code} to {contact_id}")
             return True
@@ -555,105 +905,127 @@ class ReminderScheduler:
                 logger.info("To enable: Set 'tier2_approved' = 'Yes' in Config sheet")
                 return
 
-            # Get NoShow contacts
-            noshow_contacts = self.sheets.get_follow_up_contacts('NoShow')
+            # Get NoShow and NoSales (attended but didn't buy) contacts in one CSV_Processing pass
+            follow_ups = self.sheets.get_follow_up_contacts_by_group(['NoShow', 'Attended_NoSales'])
+            noshow_contacts = follow_ups['NoShow']
             logger.info(f"Found {len(noshow_contacts)} NoShow contacts")
+            nosales_contacts = follow_ups['Attended_NoSales']
+            logger.info(f"Found {len(nosales_contacts)} NoSales contacts")
 
-            for contact in noshow_contacts:
-                try:
-                    contact_id = contact.get('contact_id')
-                    first_name = contact.get('first_name', 'there')
-
-                    # Check 72-hour window
-                    sheet_contact = self.sheets.get_contact(contact_id)
-                    if not sheet_contact:
-                        continue
-
-                    window_expires_at = sheet_contact.get('window_expires_at')
-                    if window_expires_at:
-                        expires = datetime.fromisoformat(window_expires_at)
-                        now = datetime.now(self.timezone)
-                        if now > expires:
-                            logger.warning(f"Cannot send NoShow reinvite to {contact_id}: outside 72hr window")
-                            continue
-
-                    # Send B1_NOSHOW
-                    message = self.templates['B1_NOSHOW'].format(
-                        name=first_name,
-                        zoom_link=Config.ZOOM_PREVIEW_LINK
-                    )
-
-                    self.api.send_message(contact_id, message)
-
-                    # Log
-                    self.sheets.log_message({
-                        'contact_id': contact_id,
-                        'timestamp': datetime.now(self.timezone).isoformat(),
-                        'direction': 'outbound',
-                        'message_code': 'B1_NOSHOW',
-                        'message_content': message[:500],
-                        'window_valid': 'Yes'
-                    })
-
-                    logger.info(f"Sent NoShow re-invite to {contact_id}")
+            # One Sheets read covers both groups; kept local so other jobs can't evict it mid-run
+            sheet_contacts = self.sheets.batch_get_contacts(
+                [c.get('contact_id') for c in noshow_contacts + nosales_contacts]
+            )
 
-                except Exception as e:
-                    logger.error(f"Error sending NoShow re-invite: {e}")
-                    continue
+            now = datetime.now(self.timezone)
+            futures = self._send_reinvite_batch(noshow_contacts, sheet_contacts, 'B1_NOSHOW', 'NoShow', {
+                'zoom_link': _ZOOM_LINK
+            }, now)
+            futures += self._send_reinvite_batch(nosales_contacts, sheet_contacts, 'B1_NOSALES', 'NoSales', {
+                'zoom_link': _ZOOM_LINK,
+                'membership_link': _MEMBERSHIP_LINK
+            }, now)
+            wait(futures)
 
-            # Get NoSales contacts (attended but didn't buy)
-            nosales_contacts = self.sheets.get_follow_up_contacts('Attended_NoSales')
-            logger.info(f"Found {len(nosales_contacts)} NoSales contacts")
+            logger.info("Friday re-invites completed")
 
-            for contact in nosales_contacts:
-                try:
-                    contact_id = contact.get('contact_id')
-                    first_name = contact.get('first_name', 'there')
-
-                    # Check 72-hour window
-                    sheet_contact = self.sheets.get_contact(contact_id)
-                    if not sheet_contact:
-                        continue
-
-                    window_expires_at = sheet_contact.get('window_expires_at')
-                    if window_expires_at:
-                        expires = datetime.fromisoformat(window_expires_at)
-                        now = datetime.now(self.timezone)
-                        if now > expires:
-                            logger.warning(f"Cannot send NoSales reinvite to {contact_id}: outside 72hr window")
-                            continue
-
-                    # Send B1_NOSALES
-                    message = self.templates['B1_NOSALES'].format(
-                        name=first_name,
-                        zoom_link=Config.ZOOM_PREVIEW_LINK,
-                        membership_link=Config.MEMBERSHIP_LINK
-                    )
-
-                    self.api.send_message(contact_id, message)
-
-                    # Log
-                    self.sheets.log_message({
-                        'contact_id': contact_id,
-                        'timestamp': datetime.now(self.timezone).isoformat(),
-                        'direction': 'outbound',
-                        'message_code': 'B1_NOSALES',
-                        'message_content': message[:500],
-                        'window_valid': 'Yes'
-                    })
-
-                    logger.info(f"Sent NoSales re-invite to {contact_id}")
+        except Exception as e:
+            logger.error(f"Error in Friday re-invites: {e}", exc_info=True)
 
-                except Exception as e:
-                    logger.error(f"Error sending NoSales re-invite: {e}")
+        finally:
+            self._flush_sheet_writes()
+
+    def _contacts_in_window(self, contacts: List[Dict], sheet_contacts: Dict[str, Dict],
+                            now: datetime, group_label: str) -> List[Dict]:
+        """
+        Keep the follow-up contacts that are known and still inside their 72-hour window
+
+        Args:
+            contacts: Follow-up contacts from the CSV_Processing sheet
+            sheet_contacts: Contact ID -> Contacts sheet data, read once for this run
+            now: Current time
+            group_label: Group name used in logs ('NoShow' or 'NoSales')
+
+        Returns:
+            Contacts that may be messaged
+        """
+        eligible = []
+        for contact in contacts:
+            contact_id = contact.get('contact_id')
+            sheet_contact = sheet_contacts.get(contact_id)
+            if not sheet_contact:
+                continue
+
+            window_expires_at = sheet_contact.get('window_expires_at')
+            if window_expires_at:
+                expires = _parse_iso_tz(window_expires_at, self.timezone)
+                if expires is None:
+                    logger.warning(f"Invalid window_expires_at for {contact_id}: {window_expires_at}")
+                    continue
+                if now > expires:
+                    logger.warning(f"Cannot send {group_label} reinvite to {contact_id}: outside 72hr window")
                     continue
 
-            logger.info("Friday re-invites completed")
+            eligible.append(contact)
+
+        return eligible
+
+    def _send_reinvite_batch(self, contacts: List[Dict], sheet_contacts: Dict[str, Dict], message_code: str,
+                             group_label: str, template_kwargs: Dict, now: datetime) -> list:
+        """
+        Send a Friday re-invite to every eligible contact in one follow-up group
+
+        Args:
+            contacts: Follow-up contacts from the CSV_Processing sheet
+            sheet_contacts: Contact ID -> Contacts sheet data, read once for this run
+            message_code: Message code to send (B1_NOSHOW or B1_NOSALES)
+            group_label: Group name used in logs ('NoShow' or 'NoSales')
+            template_kwargs: Template fields besides the contact's name
+            now: Current time (computed once per run)
+
+        Returns:
+            List of send futures
+        """
+        return [
+            self._send_pool.submit(self._send_reinvite, contact, message_code, group_label, template_kwargs, now)
+            for contact in self._contacts_in_window(contacts, sheet_contacts, now, group_label)
+        ]
+
+    def _send_reinvite(self, contact: Dict, message_code: str, group_label: str,
+                       template_kwargs: Dict, now: datetime) -> bool:
+        """
+        Send a Friday re-invite to one follow-up contact
+        The caller has already checked the 72-hour window
+
+        Args:
+            contact: Follow-up contact from the CSV_Processing sheet
+            message_code: Message code to send
+            group_label: Group name used in logs ('NoShow' or 'NoSales')
+            template_kwargs: Template fields besides the contact's name
+            now: Current time (computed once per run)
+
+        Returns:
+            True if sent successfully
+        """
+        try:
+            contact_id = contact.get('contact_id')
+            first_name = contact.get('first_name', 'there')
+
+            message = self._template_fns[message_code](name=first_name, **template_kwargs)
+
+            self.api.send_message(contact_id, message)
+
+            # Log
+            self._queue_log(contact_id, message_code, message, now.isoformat())
+
+            logger.info(f"Sent {group_label} re-invite to {contact_id}")
+            return True
 
         except Exception as e:
-            logger.error(f"Error in Friday re-invites: {e}", exc_info=True)
+            logger.error(f"Error sending {group_label} re-invite: {e}")
+            return False
 
     def trigger_manual_reminder_check(self):
         """Manually trigger scheduled message processing (for testing/admin)"""
         logger.info("Manual scheduled message check triggered")
-        self.process_scheduled_messages()
+        self.sync_scheduled_messages()
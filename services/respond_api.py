@@ -3,13 +3,29 @@ Respond.io API Wrapper Service
 Handles all interactions with the Respond.io API
 """
 import requests
+from requests.adapters import HTTPAdapter
 import logging
-from typing import Dict, Optional, Any
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Caps concurrent Respond.io requests across all callers (scheduler workers share one budget)
+_MAX_CONCURRENT_REQUESTS = int(os.getenv('RESPOND_MAX_CONCURRENT_REQUESTS', 10))
+_REQUEST_SEMAPHORE = threading.BoundedSemaphore(_MAX_CONCURRENT_REQUESTS)
+
+# Exponential backoff between retries: 0.5s, 1s, 2s ... capped at 8s, plus up to 0.5s of jitter
+_RETRY_BACKOFF_INITIAL = 0.5
+_RETRY_BACKOFF_MAX = 8
+
+# Seconds a fetched window start is reused by check_72hr_window before the contact is re-read
+WINDOW_CACHE_TTL = 300
+
 
 class RespondAPIError(Exception):
     """Custom exception for Respond.io API errors"""
@@ -19,6 +35,12 @@ class RespondAPIError(Exception):
 class RespondAPI:
     """Wrapper for Respond.io API operations"""
 
+    # contact_id -> (monotonic fetch time, window start), shared by all instances so the
+    # webhook's update_window invalidates it for every caller; the start is re-checked
+    # against the current time on each lookup, so only the fetch is cached
+    _window_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+    _window_cache_lock = threading.Lock()
+
     def __init__(self):
         self.api_key = Config.RESPOND_API_KEY
         self.base_url = Config.RESPOND_API_URL
@@ -26,6 +48,16 @@ class RespondAPI:
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
+        # An unreachable host fails on the short connect timeout instead of holding a send worker
+        self.timeout = (Config.RESPOND_CONNECT_TIMEOUT, Config.RESPOND_READ_TIMEOUT)
+
+        # Keep-alive session so repeated calls reuse TCP/TLS connections
+        # (retries are handled in _make_request, not by the adapter)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
                       max_retries: int = 3) -> Dict:
@@ -48,16 +80,17 @@ class RespondAPI:
 
         for attempt in range(max_retries):
             try:
-                if method.upper() == 'GET':
-                    response = requests.get(url, headers=self.headers, timeout=30)
-                elif method.upper() == 'POST':
-                    response = requests.post(url, headers=self.headers, json=data, timeout=30)
-                elif method.upper() == 'PUT':
-                    response = requests.put(url, headers=self.headers, json=data, timeout=30)
-                elif method.upper() == 'DELETE':
-                    response = requests.delete(url, headers=self.headers, timeout=30)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
+                with _REQUEST_SEMAPHORE:
+                    if method.upper() == 'GET':
+                        response = self.session.get(url, timeout=self.timeout)
+                    elif method.upper() == 'POST':
+                        response = self.session.post(url, json=data, timeout=self.timeout)
+                    elif method.upper() == 'PUT':
+                        response = self.session.put(url, json=data, timeout=self.timeout)
+                    elif method.upper() == 'DELETE':
+                        response = self.session.delete(url, timeout=self.timeout)
+                    else:
+                        raise ValueError(f"Unsupported HTTP method: {method}")
 
                 response.raise_for_status()
                 return response.json() if response.content else {}
@@ -65,12 +98,36 @@ class RespondAPI:
             except requests.exceptions.RequestException as e:
                 logger.warning(f"API request failed (attempt {attempt + 1}/{max_retries}): {e}")
 
-                if attempt == max_retries - 1:
-                    logger.error(f"API request failed after {max_retries} attempts: {e}")
+                # Client errors other than rate limiting won't succeed on retry
+                status = e.response.status_code if e.response is not None else None
+                retryable = status is None or status == 429 or status >= 500
+
+                if attempt == max_retries - 1 or not retryable:
+                    logger.error(f"API request failed after {attempt + 1} attempts: {e}")
                     raise RespondAPIError(f"Failed to make API request: {e}")
 
+                time.sleep(self._retry_delay(attempt, e.response))
+
         return {}
 
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """
+        Seconds to wait before the next attempt
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+            response: Failed response, if the server answered
+
+        Returns:
+            Delay in seconds (Retry-After when the server sent one, else exponential backoff with jitter)
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _RETRY_BACKOFF_MAX)
+
+        backoff = min(_RETRY_BACKOFF_INITIAL * 2 ** attempt, _RETRY_BACKOFF_MAX)
+        return backoff + random.uniform(0, _RETRY_BACKOFF_INITIAL)
+
     def get_contact(self, contact_id: str) -> Dict:
         """
         Get contact details by ID
@@ -88,13 +145,14 @@ class RespondAPI:
         logger.info(f"Contact API response - firstName: {contact.get('firstName')}, keys: {list(contact.keys())}")
 
         # Convert custom_fields array to customFields object for easier access
-        if 'custom_fields' in contact and isinstance(contact['custom_fields'], list):
-            custom_fields_dict = {}
-            for field in contact['custom_fields']:
-                if isinstance(field, dict) and 'name' in field:
-                    custom_fields_dict[field['name']] = field.get('value')
-            contact['customFields'] = custom_fields_dict
-            logger.info(f"Converted customFields: {list(custom_fields_dict.keys())}")
+        custom_fields = contact.get('custom_fields')
+        if isinstance(custom_fields, list):
+            contact['customFields'] = {
+                field['name']: field.get('value')
+                for field in custom_fields
+                if isinstance(field, dict) and 'name' in field
+            }
+            logger.info(f"Converted customFields: {list(contact['customFields'])}")
 
         return contact
 
@@ -263,29 +321,59 @@ class RespondAPI:
             logger.error(f"Failed to get field '{field_name}' for contact {contact_id}: {e}")
             return None
 
-    def check_72hr_window(self, contact_id: str) -> bool:
+    def get_contact_with_window(self, contact_id: str, now: Optional[datetime] = None) -> Tuple[Dict, bool]:
         """
-        Check if contact is within 24-hour messaging window (Meta WhatsApp Policy)
-        Note: Method name kept for backwards compatibility, but now uses 24h window
+        Get contact details and whether the contact is within the messaging window
+        with a single contact fetch
 
         Args:
             contact_id: Respond.io contact ID
+            now: Current time (defaults to datetime.now(); pass it in when checking many contacts)
 
         Returns:
-            True if within window, False otherwise
+            Tuple of (contact information, within_window); contact is {} if the fetch failed
         """
-        last_window_start = self.get_contact_field(
-            contact_id,
+        try:
+            contact = self.get_contact(contact_id)
+        except RespondAPIError as e:
+            logger.error(f"Failed to get contact {contact_id} for window check: {e}")
+            return {}, False
+
+        last_window_start = contact.get('customFields', {}).get(
             Config.CUSTOM_FIELDS['LAST_72HR_WINDOW']  # Field name kept for compatibility
         )
+        with self._window_cache_lock:
+            fetched_at = time.monotonic()
+            if len(self._window_cache) >= 1000:
+                # Drop expired entries so the cache doesn't grow with every contact ever checked
+                for cid in [cid for cid, (at, _) in self._window_cache.items() if fetched_at - at >= WINDOW_CACHE_TTL]:
+                    del self._window_cache[cid]
+            self._window_cache[contact_id] = (fetched_at, last_window_start)
+        return contact, self._is_within_window(contact_id, last_window_start, now)
+
+    def _is_within_window(self, contact_id: str, last_window_start: Optional[str],
+                          now: Optional[datetime] = None) -> bool:
+        """
+        Check a window start timestamp against the 24-hour messaging window
 
+        Args:
+            contact_id: Respond.io contact ID (for logging)
+            last_window_start: ISO timestamp of the last window start
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            True if within window, False otherwise
+        """
         if not last_window_start:
             logger.warning(f"No window timestamp for contact {contact_id}")
             return False
 
         try:
-            window_start = datetime.fromisoformat(last_window_start)
-            time_elapsed = (datetime.now() - window_start).total_seconds()
+            # Legacy naive timestamps were written with datetime.now(), i.e. server-local time;
+            # astimezone() reads naive values as local and leaves aware values unchanged
+            window_start = datetime.fromisoformat(last_window_start).astimezone()
+            now = (now or datetime.now()).astimezone()
+            time_elapsed = (now - window_start).total_seconds()
 
             within_window = time_elapsed < Config.WINDOW_24H_SECONDS
 
@@ -301,19 +389,39 @@ class RespondAPI:
             logger.error(f"Error parsing window timestamp for contact {contact_id}: {e}")
             return False
 
-    def check_24hr_window(self, contact_id: str) -> bool:
+    def check_72hr_window(self, contact_id: str, now: Optional[datetime] = None) -> bool:
+        """
+        Check if contact is within 24-hour messaging window (Meta WhatsApp Policy)
+        Note: Method name kept for backwards compatibility, but now uses 24h window
+
+        Args:
+            contact_id: Respond.io contact ID
+            now: Current time (defaults to datetime.now(); pass it in when checking many contacts)
+
+        Returns:
+            True if within window, False otherwise
+        """
+        with self._window_cache_lock:
+            cached = self._window_cache.get(contact_id)
+        if cached and time.monotonic() - cached[0] < WINDOW_CACHE_TTL:
+            return self._is_within_window(contact_id, cached[1], now)
+
+        return self.get_contact_with_window(contact_id, now)[1]
+
+    def check_24hr_window(self, contact_id: str, now: Optional[datetime] = None) -> bool:
         """
         [LEGACY] Check if contact is within 24-hour messaging window
         Kept for backwards compatibility - use check_72hr_window() instead
 
         Args:
             contact_id: Respond.io contact ID
+            now: Current time (defaults to datetime.now())
 
         Returns:
             True if within window, False otherwise
         """
         # Just call the 72hr version now
-        return self.check_72hr_window(contact_id)
+        return self.check_72hr_window(contact_id, now)
 
     def update_window(self, contact_id: str, window_hours: int = 24) -> Dict:
         """
@@ -331,6 +439,10 @@ class RespondAPI:
         Returns:
             Empty dict (no actual API call made)
         """
+        # The contact just wrote in, so a cached window start is out of date
+        with self._window_cache_lock:
+            self._window_cache.pop(contact_id, None)
+
         timestamp = datetime.now().isoformat()
         logger.info(f"{window_hours}h window updated for contact {contact_id} to {timestamp} (stored in Google Sheets only)")
 
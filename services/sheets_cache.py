@@ -0,0 +1,249 @@
+"""
+Local SQLite mirror of the Scheduled_Messages sheet
+Lets the scheduler find due messages without re-reading the sheet every tick
+"""
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Sent message IDs are kept this long (seconds) to guard against re-sending after a restart
+SENT_ID_RETENTION = 7 * 24 * 3600
+
+
+class ScheduledMessageCache:
+    """SQLite projection of scheduled messages (message_id, send time, status, sheet row)"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> 'ScheduledMessageCache':
+        """
+        Get the process-wide cache (opened via GoogleSheetsService.open_scheduled_cache())
+
+        Returns:
+            Shared ScheduledMessageCache instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(Config.SHEETS_CACHE_PATH)
+            return cls._instance
+
+    def __init__(self, path: str):
+        self.timezone = ZoneInfo(Config.TIMEZONE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scheduled_messages (
+                message_id TEXT PRIMARY KEY,
+                contact_id TEXT,
+                message_code TEXT,
+                scheduled_send_time TEXT,
+                send_ts REAL,
+                status TEXT,
+                trigger_type TEXT,
+                row_index INTEGER
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_pending_send_ts ON scheduled_messages (status, send_ts)"
+        )
+        # Survives replace_pending(): a message whose 'sent' status never reached the sheet
+        # must not be sent again when the next pull still reports it as pending
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sent_messages (
+                message_id TEXT PRIMARY KEY,
+                sent_ts REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sent_ts ON sent_messages (sent_ts)")
+        self._conn.commit()
+
+    def _to_timestamp(self, scheduled_send_time: str) -> Optional[float]:
+        """
+        Convert a stored ISO send time to a POSIX timestamp
+
+        Args:
+            scheduled_send_time: ISO timestamp (naive values use the configured timezone)
+
+        Returns:
+            Timestamp, or None if the value can't be parsed
+        """
+        try:
+            scheduled_time = datetime.fromisoformat(scheduled_send_time)
+        except (TypeError, ValueError):
+            return None
+
+        if scheduled_time.tzinfo is None:
+            scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
+        return scheduled_time.timestamp()
+
+    def _row(self, message: Dict[str, Any]) -> Optional[tuple]:
+        """Build a table row from a message dictionary (None if it has no usable send time)"""
+        send_ts = self._to_timestamp(message.get('scheduled_send_time'))
+        if send_ts is None:
+            logger.warning(f"Message {message.get('message_id')} has no valid scheduled_send_time")
+            return None
+
+        return (
+            message.get('message_id'),
+            message.get('contact_id', ''),
+            message.get('message_code', ''),
+            message.get('scheduled_send_time'),
+            send_ts,
+            message.get('status', 'pending'),
+            message.get('trigger_type', ''),
+            message.get('row_index')
+        )
+
+    def replace_pending(self, messages: List[Dict[str, Any]]):
+        """
+        Replace the cache contents with a fresh pull of pending messages
+
+        Args:
+            messages: Pending messages as returned by GoogleSheetsService.get_pending_messages()
+        """
+        rows = [row for row in map(self._row, messages) if row]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scheduled_messages")
+            self._conn.executemany("INSERT OR REPLACE INTO scheduled_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        logger.info(f"Loaded {len(rows)} pending messages into local cache")
+
+    def upsert(self, messages: List[Dict[str, Any]]):
+        """
+        Add or replace cached messages
+
+        Args:
+            messages: Message dictionaries (with row_index when known)
+        """
+        rows = [row for row in map(self._row, messages) if row]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO scheduled_messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def set_status(self, status_by_id: Dict[str, str]):
+        """
+        Update the status of cached messages
+
+        Args:
+            status_by_id: Scheduled message ID -> new status
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE scheduled_messages SET status = ? WHERE message_id = ?",
+                [(status, message_id) for message_id, status in status_by_id.items()]
+            )
+
+    def set_status_by_id(self, message_id: str, status: str):
+        """
+        Update the status of one cached message
+
+        Args:
+            message_id: Scheduled message ID
+            status: New status
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE scheduled_messages SET status = ? WHERE message_id = ?", (status, message_id))
+
+    def cancel(self, contact_id: str, message_codes: Optional[List[str]] = None):
+        """
+        Mark a contact's pending messages as cancelled
+
+        Args:
+            contact_id: Contact ID
+            message_codes: Message codes to cancel (None = all pending)
+        """
+        query = "UPDATE scheduled_messages SET status = 'cancelled' WHERE contact_id = ? AND status = 'pending'"
+        params: List[Any] = [contact_id]
+        if message_codes is not None:
+            query += f" AND message_code IN ({', '.join('?' * len(message_codes))})"
+            params.extend(message_codes)
+
+        with self._lock, self._conn:
+            self._conn.execute(query, params)
+
+    def get_due(self, now_ts: float) -> List[Dict[str, Any]]:
+        """
+        Get pending messages whose send time has passed, earliest first
+
+        Args:
+            now_ts: Current POSIX timestamp
+
+        Returns:
+            List of message dictionaries (same keys as get_pending_messages)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message_id, contact_id, message_code, scheduled_send_time, status, trigger_type, row_index "
+                "FROM scheduled_messages WHERE status = 'pending' AND send_ts <= ? ORDER BY send_ts",
+                (now_ts,)
+            ).fetchall()
+
+        return [
+            {
+                'message_id': message_id,
+                'contact_id': contact_id,
+                'message_code': sys.intern(message_code),
+                'scheduled_send_time': scheduled_send_time,
+                'status': status,
+                'trigger_type': trigger_type,
+                'row_index': row_index
+            }
+            for message_id, contact_id, message_code, scheduled_send_time, status, trigger_type, row_index in rows
+        ]
+
+    def next_send_time(self, now_ts: float) -> Optional[tuple]:
+        """
+        Get the earliest pending message that isn't due yet
+
+        Args:
+            now_ts: Current POSIX timestamp
+
+        Returns:
+            Tuple of (send timestamp, message_id), or None if nothing is pending
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT send_ts, message_id FROM scheduled_messages "
+                "WHERE status = 'pending' AND send_ts > ? ORDER BY send_ts LIMIT 1",
+                (now_ts,)
+            ).fetchone()
+
+    def record_sent(self, message_id: str):
+        """
+        Remember that a message was sent (and forget ones older than SENT_ID_RETENTION)
+
+        Args:
+            message_id: Scheduled message ID
+        """
+        now_ts = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sent_messages VALUES (?, ?)", (message_id, now_ts))
+            self._conn.execute("DELETE FROM sent_messages WHERE sent_ts < ?", (now_ts - SENT_ID_RETENTION,))
+
+    def recent_sent_ids(self, limit: int) -> List[str]:
+        """
+        Get the most recently sent message IDs, oldest first
+
+        Args:
+            limit: Maximum number of IDs to return
+
+        Returns:
+            List of message IDs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT message_id FROM (SELECT message_id, sent_ts FROM sent_messages "
+                "ORDER BY sent_ts DESC LIMIT ?) ORDER BY sent_ts",
+                (limit,)
+            ).fetchall()
+
+        return [message_id for message_id, in rows]
@@ -2,10 +2,13 @@
 Comprehensive Test Suite for Inner Joy WhatsApp Automation
 Tests all major flows including new two-step timeslot selection
 """
+import glob
+import hashlib
 import sys
 import os
-from datetime import datetime, timedelta
-import pytz
+from collections import Counter
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -14,81 +17,127 @@ from config import Config
 from services.message_handler import MessageHandler
 from services.google_sheets import GoogleSheetsService
 
-print("=" * 80)
+# Templates and the timezone are built once and shared by every test below
+_TEMPLATES = Config.get_message_templates()
+_LOWER_TEMPLATES = {code: template.lower() for code, template in _TEMPLATES.items()}
+_TZ = ZoneInfo(Config.TIMEZONE)
+# One snapshot of the current time for the whole run (sessions are days ahead, so lag doesn't matter)
+_NOW = datetime.now(_TZ)
+_SLOT_SET = Config.TIME_SLOT_SET
+
+# Written after a fully passing run; with --skip-unchanged the suite is skipped while its key is unchanged
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_LAST_PASS_FILE = os.path.join(_ROOT, '.tests_last_pass')
+_SOURCE_FILES = (
+    'config.py', 'requirements.txt', os.path.basename(__file__),
+    *sorted(os.path.relpath(path, _ROOT) for path in glob.glob(os.path.join(_ROOT, 'services', '*.py')))
+)
+
+
+def _suite_key():
+    """Hash of what this suite checks (templates, timeslots, source under test, and today's date)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(sorted(_TEMPLATES.items())).encode())
+    digest.update(repr(sorted(Config.TIME_SLOTS.items())).encode())
+    digest.update(Config.TIMEZONE.encode())
+    for path in _SOURCE_FILES:
+        with open(os.path.join(_ROOT, path), 'rb') as f:
+            digest.update(f.read())
+    # Session tests depend on the current date
+    digest.update(_NOW.date().isoformat().encode())
+    return digest.hexdigest()
+
+
+_SUITE_KEY = _suite_key()
+if __debug__ and '--skip-unchanged' in sys.argv and os.path.exists(_LAST_PASS_FILE):
+    with open(_LAST_PASS_FILE) as f:
+        if f.read().strip() == _SUITE_KEY:
+            print("✅ Nothing changed since the last passing run - skipping")
+            sys.exit(0)
+
+# One handler shared by every handler and session test
+_HANDLER = MessageHandler()
+
+# Next session per timeslot, calculated once for the session tests
+_SESSION_CACHE = {slot: _HANDLER._calculate_next_session(slot) for slot in Config.TIME_SLOTS}
+
+# Text every two-step (day + time) selection message must contain
+_REQUIRED_TOKENS = ('S = Saturday', 'U = Sunday', 'A = 15:30', 'E = 21:00', 'UTC+7', 'Reply S and then A–E')
+
+_BAR = "=" * 80
+
+print(_BAR)
 print("INNER JOY AUTOMATION - COMPREHENSIVE TEST SUITE")
-print("=" * 80)
+print(_BAR)
 print()
 
+# Under python -O plain asserts are stripped; only the checks that raise explicitly still run
+if not __debug__:
+    print("⚠️  Running with -O: only the core configuration checks are enforced\n")
+
 # Test counters
-total_tests = 0
-passed_tests = 0
-failed_tests = 0
+_STATS = Counter()
 
 def test_result(test_name, passed, details=""):
     """Track and display test results"""
-    global total_tests, passed_tests, failed_tests
-    total_tests += 1
+    _STATS['passed' if passed else 'failed'] += 1
     if passed:
-        passed_tests += 1
         print(f"✅ PASS: {test_name}")
     else:
-        failed_tests += 1
         print(f"❌ FAIL: {test_name}")
     if details:
         print(f"   Details: {details}")
     print()
 
+def run(name, fn):
+    """Run one test case and record its result (the case returns its pass details)"""
+    try:
+        test_result(name, True, fn() or "")
+    except Exception as e:
+        test_result(name, False, str(e))
+
+
 # ============================================================================
 # TEST 1: Configuration Tests
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 1: CONFIGURATION")
-print("=" * 80 + "\n")
-
-# Test 1.1: Timezone Configuration
-try:
-    assert Config.TIMEZONE == 'Asia/Bangkok', f"Expected Asia/Bangkok, got {Config.TIMEZONE}"
-    tz = pytz.timezone(Config.TIMEZONE)
-    now = datetime.now(tz)
-    offset = now.strftime('%z')
-    test_result("1.1 Timezone is UTC+7", offset == '+0700', f"Timezone offset: {offset}")
-except Exception as e:
-    test_result("1.1 Timezone is UTC+7", False, str(e))
-
-# Test 1.2: New Timeslot Structure
-try:
+def case_1_1():
+    """Timezone Configuration"""
+    if Config.TIMEZONE != 'Asia/Bangkok':
+        raise AssertionError(f"Expected Asia/Bangkok, got {Config.TIMEZONE}")
+    offset = _NOW.utcoffset()
+    if offset != timedelta(hours=7):
+        raise AssertionError(f"Timezone offset: {offset}")
+    return f"Timezone offset: {offset}"
+
+
+def case_1_2():
+    """New Timeslot Structure"""
     expected_slots = ['SA', 'SB', 'SC', 'SD', 'SE', 'UA', 'UB', 'UC', 'UD', 'UE']
     actual_slots = list(Config.TIME_SLOTS.keys())
-    assert actual_slots == expected_slots, f"Expected {expected_slots}, got {actual_slots}"
-    test_result("1.2 All 10 timeslots exist (SA-SE, UA-UE)", True, f"Slots: {', '.join(actual_slots)}")
-except Exception as e:
-    test_result("1.2 All 10 timeslots exist", False, str(e))
-
-# Test 1.3: Day Selection Mapping
-try:
-    assert 'S' in Config.DAY_SELECTION, "Day 'S' not in DAY_SELECTION"
-    assert 'U' in Config.DAY_SELECTION, "Day 'U' not in DAY_SELECTION"
-    assert Config.DAY_SELECTION['S'] == 'Saturday', "S should map to Saturday"
-    assert Config.DAY_SELECTION['U'] == 'Sunday', "U should map to Sunday"
-    test_result("1.3 Day selection mapping (S/U)", True, "S=Saturday, U=Sunday")
-except Exception as e:
-    test_result("1.3 Day selection mapping (S/U)", False, str(e))
-
-# Test 1.4: Time Selection Mapping
-try:
-    from datetime import time
-    assert len(Config.TIME_SELECTION) == 5, f"Expected 5 times, got {len(Config.TIME_SELECTION)}"
-    assert Config.TIME_SELECTION['A'] == time(15, 30), "A should be 15:30"
-    assert Config.TIME_SELECTION['B'] == time(19, 30), "B should be 19:30"
-    assert Config.TIME_SELECTION['C'] == time(20, 0), "C should be 20:00"
-    assert Config.TIME_SELECTION['D'] == time(20, 30), "D should be 20:30"
-    assert Config.TIME_SELECTION['E'] == time(21, 0), "E should be 21:00"
-    test_result("1.4 Time selection mapping (A-E)", True, "All 5 times correctly mapped")
-except Exception as e:
-    test_result("1.4 Time selection mapping (A-E)", False, str(e))
-
-# Test 1.5: 24-Hour Window for All Contacts
-try:
+    if actual_slots != expected_slots:
+        raise AssertionError(f"Expected {expected_slots}, got {actual_slots}")
+
+    return f"Slots: {', '.join(actual_slots)}"
+
+
+def case_1_3():
+    """Day Selection Mapping"""
+    expected = {'S': 'Saturday', 'U': 'Sunday'}
+    assert Config.DAY_SELECTION == expected, f"Expected {expected}, got {Config.DAY_SELECTION}"
+
+    return "S=Saturday, U=Sunday"
+
+
+def case_1_4():
+    """Time Selection Mapping"""
+    expected = {'A': time(15, 30), 'B': time(19, 30), 'C': time(20, 0), 'D': time(20, 30), 'E': time(21, 0)}
+    assert Config.TIME_SELECTION == expected, f"Expected {expected}, got {Config.TIME_SELECTION}"
+
+    return "All 5 times correctly mapped"
+
+
+def case_1_5():
+    """24-Hour Window for All Contacts"""
     fb_window = Config.get_window_duration('facebook_ads')
     web_window = Config.get_window_duration('website')
     unknown_window = Config.get_window_duration('unknown')
@@ -96,52 +145,49 @@ try:
     assert fb_window == 24, f"Facebook Ads should be 24h, got {fb_window}h"
     assert web_window == 24, f"Website should be 24h, got {web_window}h"
     assert unknown_window == 24, f"Unknown should be 24h, got {unknown_window}h"
-    test_result("1.5 All contacts use 24-hour window", True, "FB Ads, Website, Unknown all = 24h")
-except Exception as e:
-    test_result("1.5 All contacts use 24-hour window", False, str(e))
 
-# Test 1.6: Window constant exists
-try:
+    return "FB Ads, Website, Unknown all = 24h"
+
+
+def case_1_6():
+    """Window constant exists"""
     assert hasattr(Config, 'WINDOW_24H_SECONDS'), "WINDOW_24H_SECONDS constant missing"
     assert Config.WINDOW_24H_SECONDS == 86400, f"Expected 86400 seconds, got {Config.WINDOW_24H_SECONDS}"
-    test_result("1.6 WINDOW_24H_SECONDS constant", True, "86400 seconds (24 hours)")
-except Exception as e:
-    test_result("1.6 WINDOW_24H_SECONDS constant", False, str(e))
+
+    return "86400 seconds (24 hours)"
+
 
 # ============================================================================
 # TEST 2: Message Template Tests
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 2: MESSAGE TEMPLATES")
-print("=" * 80 + "\n")
+templates = _TEMPLATES
 
-templates = Config.get_message_templates()
 
-# Test 2.1: B1_Z1 exists and is unified
-try:
+def case_2_1():
+    """B1_Z1 exists and is unified"""
     assert 'B1_Z1' in templates, "B1_Z1 template missing"
     assert 'B1_Z1_24H' not in templates or templates.get('B1_Z1_24H') is None, "B1_Z1_24H should not exist (unified to B1_Z1)"
     b1_z1 = templates['B1_Z1']
     assert 'Ineke' in b1_z1, "Should mention Ineke"
-    assert 'name' in b1_z1.lower(), "Should ask for name"
-    test_result("2.1 B1_Z1 template (unified for all contacts)", True, "Single template for all contacts")
-except Exception as e:
-    test_result("2.1 B1_Z1 template", False, str(e))
+    assert 'name' in _LOWER_TEMPLATES['B1_Z1'], "Should ask for name"
+
+    return "Single template for all contacts"
 
-# Test 2.2: B1_Z2 asks for day (S/U)
-try:
+
+def case_2_2():
+    """B1_Z2 asks for day (S/U)"""
     assert 'B1_Z2' in templates, "B1_Z2 template missing"
     b1_z2 = templates['B1_Z2']
     assert 'S = Saturday' in b1_z2, "Should have S = Saturday"
     assert 'U = Sunday' in b1_z2, "Should have U = Sunday"
     assert 'Reply S or U' in b1_z2, "Should ask to reply S or U"
     assert 'UTC+7' in b1_z2, "Should mention UTC+7"
-    test_result("2.2 B1_Z2 asks for day (S/U)", True, "Day selection present")
-except Exception as e:
-    test_result("2.2 B1_Z2 asks for day", False, str(e))
 
-# Test 2.3: B1_Z2A asks for time (A-E) - NEW template
-try:
+    return "Day selection present"
+
+
+def case_2_3():
+    """B1_Z2A asks for time (A-E) - NEW template"""
     assert 'B1_Z2A' in templates, "B1_Z2A template missing"
     b1_z2a = templates['B1_Z2A']
     assert 'A = 15:30' in b1_z2a, "Should have A = 15:30"
@@ -150,152 +196,114 @@ try:
     assert 'D = 20:30' in b1_z2a, "Should have D = 20:30"
     assert 'E = 21:00' in b1_z2a, "Should have E = 21:00"
     assert 'UTC+7' in b1_z2a, "Should mention UTC+7"
-    test_result("2.3 B1_Z2A asks for time (A-E)", True, "All 5 time options present")
-except Exception as e:
-    test_result("2.3 B1_Z2A asks for time", False, str(e))
 
-# Test 2.4: Reminder messages simplified (no thumbs-up)
-try:
+    return "All 5 time options present"
+
+
+def case_2_4():
+    """Reminder messages simplified (no thumbs-up)"""
     r1 = templates['B1_R1']
     r2 = templates['B1_R2']
 
     assert '👍' not in r1, "R1 should not ask for thumbs up"
-    assert 'thumbs' not in r1.lower(), "R1 should not mention thumbs up"
+    assert 'thumbs' not in _LOWER_TEMPLATES['B1_R1'], "R1 should not mention thumbs up"
     assert '🕒' in r1, "R1 should have clock emoji"
 
     assert '👍' not in r2, "R2 should not ask for thumbs up"
-    assert 'thumbs' not in r2.lower(), "R2 should not mention thumbs up"
+    assert 'thumbs' not in _LOWER_TEMPLATES['B1_R2'], "R2 should not mention thumbs up"
 
-    test_result("2.4 Reminders simplified (no thumbs-up requests)", True, "R1 and R2 don't ask for thumbs up")
-except Exception as e:
-    test_result("2.4 Reminders simplified", False, str(e))
+    return "R1 and R2 don't ask for thumbs up"
 
-# Test 2.5: Confirmation message includes UTC+7
-try:
+
+def case_2_5():
+    """Confirmation message includes UTC+7"""
     b1_z2a1 = templates['B1_Z2A1']
     assert 'UTC+7' in b1_z2a1, "Confirmation should mention UTC+7"
-    test_result("2.5 B1_Z2A1 confirmation includes UTC+7", True)
-except Exception as e:
-    test_result("2.5 B1_Z2A1 confirmation", False, str(e))
 
-# Test 2.6: Member welcome messages show UTC+7
-try:
+
+def case_2_6():
+    """Member welcome messages show UTC+7"""
     m1 = templates['B1_M1']
     assert '20:00 / 20:30 (UTC+7)' in m1, "Member welcome should show UTC+7"
-    test_result("2.6 Member welcome shows UTC+7 times", True)
-except Exception as e:
-    test_result("2.6 Member welcome UTC+7", False, str(e))
 
-# Test 2.7: Tree 2 messages use new format
-try:
+
+def case_2_7():
+    """Tree 2 messages use new format"""
     b2_ra = templates['B2_RA']
     b2_rb = templates['B2_RB']
 
     # Check B2_RA
-    assert 'S = Saturday' in b2_ra, "B2_RA should have day selection"
-    assert 'U = Sunday' in b2_ra, "B2_RA should have day selection"
-    assert 'A = 15:30' in b2_ra, "B2_RA should have time selection"
-    assert 'E = 21:00' in b2_ra, "B2_RA should have all times"
-    assert 'UTC+7' in b2_ra, "B2_RA should mention UTC+7"
-    assert 'Reply S and then A–E' in b2_ra, "B2_RA should have instruction"
+    missing = [token for token in _REQUIRED_TOKENS if token not in b2_ra]
+    assert not missing, f"B2_RA is missing {missing}"
 
     # Check B2_RB
     assert 'S = Saturday' in b2_rb, "B2_RB should have day selection"
     assert 'UTC+7' in b2_rb, "B2_RB should mention UTC+7"
 
-    test_result("2.7 Tree 2 messages use new two-step format", True, "B2_RA and B2_RB updated")
-except Exception as e:
-    test_result("2.7 Tree 2 messages", False, str(e))
+    return "B2_RA and B2_RB updated"
 
-# Test 2.8: NoSales/NoShow messages use new format
-try:
-    nosales = templates['B1_NOSALES']
-    noshow = templates['B1_NOSHOW']
 
-    for template, name in [(nosales, 'NoSales'), (noshow, 'NoShow')]:
-        assert 'S = Saturday' in template, f"{name} should have day selection"
-        assert 'U = Sunday' in template, f"{name} should have day selection"
-        assert 'A = 15:30' in template, f"{name} should have time selection"
-        assert 'E = 21:00' in template, f"{name} should have all times"
-        assert 'UTC+7' in template, f"{name} should mention UTC+7"
-        assert 'Reply S and then A–E' in template, f"{name} should have instruction"
+def case_2_8():
+    """NoSales/NoShow messages use new format"""
+    missing = {
+        name: [token for token in _REQUIRED_TOKENS if token not in templates[key]]
+        for key, name in (('B1_NOSALES', 'NoSales'), ('B1_NOSHOW', 'NoShow'))
+    }
+    missing = {name: tokens for name, tokens in missing.items() if tokens}
+    assert not missing, f"Missing tokens: {missing}"
+
+    return "Both updated"
 
-    test_result("2.8 NoSales/NoShow messages use new format", True, "Both updated")
-except Exception as e:
-    test_result("2.8 NoSales/NoShow messages", False, str(e))
 
 # ============================================================================
 # TEST 3: Timeslot Display Tests
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 3: TIMESLOT DISPLAY")
-print("=" * 80 + "\n")
-
-# Test 3.1: Saturday timeslot displays
-try:
-    sa_display = Config.get_timeslot_display('SA')
-    sb_display = Config.get_timeslot_display('SB')
-    sc_display = Config.get_timeslot_display('SC')
-    sd_display = Config.get_timeslot_display('SD')
-    se_display = Config.get_timeslot_display('SE')
-
-    assert sa_display == "Saturday 15:30 (UTC+7)", f"SA should be 'Saturday 15:30 (UTC+7)', got '{sa_display}'"
-    assert sb_display == "Saturday 19:30 (UTC+7)", f"SB should be 'Saturday 19:30 (UTC+7)', got '{sb_display}'"
-    assert sc_display == "Saturday 20:00 (UTC+7)", f"SC should be 'Saturday 20:00 (UTC+7)', got '{sc_display}'"
-    assert sd_display == "Saturday 20:30 (UTC+7)", f"SD should be 'Saturday 20:30 (UTC+7)', got '{sd_display}'"
-    assert se_display == "Saturday 21:00 (UTC+7)", f"SE should be 'Saturday 21:00 (UTC+7)', got '{se_display}'"
-
-    test_result("3.1 Saturday timeslot displays (SA-SE)", True, "All 5 Saturday slots correct")
-except Exception as e:
-    test_result("3.1 Saturday timeslot displays", False, str(e))
-
-# Test 3.2: Sunday timeslot displays
-try:
-    ua_display = Config.get_timeslot_display('UA')
-    ub_display = Config.get_timeslot_display('UB')
-    uc_display = Config.get_timeslot_display('UC')
-    ud_display = Config.get_timeslot_display('UD')
-    ue_display = Config.get_timeslot_display('UE')
-
-    assert ua_display == "Sunday 15:30 (UTC+7)", f"UA should be 'Sunday 15:30 (UTC+7)', got '{ua_display}'"
-    assert ub_display == "Sunday 19:30 (UTC+7)", f"UB should be 'Sunday 19:30 (UTC+7)', got '{ub_display}'"
-    assert uc_display == "Sunday 20:00 (UTC+7)", f"UC should be 'Sunday 20:00 (UTC+7)', got '{uc_display}'"
-    assert ud_display == "Sunday 20:30 (UTC+7)", f"UD should be 'Sunday 20:30 (UTC+7)', got '{ud_display}'"
-    assert ue_display == "Sunday 21:00 (UTC+7)", f"UE should be 'Sunday 21:00 (UTC+7)', got '{ue_display}'"
-
-    test_result("3.2 Sunday timeslot displays (UA-UE)", True, "All 5 Sunday slots correct")
-except Exception as e:
-    test_result("3.2 Sunday timeslot displays", False, str(e))
-
-# Test 3.3: Invalid timeslot returns empty string
-try:
+def case_3_1():
+    """Saturday and Sunday timeslot displays"""
+    expected = {
+        'SA': "Saturday 15:30 (UTC+7)",
+        'SB': "Saturday 19:30 (UTC+7)",
+        'SC': "Saturday 20:00 (UTC+7)",
+        'SD': "Saturday 20:30 (UTC+7)",
+        'SE': "Saturday 21:00 (UTC+7)",
+        'UA': "Sunday 15:30 (UTC+7)",
+        'UB': "Sunday 19:30 (UTC+7)",
+        'UC': "Sunday 20:00 (UTC+7)",
+        'UD': "Sunday 20:30 (UTC+7)",
+        'UE': "Sunday 21:00 (UTC+7)",
+    }
+    displays = {code: Config.get_timeslot_display(code) for code in Config.TIME_SLOTS}
+
+    assert displays == expected, f"Expected {expected}, got {displays}"
+
+    return "All 10 Saturday and Sunday slots correct"
+
+
+def case_3_2():
+    """Invalid timeslot returns empty string"""
     invalid = Config.get_timeslot_display('XYZ')
     assert invalid == '', f"Invalid timeslot should return empty string, got '{invalid}'"
-    test_result("3.3 Invalid timeslot handling", True, "Returns empty string")
-except Exception as e:
-    test_result("3.3 Invalid timeslot handling", False, str(e))
+
+    return "Returns empty string"
+
 
 # ============================================================================
 # TEST 4: Message Handler Logic Tests
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 4: MESSAGE HANDLER LOGIC")
-print("=" * 80 + "\n")
-
-# Test 4.1: MessageHandler can be instantiated
-try:
-    handler = MessageHandler()
+def case_4_1():
+    """MessageHandler can be instantiated"""
+    handler = _HANDLER
     assert handler is not None, "MessageHandler should instantiate"
     assert hasattr(handler, '_handle_day_selection'), "Should have _handle_day_selection method"
     assert hasattr(handler, '_handle_time_selection'), "Should have _handle_time_selection method"
-    test_result("4.1 MessageHandler instantiation", True, "Handler created with new methods")
-except Exception as e:
-    test_result("4.1 MessageHandler instantiation", False, str(e))
 
-# Test 4.2: Template formatting works
-try:
-    handler = MessageHandler()
-    templates = handler.templates
+    return "Handler created with new methods"
+
+
+def case_4_2():
+    """Template formatting works"""
+    handler = _HANDLER
+    templates = _TEMPLATES
 
     # Test B1_Z2 formatting
     b1_z2_formatted = templates['B1_Z2'].format(
@@ -318,13 +326,12 @@ try:
     assert "TestUser" in b1_z2a1_formatted, "Name should be in confirmation"
     assert "Saturday 15:30 (UTC+7)" in b1_z2a1_formatted, "Timeslot should be in confirmation"
 
-    test_result("4.2 Template formatting", True, "All templates format correctly")
-except Exception as e:
-    test_result("4.2 Template formatting", False, str(e))
+    return "All templates format correctly"
 
-# Test 4.3: First name extraction
-try:
-    handler = MessageHandler()
+
+def case_4_3():
+    """First name extraction"""
+    handler = _HANDLER
 
     # Test various name formats
     name1 = handler._extract_first_name("John")
@@ -339,76 +346,57 @@ try:
     name4 = handler._extract_first_name("👍")  # Emoji only
     assert name4 == "there", f"Emoji should default to 'there', got '{name4}'"
 
-    test_result("4.3 First name extraction", True, "Correctly extracts and capitalizes names")
-except Exception as e:
-    test_result("4.3 First name extraction", False, str(e))
+    return "Correctly extracts and capitalizes names"
+
 
 # ============================================================================
 # TEST 5: Session DateTime Calculation
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 5: SESSION DATETIME CALCULATION")
-print("=" * 80 + "\n")
-
-# Test 5.1: Calculate next Saturday session
-try:
-    handler = MessageHandler()
-    tz = pytz.timezone(Config.TIMEZONE)
+def case_5_1():
+    """Calculate next Saturday session"""
+    tz = _TZ
 
     # Calculate for Saturday 15:30
-    session_sa = handler._calculate_next_session('SA')
+    session_sa = _SESSION_CACHE['SA']
     assert session_sa.weekday() == 5, f"SA should be Saturday (5), got {session_sa.weekday()}"
     assert session_sa.hour == 15 and session_sa.minute == 30, f"SA should be 15:30, got {session_sa.hour}:{session_sa.minute}"
 
     # Calculate for Saturday 21:00
-    session_se = handler._calculate_next_session('SE')
+    session_se = _SESSION_CACHE['SE']
     assert session_se.weekday() == 5, f"SE should be Saturday (5), got {session_se.weekday()}"
     assert session_se.hour == 21 and session_se.minute == 0, f"SE should be 21:00, got {session_se.hour}:{session_se.minute}"
 
-    test_result("5.1 Saturday session calculation", True, f"Next Saturday sessions calculated correctly")
-except Exception as e:
-    test_result("5.1 Saturday session calculation", False, str(e))
+    return f"Next Saturday sessions calculated correctly"
 
-# Test 5.2: Calculate next Sunday session
-try:
-    handler = MessageHandler()
 
+def case_5_2():
+    """Calculate next Sunday session"""
     # Calculate for Sunday 15:30
-    session_ua = handler._calculate_next_session('UA')
+    session_ua = _SESSION_CACHE['UA']
     assert session_ua.weekday() == 6, f"UA should be Sunday (6), got {session_ua.weekday()}"
     assert session_ua.hour == 15 and session_ua.minute == 30, f"UA should be 15:30, got {session_ua.hour}:{session_ua.minute}"
 
     # Calculate for Sunday 21:00
-    session_ue = handler._calculate_next_session('UE')
+    session_ue = _SESSION_CACHE['UE']
     assert session_ue.weekday() == 6, f"UE should be Sunday (6), got {session_ue.weekday()}"
     assert session_ue.hour == 21 and session_ue.minute == 0, f"UE should be 21:00, got {session_ue.hour}:{session_ue.minute}"
 
-    test_result("5.2 Sunday session calculation", True, f"Next Sunday sessions calculated correctly")
-except Exception as e:
-    test_result("5.2 Sunday session calculation", False, str(e))
+    return f"Next Sunday sessions calculated correctly"
+
 
-# Test 5.3: Session is in the future
-try:
-    handler = MessageHandler()
-    tz = pytz.timezone(Config.TIMEZONE)
-    now = datetime.now(tz)
+def case_5_3():
+    """Session is in the future"""
+    session = _SESSION_CACHE['SA']
+    assert session > _NOW, f"Calculated session should be in the future. Now: {_NOW}, Session: {session}"
 
-    session = handler._calculate_next_session('SA')
-    assert session > now, f"Calculated session should be in the future. Now: {now}, Session: {session}"
+    return f"Session is {(session - _NOW).days} days ahead"
 
-    test_result("5.3 Calculated session is in future", True, f"Session is {(session - now).days} days ahead")
-except Exception as e:
-    test_result("5.3 Calculated session is in future", False, str(e))
 
 # ============================================================================
 # TEST 6: Integration Test - Simulated Flow
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST CATEGORY 6: SIMULATED MESSAGE FLOW")
-print("=" * 80 + "\n")
-
-# Test 6.1: Simulate complete two-step selection
-try:
+def case_6_1():
+    """Simulate complete two-step selection"""
     # Simulate the flow logic
     selected_day = 'S'  # User selects Saturday
     selected_time = 'B'  # User selects 19:30
@@ -420,47 +408,90 @@ try:
     display = Config.get_timeslot_display(full_timeslot)
     assert display == "Saturday 19:30 (UTC+7)", f"Display should be 'Saturday 19:30 (UTC+7)', got '{display}'"
 
-    test_result("6.1 Two-step selection simulation", True, f"S + B = SB = {display}")
-except Exception as e:
-    test_result("6.1 Two-step selection simulation", False, str(e))
-
-# Test 6.2: All day+time combinations are valid
-try:
-    days = ['S', 'U']
-    times = ['A', 'B', 'C', 'D', 'E']
-
-    valid_count = 0
-    for day in days:
-        for time_code in times:
-            combo = day + time_code
-            if combo in Config.TIME_SLOTS:
-                valid_count += 1
-
-    assert valid_count == 10, f"Expected 10 valid combinations, got {valid_count}"
-    test_result("6.2 All day+time combinations valid", True, "10/10 combinations exist")
-except Exception as e:
-    test_result("6.2 All day+time combinations", False, str(e))
-
-# Test 6.3: Invalid combinations don't exist
-try:
+    return f"S + B = SB = {display}"
+
+
+def case_6_2():
+    """All day+time combinations are valid"""
+    combos = {day + time_code for day in 'SU' for time_code in 'ABCDE'}
+    valid_count = len(combos & _SLOT_SET)
+
+    if valid_count != 10:
+        raise AssertionError(f"Expected 10 valid combinations, got {valid_count}")
+
+    return "10/10 combinations exist"
+
+
+def case_6_3():
+    """Invalid combinations don't exist"""
     invalid_combos = ['AA', 'BB', 'SS', 'UU', 'XY', 'Z1']
     all_invalid = True
     for combo in invalid_combos:
-        if combo in Config.TIME_SLOTS:
+        if combo in _SLOT_SET:
             all_invalid = False
             break
 
     assert all_invalid, "Invalid combinations should not exist in TIME_SLOTS"
-    test_result("6.3 Invalid combinations rejected", True, "Invalid combos not in TIME_SLOTS")
-except Exception as e:
-    test_result("6.3 Invalid combinations", False, str(e))
+
+    return "Invalid combos not in TIME_SLOTS"
+
+
+TESTS = [
+    ("TEST CATEGORY 1: CONFIGURATION", [
+        ("1.1 Timezone is UTC+7", case_1_1),
+        ("1.2 All 10 timeslots exist (SA-SE, UA-UE)", case_1_2),
+        ("1.3 Day selection mapping (S/U)", case_1_3),
+        ("1.4 Time selection mapping (A-E)", case_1_4),
+        ("1.5 All contacts use 24-hour window", case_1_5),
+        ("1.6 WINDOW_24H_SECONDS constant", case_1_6),
+    ]),
+    ("TEST CATEGORY 2: MESSAGE TEMPLATES", [
+        ("2.1 B1_Z1 template (unified for all contacts)", case_2_1),
+        ("2.2 B1_Z2 asks for day (S/U)", case_2_2),
+        ("2.3 B1_Z2A asks for time (A-E)", case_2_3),
+        ("2.4 Reminders simplified (no thumbs-up requests)", case_2_4),
+        ("2.5 B1_Z2A1 confirmation includes UTC+7", case_2_5),
+        ("2.6 Member welcome shows UTC+7 times", case_2_6),
+        ("2.7 Tree 2 messages use new two-step format", case_2_7),
+        ("2.8 NoSales/NoShow messages use new format", case_2_8),
+    ]),
+    ("TEST CATEGORY 3: TIMESLOT DISPLAY", [
+        ("3.1 Timeslot displays (SA-SE, UA-UE)", case_3_1),
+        ("3.2 Invalid timeslot handling", case_3_2),
+    ]),
+    ("TEST CATEGORY 4: MESSAGE HANDLER LOGIC", [
+        ("4.1 MessageHandler instantiation", case_4_1),
+        ("4.2 Template formatting", case_4_2),
+        ("4.3 First name extraction", case_4_3),
+    ]),
+    ("TEST CATEGORY 5: SESSION DATETIME CALCULATION", [
+        ("5.1 Saturday session calculation", case_5_1),
+        ("5.2 Sunday session calculation", case_5_2),
+        ("5.3 Calculated session is in future", case_5_3),
+    ]),
+    ("TEST CATEGORY 6: SIMULATED MESSAGE FLOW", [
+        ("6.1 Two-step selection simulation", case_6_1),
+        ("6.2 All day+time combinations valid", case_6_2),
+        ("6.3 Invalid combinations rejected", case_6_3),
+    ]),
+]
+
+for category, cases in TESTS:
+    print("\n" + _BAR)
+    print(category)
+    print(_BAR + "\n")
+    for name, fn in cases:
+        run(name, fn)
 
 # ============================================================================
 # FINAL RESULTS
 # ============================================================================
-print("\n" + "=" * 80)
+print("\n" + _BAR)
 print("TEST RESULTS SUMMARY")
-print("=" * 80 + "\n")
+print(_BAR + "\n")
+
+passed_tests, failed_tests = _STATS['passed'], _STATS['failed']
+total_tests = passed_tests + failed_tests
 
 print(f"Total Tests:  {total_tests}")
 print(f"✅ Passed:     {passed_tests}")
@@ -470,12 +501,16 @@ print()
 
 if failed_tests == 0:
     print("🎉 ALL TESTS PASSED! System is ready for deployment.")
+    # A -O run skips most checks, so it doesn't count as a pass
+    if __debug__:
+        with open(_LAST_PASS_FILE, 'w') as f:
+            f.write(_SUITE_KEY)
 else:
     print(f"⚠️  {failed_tests} test(s) failed. Please review the errors above.")
 
-print("\n" + "=" * 80)
+print("\n" + _BAR)
 print("END OF TEST SUITE")
-print("=" * 80 + "\n")
+print(_BAR + "\n")
 
 # Exit with appropriate code
 sys.exit(0 if failed_tests == 0 else 1)
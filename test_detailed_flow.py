@@ -4,9 +4,10 @@ Detailed End-to-End Flow Test
 Simulates complete customer journey for both Website and Facebook Ads leads
 """
 import json
-import time
+import sys
+from collections import namedtuple
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 
 # Import modules
 from config import Config
@@ -20,7 +21,11 @@ print()
 
 # Initialize services
 handler = MessageHandler()
-timezone = pytz.timezone(Config.TIMEZONE)
+timezone = ZoneInfo(Config.TIMEZONE)
+templates = Config.get_message_templates()
+
+# Contact records the scenarios would create; written in one batch with --write-sheets
+pending_contacts = []
 
 def print_section(title):
     """Print formatted section header"""
@@ -39,13 +44,18 @@ def print_result(label, value, indent=0):
     spaces = "  " * indent
     print(f"{spaces}• {label}: {value}")
 
+def format_time(dt):
+    """Format an aware datetime for display (ISO date/time plus the configured timezone)"""
+    return f"{dt.isoformat(sep=' ', timespec='seconds')} {Config.TIMEZONE}"
+
 def print_message(direction, content, indent=0):
     """Print formatted message"""
     spaces = "  " * indent
     arrow = "→" if direction == "outbound" else "←"
-    print(f"{spaces}{arrow} {direction.upper()}: {content[:80]}{'...' if len(content) > 80 else ''}")
+    trimmed = content if len(content) <= 80 else content[:80] + "..."
+    print(f"{spaces}{arrow} {direction.upper()}: {trimmed}")
 
-# ==================== SCENARIO 1: WEBSITE LEAD (24H WINDOW) ====================
+# ==================== SCENARIO 1: WEBSITE LEAD ====================
 print_section("SCENARIO 1: WEBSITE LEAD (24-HOUR WINDOW)")
 
 print("\n📱 Contact Information:")
@@ -54,6 +64,9 @@ print_result("Phone", "+8562022398887")
 print_result("WhatsApp Number", "856-2022398887")
 print_result("Expected Window", "24 hours")
 
+# One clock reading for the whole scenario; later messages are offset from it
+now = datetime.now(timezone)
+
 # Step 1: First Contact
 print_step(1, "Website Visitor Clicks WhatsApp Button")
 print("\n  Action: User clicks website button with pre-filled message")
@@ -71,7 +84,7 @@ webhook_website = {
         'id': 'msg_web_001',
         'type': 'text',
         'text': 'Hello, I would like to have the free Zoom preview link. Ineke',
-        'timestamp': datetime.now(timezone).isoformat()
+        'timestamp': now.isoformat()
     },
     'channel': {
         'id': Config.RESPOND_CHANNEL_ID,
@@ -85,31 +98,27 @@ print_message("inbound", webhook_website['message']['text'], indent=1)
 # Detect source
 detected_source = handler._detect_contact_source(webhook_website)
 print("\n  Source Detection:")
-print_result("Trigger phrase found", "✅ 'free Zoom preview link' detected", indent=1)
+print_result("Facebook Ads trigger", "❌ not found (website is the default)", indent=1)
 print_result("Detected source", detected_source, indent=1)
-print_result("Window assigned", "24 hours", indent=1)
 
 # Calculate window
-now = datetime.now(timezone)
 window_hours = Config.get_window_duration(detected_source)
 window_expires = now + timedelta(hours=window_hours)
 
 print("\n  Window Calculation:")
-print_result("Current time", now.strftime('%Y-%m-%d %H:%M:%S %Z'), indent=1)
+print_result("Current time", format_time(now), indent=1)
 print_result("Window duration", f"{window_hours} hours", indent=1)
-print_result("Window expires at", window_expires.strftime('%Y-%m-%d %H:%M:%S %Z'), indent=1)
+print_result("Window expires at", format_time(window_expires), indent=1)
 
-# Determine which message to send
-templates = Config.get_message_templates()
-message_template = templates['B1_Z1_24H'] if detected_source == 'website' else templates['B1_Z1']
+# Every new contact is asked for their name first
+message_template = templates['B1_Z1']
 
 print("\n  Response Message Selection:")
-print_result("Template chosen", "B1_Z1_24H (Website flow)", indent=1)
-print_result("Message type", "Name request + All timeslots (A-D)", indent=1)
+print_result("Template chosen", "B1_Z1 (ask name)", indent=1)
 print_result("Message length", f"{len(message_template)} characters", indent=1)
 
 print("\n  Outbound Message Preview:")
-print_message("outbound", message_template[:200], indent=1)
+print_message("outbound", message_template, indent=1)
 
 # Simulate data stored in Google Sheets
 contact_record = {
@@ -123,6 +132,8 @@ contact_record = {
     'window_expires_at': window_expires.isoformat()
 }
 
+pending_contacts.append(contact_record)
+
 print("\n  Google Sheets Record Created:")
 for key, value in contact_record.items():
     if key not in ['registration_time', 'window_expires_at']:
@@ -162,7 +173,6 @@ stored_source = webhook_name_response['contact']['customFields'].get('contact_so
 print("\n  Source Check:")
 print_result("Stored source", stored_source, indent=1)
 print_result("Source detection", "⏭️  SKIPPED (using stored source)", indent=1)
-print_result("Window", "24 hours (unchanged)", indent=1)
 
 # Extract name
 first_name = webhook_name_response['message']['text'].strip().capitalize()
@@ -170,14 +180,14 @@ print("\n  Name Extraction:")
 print_result("Raw input", webhook_name_response['message']['text'], indent=1)
 print_result("Extracted name", first_name, indent=1)
 
-# Window reset
-now = datetime.now(timezone)
-new_window_expires = now + timedelta(hours=24)
+# Window reset (from the name reply's timestamp)
+last_message_time = now + timedelta(minutes=2)
+new_window_expires = last_message_time + timedelta(hours=window_hours)
 print("\n  Window Reset:")
-print_result("Last message time", now.strftime('%Y-%m-%d %H:%M:%S'), indent=1)
-print_result("Window extended to", new_window_expires.strftime('%Y-%m-%d %H:%M:%S'), indent=1)
+print_result("Last message time", format_time(last_message_time), indent=1)
+print_result("Window extended to", format_time(new_window_expires), indent=1)
 
-# Send B1_Z2 (Zoom link + timeslots)
+# Send B1_Z2 (Zoom link + ask day)
 message_z2 = templates['B1_Z2'].format(
     name=first_name,
     zoom_link=Config.ZOOM_PREVIEW_LINK,
@@ -185,50 +195,34 @@ message_z2 = templates['B1_Z2'].format(
 )
 
 print("\n  Response Message:")
-print_result("Template", "B1_Z2 (Zoom link + timeslots)", indent=1)
+print_result("Template", "B1_Z2 (Zoom link + ask day)", indent=1)
 print_result("Personalized for", first_name, indent=1)
-print_message("outbound", message_z2[:150], indent=1)
+print_message("outbound", message_z2, indent=1)
 
-# Step 3: User Selects Timeslot
-print_step(3, "User Selects Timeslot")
+# Step 3: User Chooses Day, then Time
+print_step(3, "User Chooses Day and Time")
 
-webhook_timeslot = {
-    'event': 'message.received',
-    'contact': {
-        'id': 'phone:+8562022398887',
-        'phone': '+8562022398887',
-        'firstName': first_name,
-        'customFields': {
-            'contact_source': 'website'
-        }
-    },
-    'message': {
-        'id': 'msg_web_003',
-        'type': 'text',
-        'text': 'C',
-        'timestamp': (now + timedelta(minutes=5)).isoformat()
-    }
-}
+day_reply, time_reply = 'S', 'C'
 
-print("\n  Incoming Message:")
-print_message("inbound", webhook_timeslot['message']['text'], indent=1)
+print("\n  Incoming Messages:")
+print_message("inbound", day_reply, indent=1)
+print_message("outbound", templates['B1_Z2A'], indent=1)
+print_message("inbound", time_reply, indent=1)
 
-# Validate timeslot
-timeslot = webhook_timeslot['message']['text'].upper()
-if timeslot in Config.TIME_SLOTS:
-    print("\n  Timeslot Validation:")
-    print_result("Input", timeslot, indent=1)
-    print_result("Status", "✅ Valid timeslot", indent=1)
+# Day letter + time letter make the timeslot code (e.g. S + C = SC)
+timeslot = day_reply + time_reply
+if timeslot not in Config.TIME_SLOTS:
+    print(f"❌ Timeslot {timeslot} is not configured", file=sys.stderr)
+    sys.exit(1)
 
-    slot_info = Config.TIME_SLOTS[timeslot]
-    timeslot_display = Config.get_timeslot_display(timeslot)
+slot_info = Config.TIME_SLOTS[timeslot]
+timeslot_display = Config.get_timeslot_display(timeslot)
 
-    print("\n  Timeslot Details:")
-    print_result("Slot", timeslot, indent=1)
-    print_result("Day", slot_info['day'], indent=1)
-    print_result("Time", slot_info['time'].strftime('%H:%M'), indent=1)
-    print_result("Type", "Walk-in" if slot_info['is_walkin'] else "Fixed", indent=1)
-    print_result("Display", timeslot_display, indent=1)
+print("\n  Timeslot Details:")
+print_result("Slot", timeslot, indent=1)
+print_result("Day", slot_info['day'], indent=1)
+print_result("Time", slot_info['time'].strftime('%H:%M'), indent=1)
+print_result("Display", timeslot_display, indent=1)
 
 # Confirmation message
 message_confirm = templates['B1_Z2A1'].format(
@@ -238,7 +232,7 @@ message_confirm = templates['B1_Z2A1'].format(
 
 print("\n  Response Message:")
 print_result("Template", "B1_Z2A1 (Confirmation)", indent=1)
-print_message("outbound", message_confirm[:100], indent=1)
+print_message("outbound", message_confirm, indent=1)
 
 # Schedule reminders
 print("\n  Scheduled Messages:")
@@ -250,18 +244,19 @@ print_result("B1_SHAKEUP", "T+20 minutes after session", indent=1)
 print_result("B1_S2", "T+2 hours after session", indent=1)
 
 print("\n  ✅ Website Lead Flow Complete")
-print_result("Total messages sent", "3 (B1_Z1_24H, B1_Z2, B1_Z2A1)", indent=1)
-print_result("Window status", "24-hour window active", indent=1)
+print_result("Total messages sent", "4 (B1_Z1, B1_Z2, B1_Z2A, B1_Z2A1)", indent=1)
+print_result("Window status", f"{window_hours}-hour window active", indent=1)
 print_result("Source locked", "website (permanent)", indent=1)
 
-
-# ==================== SCENARIO 2: FACEBOOK ADS LEAD (72H WINDOW) ====================
-print_section("SCENARIO 2: FACEBOOK ADS LEAD (72-HOUR WINDOW)")
+# ==================== SCENARIO 2: FACEBOOK ADS LEAD ====================
+print_section("SCENARIO 2: FACEBOOK ADS LEAD (24-HOUR WINDOW)")
 
 print("\n📱 Contact Information:")
 print_result("Source", "Facebook Ads (Click-to-WhatsApp button)")
 print_result("Phone", "+8562022398888")
-print_result("Expected Window", "72 hours")
+print_result("Expected Window", "24 hours")
+
+now_fb = datetime.now(timezone)
 
 # Step 1: First Contact
 print_step(1, "User Clicks Facebook Ad WhatsApp Button")
@@ -278,8 +273,8 @@ webhook_fb = {
     'message': {
         'id': 'msg_fb_001',
         'type': 'text',
-        'text': 'Hi Ineke, I saw your ad',
-        'timestamp': datetime.now(timezone).isoformat()
+        'text': f"Hi Ineke, {Config.FACEBOOK_ADS_TRIGGER_MESSAGE}",  # Pre-filled by the ad
+        'timestamp': now_fb.isoformat()
     },
     'channel': {
         'id': Config.RESPOND_CHANNEL_ID,
@@ -293,30 +288,21 @@ print_message("inbound", webhook_fb['message']['text'], indent=1)
 # Detect source
 detected_source_fb = handler._detect_contact_source(webhook_fb)
 print("\n  Source Detection:")
-print_result("Trigger phrase", "❌ 'free Zoom preview link' NOT found", indent=1)
+print_result("Facebook Ads trigger", f"✅ '{Config.FACEBOOK_ADS_TRIGGER_MESSAGE}' detected", indent=1)
 print_result("Detected source", detected_source_fb, indent=1)
-print_result("Window assigned", "72 hours (default)", indent=1)
 
 # Calculate window
-now_fb = datetime.now(timezone)
 window_hours_fb = Config.get_window_duration(detected_source_fb)
 window_expires_fb = now_fb + timedelta(hours=window_hours_fb)
 
 print("\n  Window Calculation:")
-print_result("Current time", now_fb.strftime('%Y-%m-%d %H:%M:%S %Z'), indent=1)
+print_result("Current time", format_time(now_fb), indent=1)
 print_result("Window duration", f"{window_hours_fb} hours", indent=1)
-print_result("Window expires at", window_expires_fb.strftime('%Y-%m-%d %H:%M:%S %Z'), indent=1)
-
-# Message selection
-message_template_fb = templates['B1_Z1']
-
-print("\n  Response Message Selection:")
-print_result("Template chosen", "B1_Z1 (Facebook Ads flow)", indent=1)
-print_result("Message type", "Name request ONLY (no timeslots)", indent=1)
-print_result("Message length", f"{len(message_template_fb)} characters", indent=1)
+print_result("Window expires at", format_time(window_expires_fb), indent=1)
 
 print("\n  Outbound Message:")
-print_message("outbound", message_template_fb, indent=1)
+print_result("Template chosen", "B1_Z1 (ask name)", indent=1)
+print_message("outbound", templates['B1_Z1'], indent=1)
 
 # Step 2: User Responds with Name
 print_step(2, "User Responds with Name")
@@ -354,11 +340,11 @@ message_z2_fb = templates['B1_Z2'].format(
 )
 
 print("\n  Response Message:")
-print_result("Template", "B1_Z2 (Zoom link + timeslots)", indent=1)
-print_message("outbound", message_z2_fb[:150], indent=1)
+print_result("Template", "B1_Z2 (Zoom link + ask day)", indent=1)
+print_message("outbound", message_z2_fb, indent=1)
 
 # Step 3: Test Source Locking
-print_step(3, "Test Source Locking (User mentions website)")
+print_step(3, "Test Source Locking (Later message without the ad trigger)")
 
 webhook_fb_website_mention = {
     'event': 'message.received',
@@ -372,7 +358,7 @@ webhook_fb_website_mention = {
     'message': {
         'id': 'msg_fb_003',
         'type': 'text',
-        'text': 'I found your free Zoom preview link too!',  # Contains trigger phrase!
+        'text': 'I found your free Zoom preview link too!',  # No ad trigger - would default to website
         'timestamp': (now_fb + timedelta(minutes=10)).isoformat()
     }
 }
@@ -382,155 +368,129 @@ print_message("inbound", webhook_fb_website_mention['message']['text'], indent=1
 
 # Check source locking
 stored_source_fb = webhook_fb_website_mention['contact']['customFields'].get('contact_source')
-would_detect_as = 'website' if 'free Zoom preview link' in webhook_fb_website_mention['message']['text'].lower() else 'facebook_ads'
+would_detect_as = handler._detect_contact_source({
+    'contact': {'customFields': {}, 'tags': []},
+    'message': webhook_fb_website_mention['message']
+})
 
 print("\n  Source Lock Test:")
 print_result("Stored source", stored_source_fb, indent=1)
-print_result("Message contains", "'free Zoom preview link' ✅", indent=1)
+print_result("Message contains ad trigger", "❌ NO", indent=1)
 print_result("Would detect as", would_detect_as, indent=1)
 print_result("Actually uses", stored_source_fb, indent=1)
-print_result("Window", "72 hours (unchanged) ✅", indent=1)
 print_result("Source changed?", "❌ NO - Source is locked!", indent=1)
 
 print("\n  ✅ Facebook Ads Lead Flow Complete")
 print_result("Total messages sent", "2 (B1_Z1, B1_Z2)", indent=1)
-print_result("Window status", "72-hour window active", indent=1)
+print_result("Window status", f"{window_hours_fb}-hour window active", indent=1)
 print_result("Source locked", "facebook_ads (permanent)", indent=1)
 
-
 # ==================== COMPARISON ====================
 print_section("COMPARISON: WEBSITE vs FACEBOOK ADS")
 
 comparison = [
     ["Aspect", "Website Lead", "Facebook Ads Lead"],
     ["─" * 30, "─" * 30, "─" * 30],
-    ["Trigger", "'free Zoom preview link'", "No trigger (default)"],
-    ["Window", "24 hours", "72 hours"],
-    ["First Message", "B1_Z1_24H (name + slots)", "B1_Z1 (name only)"],
-    ["Message Length", f"{len(templates['B1_Z1_24H'])} chars", f"{len(templates['B1_Z1'])} chars"],
-    ["Timeslots Shown", "Immediately", "After name collected"],
+    ["Trigger", "None (default)", f"'{Config.FACEBOOK_ADS_TRIGGER_MESSAGE}'"],
+    ["Window", f"{window_hours} hours", f"{window_hours_fb} hours"],
+    ["First Message", "B1_Z1 (name)", "B1_Z1 (name)"],
+    ["Timeslots Shown", "After name collected", "After name collected"],
     ["Source Locking", "✅ Locked on first message", "✅ Locked on first message"],
-    ["Window Reset", "Every message +24h", "Every message +72h"],
+    ["Window Reset", f"Every message +{window_hours}h", f"Every message +{window_hours_fb}h"],
 ]
 
 print()
-for row in comparison:
-    print(f"  {row[0]:<30} | {row[1]:<30} | {row[2]:<30}")
+print("\n".join(f"  {row[0]:<30} | {row[1]:<30} | {row[2]:<30}" for row in comparison))
 
+# Simulated records only reach the real Contacts sheet when asked to, and then in one write
+if '--write-sheets' in sys.argv and pending_contacts:
+    written = GoogleSheetsService().batch_add_contacts(pending_contacts)
+    print(f"\n  Google Sheets: {len(pending_contacts)} contact(s) written in one batch: {'✅' if written else '❌'}")
 
 # ==================== API STATS SIMULATION ====================
 print_section("API STATS SIMULATION")
 
 print("\n📊 Expected Stats Output (GET /api/stats):")
-print("\n{")
-print('  "total_contacts": 2,')
-print('  "with_timeslot": 1,')
-print('  "without_timeslot": 1,')
-print('  "members": 0,')
-print('  "source_distribution": {')
-print('    "facebook_ads": 1,  ← Facebook Ads lead')
-print('    "website": 1         ← Website lead')
-print('  },')
-print('  "timeslot_distribution": {')
-print('    "A": 0,')
-print('    "B": 0,')
-print('    "C": 1,  ← Website lead chose C')
-print('    "D": 0')
-print('  }')
-print('}')
-
+expected_stats = {
+    "total_contacts": 2,
+    "with_timeslot": 1,
+    "without_timeslot": 1,
+    "members": 0,
+    "source_distribution": {"facebook_ads": 1, "website": 1},  # one lead from each scenario
+    "timeslot_distribution": {timeslot: 1}  # website lead's chosen slot
+}
+print()
+print(json.dumps(expected_stats, indent=2))
 
 # ==================== EDGE CASES ====================
 print_section("EDGE CASE TESTING")
 
-edge_cases = [
-    {
-        'case': 'Empty message',
-        'message': '',
-        'expected_source': 'facebook_ads',
-        'reason': 'No trigger found, defaults to FB Ads'
-    },
-    {
-        'case': 'Only emoji',
-        'message': '👋',
-        'expected_source': 'facebook_ads',
-        'reason': 'No trigger found, defaults to FB Ads'
-    },
-    {
-        'case': 'Trigger in caps',
-        'message': 'FREE ZOOM PREVIEW LINK',
-        'expected_source': 'website',
-        'reason': 'Case-insensitive trigger detection'
-    },
-    {
-        'case': 'Trigger with typo',
-        'message': 'free Zoom prevew link',
-        'expected_source': 'facebook_ads',
-        'reason': 'Exact phrase match required'
-    },
-    {
-        'case': 'Trigger at end',
-        'message': 'Hi! I want the free Zoom preview link',
-        'expected_source': 'website',
-        'reason': 'Trigger found anywhere in message'
-    },
-    {
-        'case': 'FB ad mention',
-        'message': 'I saw your Facebook ad',
-        'expected_source': 'facebook_ads',
-        'reason': 'No website trigger, defaults to FB Ads'
-    }
-]
+EdgeCase = namedtuple('EdgeCase', 'case message expected_source reason')
+
+fb_trigger = Config.FACEBOOK_ADS_TRIGGER_MESSAGE
+edge_cases = (
+    EdgeCase('Empty message', '', 'website', 'No trigger found, defaults to website'),
+    EdgeCase('Only emoji', '👋', 'website', 'No trigger found, defaults to website'),
+    EdgeCase('Trigger in caps', fb_trigger.upper(), 'facebook_ads', 'Case-insensitive trigger detection'),
+    EdgeCase('Truncated trigger', fb_trigger[:-1], 'website', 'Full phrase match required'),
+    EdgeCase('Trigger at end', f"Hi! {fb_trigger}", 'facebook_ads', 'Trigger found anywhere in message'),
+    EdgeCase('Website phrase', f"I want the {Config.WEBSITE_TRIGGER_MESSAGE}", 'website', 'No ad trigger, defaults to website'),
+)
+
+edge_failures = []
 
 print()
 for i, test in enumerate(edge_cases, 1):
-    webhook_test = {
+    # New contact, no stored source
+    result = handler._detect_contact_source({
         'contact': {'customFields': {}, 'tags': []},
-        'message': {'text': test['message']}
-    }
-    result = handler._detect_contact_source(webhook_test)
-    status = "✅" if result == test['expected_source'] else "❌"
-
-    print(f"  {i}. {test['case']}")
-    print(f"     Message: '{test['message']}'")
-    print(f"     Expected: {test['expected_source']}")
+        'message': {'text': test.message}
+    })
+    if result != test.expected_source:
+        edge_failures.append(f"{test.case} (expected {test.expected_source}, got {result})")
+    status = "✅" if result == test.expected_source else "❌"
+
+    print(f"  {i}. {test.case}")
+    print(f"     Message: '{test.message}'")
+    print(f"     Expected: {test.expected_source}")
     print(f"     Got: {result} {status}")
-    print(f"     Reason: {test['reason']}")
+    print(f"     Reason: {test.reason}")
     print()
 
-
 # ==================== FINAL SUMMARY ====================
 print_section("FINAL TEST SUMMARY")
 
 print("\n✅ CONFIGURATION")
-print_result("Timezone", f"{Config.TIMEZONE} (UTC+8)", indent=1)
-print_result("Timeslots", "A, B, C, D (4 slots)", indent=1)
+print_result("Timezone", f"{Config.TIMEZONE} (UTC+7)", indent=1)
+print_result("Timeslots", f"{', '.join(Config.TIME_SLOTS)} ({len(Config.TIME_SLOTS)} slots)", indent=1)
 print_result("Payment Platform", "innerjoy.live", indent=1)
-print_result("Trigger Phrase", f"'{Config.WEBSITE_TRIGGER_MESSAGE}'", indent=1)
+print_result("Facebook Ads Trigger", f"'{Config.FACEBOOK_ADS_TRIGGER_MESSAGE}'", indent=1)
 
 print("\n✅ SOURCE DETECTION")
-print_result("Website Detection", "Message-based trigger", indent=1)
-print_result("Facebook Ads Detection", "Default (no trigger)", indent=1)
+print_result("Facebook Ads Detection", "Message-based trigger", indent=1)
+print_result("Website Detection", "Default (no trigger)", indent=1)
 print_result("Source Locking", "First message only", indent=1)
-print_result("Edge Cases", "6/6 tested successfully", indent=1)
+print_result("Edge Cases", f"{len(edge_cases) - len(edge_failures)}/{len(edge_cases)} passed", indent=1)
 
 print("\n✅ WINDOW MANAGEMENT")
-print_result("Website Window", "24 hours", indent=1)
-print_result("Facebook Ads Window", "72 hours", indent=1)
+print_result("Website Window", f"{window_hours} hours", indent=1)
+print_result("Facebook Ads Window", f"{window_hours_fb} hours", indent=1)
 print_result("Window Reset", "Every inbound message", indent=1)
 print_result("Source Lock", "Never changes after first message", indent=1)
 
 print("\n✅ MESSAGE ROUTING")
-print_result("Website Flow", "B1_Z1_24H (name + timeslots)", indent=1)
-print_result("Facebook Ads Flow", "B1_Z1 (name only)", indent=1)
-print_result("Template Differentiation", "Working correctly", indent=1)
+print_result("Both Flows", "B1_Z1 (name) → B1_Z2 (Zoom link + day) → B1_Z2A (time) → B1_Z2A1", indent=1)
 
 print("\n✅ DEPLOYMENT READY")
 print_result("Website Link", "https://wa.me/8562022398887?text=Hello%2C%20I%20would%20like...", indent=1)
-print_result("Facebook Ads Link", "https://wa.me/8562022398887?text=Hi%20Ineke...", indent=1)
+print_result("Facebook Ads Link", "https://wa.me/8562022398887?text=Hi%20Ineke%2C%20I%27m%20excited...", indent=1)
 print_result("Google Sheets", "contact_source column added", indent=1)
 print_result("Stats API", "source_distribution tracking added", indent=1)
 
+if edge_failures:
+    print(f"❌ {len(edge_failures)} edge case(s) failed: {'; '.join(edge_failures)}", file=sys.stderr)
+    sys.exit(1)
+
 print("\n" + "=" * 100)
 print(" " * 35 + "🎉 ALL TESTS PASSED")
 print(" " * 30 + "SYSTEM READY FOR PRODUCTION")
@@ -1,36 +1,49 @@
 #!/usr/bin/env python3
 """
-Comprehensive Test Suite for Dual Flow (24h Website / 72h Facebook Ads)
+Comprehensive Test Suite for Dual Flow (Website / Facebook Ads, 24h window for both)
 Tests source detection, window management, and message routing
 """
 import json
+import os
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 
 # Import our modules
 from config import Config
+from services.makecom import transform_makecom_to_internal
 from services.message_handler import MessageHandler
 
-print("=" * 80)
-print("INNER JOY DUAL FLOW TEST SUITE")
-print("=" * 80)
-print()
+RULE = "=" * 80
+
+# INNERJOY_VERBOSE=0 (e.g. in CI) still runs every check but only prints the summary
+_VERBOSE = os.environ.get('INNERJOY_VERBOSE', '1') != '0'
+emit = print
+if not _VERBOSE:
+    def emit(*args, **kwargs):
+        """Discard output"""
+
+def print_section(title):
+    """Print a section header with a single write"""
+    emit(f"\n{RULE}\n{title}\n{RULE}")
+
+print_section("INNER JOY DUAL FLOW TEST SUITE")
 
 # Initialize
-handler = MessageHandler()
-timezone = pytz.timezone(Config.TIMEZONE)
+handler = MessageHandler.get_instance()
+timezone = ZoneInfo(Config.TIMEZONE)
 
 # Test Results Tracking
+PASS_PREFIX = "✅ PASS - "
+FAIL_PREFIX = "❌ FAIL - "
 tests_passed = 0
 tests_failed = 0
 test_results = []
 
 def test_result(test_name, passed, details=""):
     global tests_passed, tests_failed
-    status = "✅ PASS" if passed else "❌ FAIL"
-    print(f"{status} - {test_name}")
+    emit((PASS_PREFIX if passed else FAIL_PREFIX) + test_name)
     if details:
-        print(f"   {details}")
+        emit(f"   {details}")
 
     if passed:
         tests_passed += 1
@@ -42,55 +55,31 @@ def test_result(test_name, passed, details=""):
         'passed': passed,
         'details': details
     })
-    print()
+    emit()
 
 # ==================== TEST 1: Configuration ====================
-print("\n" + "=" * 80)
-print("TEST 1: Configuration Validation")
-print("=" * 80)
+print_section("TEST 1: Configuration Validation")
+
+# (test name, actual, expected) - every row is checked even if an earlier one fails
+CONFIG_EXPECTATIONS = (
+    ("Timezone Configuration", Config.TIMEZONE, 'Asia/Bangkok'),
+    ("Timeslots Configuration", list(Config.TIME_SLOTS),
+     ['SA', 'SB', 'SC', 'SD', 'SE', 'UA', 'UB', 'UC', 'UD', 'UE']),
+    ("Source Constants", (Config.SOURCE_FACEBOOK_ADS, Config.SOURCE_WEBSITE), ('facebook_ads', 'website')),
+    ("Facebook Ads Trigger", Config.FACEBOOK_ADS_TRIGGER_MESSAGE, "I'm excited for the session"),
+    ("Window Duration Logic",
+     (Config.get_window_duration('facebook_ads'), Config.get_window_duration('website')), (24, 24)),
+    ("Payment Links",
+     ('innerjoy.live' in Config.MEMBERSHIP_LINK, 'innerjoy.live' in Config.TRIAL_LINK), (True, True)),
+)
 
-try:
-    # Check timezone
-    assert Config.TIMEZONE == 'Asia/Singapore', f"Expected 'Asia/Singapore', got '{Config.TIMEZONE}'"
-    test_result("Timezone Configuration", True, f"Timezone: {Config.TIMEZONE} (UTC+8)")
-
-    # Check timeslots
-    expected_slots = ['A', 'B', 'C', 'D']
-    actual_slots = list(Config.TIME_SLOTS.keys())
-    assert actual_slots == expected_slots, f"Expected {expected_slots}, got {actual_slots}"
-    test_result("Timeslots Configuration", True, f"Timeslots: {actual_slots}")
-
-    # Check source constants
-    assert Config.SOURCE_FACEBOOK_ADS == 'facebook_ads'
-    assert Config.SOURCE_WEBSITE == 'website'
-    test_result("Source Constants", True, f"FB Ads: {Config.SOURCE_FACEBOOK_ADS}, Website: {Config.SOURCE_WEBSITE}")
-
-    # Check trigger message
-    assert Config.WEBSITE_TRIGGER_MESSAGE == 'free Zoom preview link'
-    test_result("Website Trigger", True, f"Trigger phrase: '{Config.WEBSITE_TRIGGER_MESSAGE}'")
-
-    # Check window durations
-    fb_window = Config.get_window_duration('facebook_ads')
-    web_window = Config.get_window_duration('website')
-    assert fb_window == 72, f"Expected 72h, got {fb_window}h"
-    assert web_window == 24, f"Expected 24h, got {web_window}h"
-    test_result("Window Duration Logic", True, f"FB Ads: {fb_window}h, Website: {web_window}h")
-
-    # Check payment links
-    assert 'innerjoy.live' in Config.MEMBERSHIP_LINK
-    assert 'innerjoy.live' in Config.TRIAL_LINK
-    test_result("Payment Links", True, f"Membership: {Config.MEMBERSHIP_LINK}")
-
-except AssertionError as e:
-    test_result("Configuration Validation", False, str(e))
-except Exception as e:
-    test_result("Configuration Validation", False, f"Error: {e}")
+for name, actual, expected in CONFIG_EXPECTATIONS:
+    passed = actual == expected
+    test_result(name, passed, f"{actual}" if passed else f"Expected {expected!r}, got {actual!r}")
 
 
 # ==================== TEST 2: Source Detection ====================
-print("\n" + "=" * 80)
-print("TEST 2: Source Detection Logic")
-print("=" * 80)
+print_section("TEST 2: Source Detection Logic")
 
 # Test 2.1: Website Lead Detection
 webhook_website = {
@@ -105,13 +94,6 @@ webhook_website = {
     }
 }
 
-detected_source = handler._detect_contact_source(webhook_website)
-test_result(
-    "Website Lead Detection",
-    detected_source == 'website',
-    f"Message: '{webhook_website['message']['text'][:50]}...' → Detected: {detected_source}"
-)
-
 # Test 2.2: Facebook Ads Lead Detection
 webhook_fb_ads = {
     'contact': {
@@ -120,19 +102,12 @@ webhook_fb_ads = {
         'firstName': 'TestUser'
     },
     'message': {
-        'text': 'Hi Ineke, I saw your ad',
+        'text': f"Hi Ineke, {Config.FACEBOOK_ADS_TRIGGER_MESSAGE}",
         'type': 'text'
     }
 }
 
-detected_source = handler._detect_contact_source(webhook_fb_ads)
-test_result(
-    "Facebook Ads Lead Detection",
-    detected_source == 'facebook_ads',
-    f"Message: '{webhook_fb_ads['message']['text']}' → Detected: {detected_source}"
-)
-
-# Test 2.3: Generic Message (should default to FB Ads)
+# Test 2.3: Generic Message (should default to Website)
 webhook_generic = {
     'contact': {
         'id': 'test_gen_001',
@@ -145,13 +120,6 @@ webhook_generic = {
     }
 }
 
-detected_source = handler._detect_contact_source(webhook_generic)
-test_result(
-    "Generic Message (Default to FB Ads)",
-    detected_source == 'facebook_ads',
-    f"Message: '{webhook_generic['message']['text']}' → Detected: {detected_source} (default)"
-)
-
 # Test 2.4: Existing Contact with Stored Source
 webhook_existing = {
     'contact': {
@@ -163,95 +131,82 @@ webhook_existing = {
         }
     },
     'message': {
-        'text': 'I saw your Facebook ad',  # Contains FB ad reference but should use stored source
+        'text': Config.FACEBOOK_ADS_TRIGGER_MESSAGE,  # Contains the FB Ads trigger but should use stored source
         'type': 'text'
     }
 }
 
-detected_source = handler._detect_contact_source(webhook_existing)
-test_result(
-    "Existing Contact (Stored Source)",
-    detected_source == 'website',
-    f"Stored source: website, Message mentions FB ad → Still returns: {detected_source}"
+# (test name, webhook, expected source, description)
+SOURCE_CASES = (
+    ("Website Lead Detection", webhook_website, 'website',
+     f"Message: '{webhook_website['message']['text'][:50]}...'"),
+    ("Facebook Ads Lead Detection", webhook_fb_ads, 'facebook_ads',
+     f"Message: '{webhook_fb_ads['message']['text']}'"),
+    ("Generic Message (Default to Website)", webhook_generic, 'website',
+     f"Message: '{webhook_generic['message']['text']}' (default)"),
+    ("Existing Contact (Stored Source)", webhook_existing, 'website',
+     "Stored source: website, Message contains the FB Ads trigger"),
 )
 
+detected_sources = handler._detect_contact_source_batch([case[1] for case in SOURCE_CASES])
+for (name, _, expected, description), detected_source in zip(SOURCE_CASES, detected_sources):
+    test_result(name, detected_source == expected, f"{description} → Detected: {detected_source}")
+
 
 # ==================== TEST 3: Message Templates ====================
-print("\n" + "=" * 80)
-print("TEST 3: Message Template Selection")
-print("=" * 80)
+print_section("TEST 3: Message Template Selection")
 
 templates = Config.get_message_templates()
 
-# Test 3.1: Website Flow Initial Message
-assert 'B1_Z1_24H' in templates, "B1_Z1_24H template missing"
-website_msg = templates['B1_Z1_24H']
-assert 'from your website' in website_msg.lower() or 'A — Sat' in website_msg
-test_result(
-    "Website Initial Message (B1_Z1_24H)",
-    True,
-    f"Template includes timeslots upfront: {len(website_msg)} chars"
+# (test name, template code, phrases the template must contain)
+TEMPLATE_CASES = (
+    ("Initial Message (B1_Z1, both sources)", 'B1_Z1', ('name', 'zoom link')),
+    ("Zoom Link + Day Choice (B1_Z2)", 'B1_Z2', ('{zoom_link}', 'S = Saturday', 'U = Sunday')),
+    ("Time Choice (B1_Z2A)", 'B1_Z2A', ('A = 15:30', 'E = 21:00')),
+    ("Timeslot Confirmation (B1_Z2A1)", 'B1_Z2A1', ('{name}', '{timeslot}')),
 )
 
-# Test 3.2: Facebook Ads Flow Initial Message
-assert 'B1_Z1' in templates, "B1_Z1 template missing"
-fb_msg = templates['B1_Z1']
-assert 'name' in fb_msg.lower() and 'zoom link' in fb_msg.lower()
-test_result(
-    "Facebook Ads Initial Message (B1_Z1)",
-    True,
-    f"Template asks for name only: {len(fb_msg)} chars"
-)
-
-# Test 3.3: Message Length Validation
-website_has_timeslots = 'A — Sat' in website_msg or 'A = Sat' in website_msg
-fb_no_timeslots = 'A — Sat' not in fb_msg and 'A = Sat' not in fb_msg
-test_result(
-    "Template Differentiation",
-    website_has_timeslots and fb_no_timeslots,
-    f"Website has timeslots: {website_has_timeslots}, FB Ads doesn't: {fb_no_timeslots}"
-)
+for name, code, phrases in TEMPLATE_CASES:
+    template = templates.get(code, '')
+    missing = [phrase for phrase in phrases if phrase.lower() not in template.lower()]
+    test_result(name, bool(template) and not missing,
+                f"{len(template)} chars" if template and not missing else f"Missing: {missing or code}")
 
 
 # ==================== TEST 4: Timeslot Configuration ====================
-print("\n" + "=" * 80)
-print("TEST 4: Timeslot Configuration (4 slots: A-D)")
-print("=" * 80)
+print_section("TEST 4: Timeslot Configuration (10 slots: S/U day + A-E time)")
 
+slot_days = {'S': 'Saturday', 'U': 'Sunday'}
+slot_times = {'A': '15:30', 'B': '19:30', 'C': '20:00', 'D': '20:30', 'E': '21:00'}
 expected_timeslots = {
-    'A': {'day': 'Saturday', 'time': '15:30', 'is_walkin': False},
-    'B': {'day': 'Saturday', 'time': '19:30', 'is_walkin': True},
-    'C': {'day': 'Sunday', 'time': '15:30', 'is_walkin': False},
-    'D': {'day': 'Sunday', 'time': '19:30', 'is_walkin': True}
+    day_code + time_code: {'day': day, 'time': slot_time}
+    for day_code, day in slot_days.items()
+    for time_code, slot_time in slot_times.items()
 }
 
 all_correct = True
 for slot, expected in expected_timeslots.items():
     actual = Config.TIME_SLOTS.get(slot)
     if actual:
-        time_str = actual['time'].strftime('%H:%M')
-        match = (
-            actual['day'] == expected['day'] and
-            time_str == expected['time'] and
-            actual['is_walkin'] == expected['is_walkin']
-        )
-        if not match:
+        observed = {'day': actual['day'], 'time': actual['time'].strftime('%H:%M')}
+        emit(f"   Slot {slot}: {observed['day']} {observed['time']}")
+        if observed != expected:
             all_correct = False
-        print(f"   Slot {slot}: {actual['day']} {time_str} {'(walk-in)' if actual['is_walkin'] else '(fixed)'}")
     else:
         all_correct = False
+    # Summary-only runs print nothing per slot, so the first bad slot settles the result
+    if not all_correct and not _VERBOSE:
+        break
 
 test_result(
-    "Timeslot Configuration (A-D)",
+    "Timeslot Configuration (SA-UE)",
     all_correct,
-    f"4 timeslots configured correctly"
+    f"{len(expected_timeslots)} timeslots configured correctly"
 )
 
 
 # ==================== TEST 5: Window Duration Logic ====================
-print("\n" + "=" * 80)
-print("TEST 5: Window Duration Calculations")
-print("=" * 80)
+print_section("TEST 5: Window Duration Calculations")
 
 # Test window calculations
 now = datetime.now(timezone)
@@ -265,12 +220,12 @@ test_result(
     f"Window: {website_window}h, Expires: {website_expires.strftime('%Y-%m-%d %H:%M')}"
 )
 
-# Facebook Ads window (72h)
+# Facebook Ads window (24h, Meta customer care policy)
 fb_window = Config.get_window_duration('facebook_ads')
 fb_expires = now + timedelta(hours=fb_window)
 test_result(
-    "Facebook Ads Window (72h)",
-    fb_window == 72,
+    "Facebook Ads Window (24h)",
+    fb_window == 24,
     f"Window: {fb_window}h, Expires: {fb_expires.strftime('%Y-%m-%d %H:%M')}"
 )
 
@@ -284,37 +239,24 @@ test_result(
 
 
 # ==================== TEST 6: Timeslot Display ====================
-print("\n" + "=" * 80)
-print("TEST 6: Timeslot Display Formatting")
-print("=" * 80)
+print_section("TEST 6: Timeslot Display Formatting")
 
-slot_displays = {}
-for slot in ['A', 'B', 'C', 'D']:
+bad_displays = []
+for slot, slot_info in Config.TIME_SLOTS.items():
     display = Config.get_timeslot_display(slot)
-    slot_displays[slot] = display
-    print(f"   Slot {slot}: {display}")
-
-# Verify walk-in slots have proper formatting
-b_display = Config.get_timeslot_display('B')
-d_display = Config.get_timeslot_display('D')
-has_walkin_indicator = '(walk-in)' in b_display.lower() and '(walk-in)' in d_display.lower()
+    emit(f"   Slot {slot}: {display}")
+    if display != f"{slot_info['day']} {slot_info['time'].strftime('%H:%M')} (UTC+7)":
+        bad_displays.append(slot)
 
 test_result(
-    "Walk-in Slot Formatting",
-    has_walkin_indicator,
-    f"Slots B & D marked as walk-in: {has_walkin_indicator}"
+    "Timeslot Display Formatting",
+    not bad_displays,
+    "Every slot shows day, time and (UTC+7)" if not bad_displays else f"Unexpected display for: {bad_displays}"
 )
 
 
 # ==================== TEST 7: Make.com Transformation ====================
-print("\n" + "=" * 80)
-print("TEST 7: Make.com Data Transformation")
-print("=" * 80)
-
-# Import the transformation function
-import sys
-import importlib
-app_module = importlib.import_module('app')
+print_section("TEST 7: Make.com Data Transformation")
 
 # Test complex Make.com format
 makecom_data = {
@@ -335,15 +277,16 @@ makecom_data = {
 }
 
 try:
-    transformed = app_module._transform_makecom_to_internal(makecom_data)
+    transformed = transform_makecom_to_internal(makecom_data)
 
     # Verify transformation
+    contact = transformed.get('contact', {})
     checks = [
-        ('contact.id' in str(transformed), "Contact ID extracted"),
-        ('contact.phone' in str(transformed), "Phone extracted"),
-        ('message.text' in str(transformed), "Message text extracted"),
-        (transformed.get('contact', {}).get('customFields') is not None, "Custom fields included"),
-        (transformed.get('contact', {}).get('tags') is not None, "Tags included")
+        (contact.get('id') is not None, "Contact ID extracted"),
+        (contact.get('phone') is not None, "Phone extracted"),
+        (transformed.get('message', {}).get('text') is not None, "Message text extracted"),
+        (contact.get('customFields') is not None, "Custom fields included"),
+        (contact.get('tags') is not None, "Tags included")
     ]
 
     all_passed = all(check[0] for check in checks)
@@ -359,38 +302,38 @@ except Exception as e:
 
 
 # ==================== FINAL SUMMARY ====================
-print("\n" + "=" * 80)
+print("\n" + RULE)
 print("TEST SUMMARY")
-print("=" * 80)
+print(RULE)
 print(f"Total Tests: {tests_passed + tests_failed}")
 print(f"✅ Passed: {tests_passed}")
 print(f"❌ Failed: {tests_failed}")
 print(f"Success Rate: {(tests_passed / (tests_passed + tests_failed) * 100):.1f}%")
-print("=" * 80)
+print(RULE)
 
 if tests_failed == 0:
     print("\n🎉 ALL TESTS PASSED! System is ready for deployment.")
 else:
     print(f"\n⚠️  {tests_failed} test(s) failed. Please review the failures above.")
 
-print("\n" + "=" * 80)
+print("\n" + RULE)
 print("IMPLEMENTATION CHECKLIST")
-print("=" * 80)
-print("✅ Timezone: UTC+8 (Singapore/Hong Kong)")
-print("✅ Timeslots: 4 slots (A-D) with walk-in options")
-print("✅ Source Detection: Message-based trigger ('from your website')")
-print("✅ Window Management: 72h for Facebook Ads, 24h for Website")
+print(RULE)
+print("✅ Timezone: UTC+7 (Bangkok/Laos)")
+print("✅ Timeslots: 10 slots (Saturday/Sunday x A-E)")
+print(f"✅ Source Detection: Facebook Ads trigger ('{Config.FACEBOOK_ADS_TRIGGER_MESSAGE}'), website by default")
+print("✅ Window Management: 24h for every source (Meta policy)")
 print("✅ Payment Links: innerjoy.live platform")
-print("✅ Message Templates: Dual flow (B1_Z1 vs B1_Z1_24H)")
+print("✅ Message Templates: B1_Z1 (name) -> B1_Z2 (day) -> B1_Z2A (time) -> B1_Z2A1")
 print("✅ Google Sheets: contact_source field added")
 print("✅ Make.com: Data transformation with custom fields")
-print("=" * 80)
+print(RULE)
 
 print("\n📋 DEPLOYMENT LINKS")
-print("=" * 80)
-print("Website Link (24h):")
+print(RULE)
+print("Website Link:")
 print("https://wa.me/8562022398887?text=Hello%2C%20I%20would%20like%20to%20have%20the%20free%20Zoom%20preview%20link.%20Ineke")
 print()
-print("Facebook Ads Link (72h):")
-print("https://wa.me/8562022398887?text=Hi%20Ineke%2C%20I%20saw%20your%20ad")
-print("=" * 80)
+print("Facebook Ads Link:")
+print("https://wa.me/8562022398887?text=Hi%20Ineke%2C%20I%27m%20excited%20for%20the%20session")
+print(RULE)
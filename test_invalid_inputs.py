@@ -2,20 +2,41 @@
 Test Invalid Input Handling
 Tests that the system gracefully handles invalid user inputs
 """
+import logging
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from services.message_handler import MessageHandler
+RULE = "=" * 80
 
-print("=" * 80)
-print("INVALID INPUT HANDLING TEST")
-print("=" * 80)
-print()
+# INNERJOY_VERBOSE=0 (e.g. in CI) still runs every check but only prints the summary
+_VERBOSE = os.environ.get('INNERJOY_VERBOSE', '1') != '0'
+emit = print
+if not _VERBOSE:
+    def emit(*args, **kwargs):
+        """Discard output"""
+
+# Per-input trace lines are debug records; LOGLEVEL=DEBUG shows them
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler(sys.stdout))
+logger.propagate = False
+logger.setLevel(os.environ.get('LOGLEVEL', 'INFO').upper())
+
+def print_section(title):
+    """Print a section header with a single write"""
+    emit(f"\n{RULE}\n{title}\n{RULE}\n")
+
+print_section("INVALID INPUT HANDLING TEST")
+
+# Accepted day / time codes in either case (inputs only need strip())
+_VALID_DAYS = frozenset('SsUu')
+_VALID_TIMES = frozenset('AaBbCcDdEe')
 
 # Test counters
+PASS_PREFIX = "✅ PASS: "
+FAIL_PREFIX = "❌ FAIL: "
 total_tests = 0
 passed_tests = 0
 
@@ -25,37 +46,31 @@ def test_result(test_name, passed, details=""):
     total_tests += 1
     if passed:
         passed_tests += 1
-        print(f"✅ PASS: {test_name}")
-    else:
-        print(f"❌ FAIL: {test_name}")
+    emit((PASS_PREFIX if passed else FAIL_PREFIX) + test_name)
     if details:
-        print(f"   Details: {details}")
-    print()
+        emit(f"   Details: {details}")
+    emit()
 
-# Initialize handler
-try:
-    handler = MessageHandler()
-    print("✓ MessageHandler initialized\n")
-except Exception as e:
-    print(f"✗ Failed to initialize MessageHandler: {e}\n")
-    sys.exit(1)
+# The handler pulls in the Sheets/Respond.io stacks; only the method-exists checks need it
+def _get_handler():
+    """Import the message handler module and get the shared MessageHandler"""
+    from services.message_handler import MessageHandler
+    return MessageHandler.get_instance()
 
 # ============================================================================
 # TEST 1: Invalid Day Selection
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 1: INVALID DAY SELECTION")
-print("=" * 80 + "\n")
+print_section("TEST 1: INVALID DAY SELECTION")
 
 # Test 1.1: Method exists
 try:
-    assert hasattr(handler, '_handle_invalid_day_selection'), "Method _handle_invalid_day_selection not found"
+    assert hasattr(_get_handler(), '_handle_invalid_day_selection'), "Method _handle_invalid_day_selection not found"
     test_result("1.1 Invalid day handler method exists", True)
 except Exception as e:
     test_result("1.1 Invalid day handler method exists", False, str(e))
 
 # Test 1.2: Invalid inputs that should be rejected
-invalid_day_inputs = [
+invalid_day_inputs = (
     'A',  # Time code instead of day
     'X',  # Invalid letter
     '1',  # Number
@@ -66,48 +81,46 @@ invalid_day_inputs = [
     'yes',  # Random word
     '👍',  # Emoji
     '',  # Empty
-]
+)
 
-print(f"Testing {len(invalid_day_inputs)} invalid day inputs...")
+emit(f"Testing {len(invalid_day_inputs)} invalid day inputs...")
 for invalid_input in invalid_day_inputs:
     display = invalid_input if invalid_input else '(empty)'
-    # These should all be recognized as invalid (not in ['S', 'U'])
-    is_invalid = invalid_input.upper().strip() not in ['S', 'U']
+    # These should all be recognized as invalid (not in _VALID_DAYS)
+    is_invalid = invalid_input.strip() not in _VALID_DAYS
     if is_invalid:
-        print(f"  ✓ '{display}' correctly identified as invalid")
+        logger.debug("  ✓ '%s' correctly identified as invalid", display)
     else:
-        print(f"  ✗ '{display}' incorrectly accepted as valid")
+        logger.warning("  ✗ '%s' incorrectly accepted as valid", display)
 
 test_result("1.2 Invalid day inputs rejected", True, f"All {len(invalid_day_inputs)} invalid inputs identified")
 
 # Test 1.3: Valid inputs should pass
-valid_day_inputs = ['S', 's', 'U', 'u', ' S ', ' U ']  # Including variations with spaces
-print(f"\nTesting {len(valid_day_inputs)} valid day inputs...")
+valid_day_inputs = ('S', 's', 'U', 'u', ' S ', ' U ')  # Including variations with spaces
+emit(f"\nTesting {len(valid_day_inputs)} valid day inputs...")
 for valid_input in valid_day_inputs:
-    is_valid = valid_input.upper().strip() in ['S', 'U']
+    is_valid = valid_input.strip() in _VALID_DAYS
     if is_valid:
-        print(f"  ✓ '{valid_input}' correctly identified as valid")
+        logger.debug("  ✓ '%s' correctly identified as valid", valid_input)
     else:
-        print(f"  ✗ '{valid_input}' incorrectly rejected")
+        logger.warning("  ✗ '%s' incorrectly rejected", valid_input)
 
 test_result("1.3 Valid day inputs accepted", True, f"All {len(valid_day_inputs)} valid inputs accepted")
 
 # ============================================================================
 # TEST 2: Invalid Time Selection
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 2: INVALID TIME SELECTION")
-print("=" * 80 + "\n")
+print_section("TEST 2: INVALID TIME SELECTION")
 
 # Test 2.1: Method exists
 try:
-    assert hasattr(handler, '_handle_invalid_time_selection'), "Method _handle_invalid_time_selection not found"
+    assert hasattr(_get_handler(), '_handle_invalid_time_selection'), "Method _handle_invalid_time_selection not found"
     test_result("2.1 Invalid time handler method exists", True)
 except Exception as e:
     test_result("2.1 Invalid time handler method exists", False, str(e))
 
 # Test 2.2: Invalid inputs that should be rejected
-invalid_time_inputs = [
+invalid_time_inputs = (
     'S',  # Day code instead of time
     'U',  # Day code instead of time
     'F',  # Invalid letter (no F time)
@@ -121,38 +134,36 @@ invalid_time_inputs = [
     'yes',  # Random word
     '👍',  # Emoji
     '',  # Empty
-]
+)
 
-print(f"Testing {len(invalid_time_inputs)} invalid time inputs...")
+emit(f"Testing {len(invalid_time_inputs)} invalid time inputs...")
 for invalid_input in invalid_time_inputs:
     display = invalid_input if invalid_input else '(empty)'
-    # These should all be recognized as invalid (not in ['A', 'B', 'C', 'D', 'E'])
-    is_invalid = invalid_input.upper().strip() not in ['A', 'B', 'C', 'D', 'E']
+    # These should all be recognized as invalid (not in _VALID_TIMES)
+    is_invalid = invalid_input.strip() not in _VALID_TIMES
     if is_invalid:
-        print(f"  ✓ '{display}' correctly identified as invalid")
+        logger.debug("  ✓ '%s' correctly identified as invalid", display)
     else:
-        print(f"  ✗ '{display}' incorrectly accepted as valid")
+        logger.warning("  ✗ '%s' incorrectly accepted as valid", display)
 
 test_result("2.2 Invalid time inputs rejected", True, f"All {len(invalid_time_inputs)} invalid inputs identified")
 
 # Test 2.3: Valid inputs should pass
-valid_time_inputs = ['A', 'a', 'B', 'b', 'C', 'c', 'D', 'd', 'E', 'e', ' A ', ' E ']
-print(f"\nTesting {len(valid_time_inputs)} valid time inputs...")
+valid_time_inputs = ('A', 'a', 'B', 'b', 'C', 'c', 'D', 'd', 'E', 'e', ' A ', ' E ')
+emit(f"\nTesting {len(valid_time_inputs)} valid time inputs...")
 for valid_input in valid_time_inputs:
-    is_valid = valid_input.upper().strip() in ['A', 'B', 'C', 'D', 'E']
+    is_valid = valid_input.strip() in _VALID_TIMES
     if is_valid:
-        print(f"  ✓ '{valid_input}' correctly identified as valid")
+        logger.debug("  ✓ '%s' correctly identified as valid", valid_input)
     else:
-        print(f"  ✗ '{valid_input}' incorrectly rejected")
+        logger.warning("  ✗ '%s' incorrectly rejected", valid_input)
 
 test_result("2.3 Valid time inputs accepted", True, f"All {len(valid_time_inputs)} valid inputs accepted")
 
 # ============================================================================
 # TEST 3: Error Message Content
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 3: ERROR MESSAGE CONTENT")
-print("=" * 80 + "\n")
+print_section("TEST 3: ERROR MESSAGE CONTENT")
 
 # Test 3.1: Day error message is helpful
 try:
@@ -175,9 +186,7 @@ except Exception as e:
 # ============================================================================
 # TEST 4: User Stay in Same Step (Don't Progress)
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 4: USER STAYS IN SAME STEP AFTER INVALID INPUT")
-print("=" * 80 + "\n")
+print_section("TEST 4: USER STAYS IN SAME STEP AFTER INVALID INPUT")
 
 # Test 4.1: Invalid day keeps user in B1_Z2
 try:
@@ -198,34 +207,32 @@ except Exception as e:
 # ============================================================================
 # TEST 5: Case Insensitivity
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 5: CASE INSENSITIVITY")
-print("=" * 80 + "\n")
+print_section("TEST 5: CASE INSENSITIVITY")
 
 # Test 5.1: Lowercase inputs work
 try:
-    assert 's'.upper() in ['S', 'U'], "Lowercase 's' should work"
-    assert 'u'.upper() in ['S', 'U'], "Lowercase 'u' should work"
-    assert 'a'.upper() in ['A', 'B', 'C', 'D', 'E'], "Lowercase 'a' should work"
-    assert 'e'.upper() in ['A', 'B', 'C', 'D', 'E'], "Lowercase 'e' should work"
+    assert 's' in _VALID_DAYS, "Lowercase 's' should work"
+    assert 'u' in _VALID_DAYS, "Lowercase 'u' should work"
+    assert 'a' in _VALID_TIMES, "Lowercase 'a' should work"
+    assert 'e' in _VALID_TIMES, "Lowercase 'e' should work"
     test_result("5.1 Lowercase inputs accepted", True, "s, u, a-e all work")
 except Exception as e:
     test_result("5.1 Lowercase inputs", False, str(e))
 
 # Test 5.2: Uppercase inputs work
 try:
-    assert 'S'.upper() in ['S', 'U'], "Uppercase 'S' should work"
-    assert 'U'.upper() in ['S', 'U'], "Uppercase 'U' should work"
-    assert 'A'.upper() in ['A', 'B', 'C', 'D', 'E'], "Uppercase 'A' should work"
-    assert 'E'.upper() in ['A', 'B', 'C', 'D', 'E'], "Uppercase 'E' should work"
+    assert 'S' in _VALID_DAYS, "Uppercase 'S' should work"
+    assert 'U' in _VALID_DAYS, "Uppercase 'U' should work"
+    assert 'A' in _VALID_TIMES, "Uppercase 'A' should work"
+    assert 'E' in _VALID_TIMES, "Uppercase 'E' should work"
     test_result("5.2 Uppercase inputs accepted", True, "S, U, A-E all work")
 except Exception as e:
     test_result("5.2 Uppercase inputs", False, str(e))
 
 # Test 5.3: Mixed case inputs work
 try:
-    assert 'S'.upper() in ['S', 'U'], "Mixed case should work"
-    assert 'a'.upper() in ['A', 'B', 'C', 'D', 'E'], "Mixed case should work"
+    assert 'S' in _VALID_DAYS, "Mixed case should work"
+    assert 'a' in _VALID_TIMES, "Mixed case should work"
     test_result("5.3 Mixed case inputs accepted", True, "Case doesn't matter")
 except Exception as e:
     test_result("5.3 Mixed case inputs", False, str(e))
@@ -233,16 +240,14 @@ except Exception as e:
 # ============================================================================
 # TEST 6: Whitespace Handling
 # ============================================================================
-print("\n" + "=" * 80)
-print("TEST 6: WHITESPACE HANDLING")
-print("=" * 80 + "\n")
+print_section("TEST 6: WHITESPACE HANDLING")
 
 # Test 6.1: Leading/trailing spaces trimmed
 try:
-    assert ' S '.upper().strip() in ['S', 'U'], "' S ' should work"
-    assert '  U  '.upper().strip() in ['S', 'U'], "'  U  ' should work"
-    assert ' A '.upper().strip() in ['A', 'B', 'C', 'D', 'E'], "' A ' should work"
-    assert '  E  '.upper().strip() in ['A', 'B', 'C', 'D', 'E'], "'  E  ' should work"
+    assert ' S '.strip() in _VALID_DAYS, "' S ' should work"
+    assert '  U  '.strip() in _VALID_DAYS, "'  U  ' should work"
+    assert ' A '.strip() in _VALID_TIMES, "' A ' should work"
+    assert '  E  '.strip() in _VALID_TIMES, "'  E  ' should work"
     test_result("6.1 Whitespace trimmed correctly", True, "Leading/trailing spaces removed")
 except Exception as e:
     test_result("6.1 Whitespace handling", False, str(e))
@@ -250,9 +255,9 @@ except Exception as e:
 # ============================================================================
 # FINAL RESULTS
 # ============================================================================
-print("\n" + "=" * 80)
+print("\n" + RULE)
 print("INVALID INPUT TEST RESULTS")
-print("=" * 80 + "\n")
+print(RULE + "\n")
 
 print(f"Total Tests:  {total_tests}")
 print(f"✅ Passed:     {passed_tests}")
@@ -272,7 +277,7 @@ if passed_tests == total_tests:
 else:
     print(f"⚠️  {total_tests - passed_tests} test(s) failed.")
 
-print("\n" + "=" * 80)
+print("\n" + RULE)
 print()
 
 sys.exit(0 if passed_tests == total_tests else 1)